@@ -0,0 +1,120 @@
+# benchmarks/run.py
+"""
+Ejecuta la suite de rendimiento y compara contra un baseline guardado.
+
+    python -m benchmarks.run --suite quick --out outputs/bench/quick.json
+    python -m benchmarks.run --suite quick --compare benchmarks/baseline.json
+    python -m benchmarks.run --suite quick --save-baseline benchmarks/baseline.json
+
+Cada caso corre en un proceso nuevo (spawn) para que el RSS pico sea suyo.
+Código de salida 1 si algún caso es más lento que baseline × tolerancia.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from benchmarks.scenarios import suite
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reporta KB, macOS bytes
+        return rss / (1024.0 * 1024.0) if sys.platform == "darwin" else rss / 1024.0
+    except ImportError:  # Windows
+        return float("nan")
+
+
+def _run_case(suite_name: str, key: str) -> Dict[str, Any]:
+    case = next(c for c in suite(suite_name) if c.key() == key)
+    out = case.fn(case.params)
+    out["peak_rss_mb"] = _peak_rss_mb()
+    return out
+
+
+def run_suite(suite_name: str, only: str = "", isolate: bool = True) -> Dict[str, Any]:
+    cases = [c for c in suite(suite_name) if only in c.key()]
+    results: List[Dict[str, Any]] = []
+    ctx = get_context("spawn")
+    for i, case in enumerate(cases, 1):
+        key = case.key()
+        if isolate:
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+                out = ex.submit(_run_case, suite_name, key).result()
+        else:
+            out = _run_case(suite_name, key)
+        results.append({"key": key, "group": case.group, "name": case.name, "params": case.params, **out})
+        print(f"[{i}/{len(cases)}] {key}: {out['seconds']:.4f}s  rss={out['peak_rss_mb']:.1f}MB", flush=True)
+    return {
+        "meta": {
+            "suite": suite_name,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Compara por key; ratio = actual / baseline. Casos nuevos o retirados se ignoran."""
+    base = {r["key"]: r for r in baseline.get("results", [])}
+    rows = []
+    for r in current["results"]:
+        b = base.get(r["key"])
+        if b is None or b["seconds"] <= 0:
+            continue
+        ratio = r["seconds"] / b["seconds"]
+        rows.append({
+            "key": r["key"],
+            "baseline_s": b["seconds"],
+            "current_s": r["seconds"],
+            "ratio": ratio,
+            "rss_delta_mb": r["peak_rss_mb"] - b.get("peak_rss_mb", float("nan")),
+            "regression": ratio > tolerance,
+        })
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmarks de ruteo, jobs, motor, frames y barridos.")
+    ap.add_argument("--suite", default="quick", choices=["quick", "full"])
+    ap.add_argument("--only", default="", help="Subcadena para filtrar casos por key")
+    ap.add_argument("--out", type=Path, help="Guardar resultados JSON")
+    ap.add_argument("--compare", type=Path, help="Baseline JSON contra el que comparar")
+    ap.add_argument("--tolerance", type=float, default=1.5, help="Ratio máximo aceptado vs baseline")
+    ap.add_argument("--save-baseline", type=Path, help="Escribir los resultados como nuevo baseline")
+    ap.add_argument("--no-isolate", action="store_true", help="Correr en el mismo proceso (RSS acumulado)")
+    args = ap.parse_args()
+
+    current = run_suite(args.suite, only=args.only, isolate=not args.no_isolate)
+    for path in (args.out, args.save_baseline):
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(current, indent=2), encoding="utf-8")
+            print(f"[OK] Resultados → {path}")
+
+    if args.compare:
+        rows = compare(current, json.loads(args.compare.read_text(encoding="utf-8")), args.tolerance)
+        regressions = [r for r in rows if r["regression"]]
+        for r in rows:
+            flag = "REGRESIÓN" if r["regression"] else "ok"
+            print(f"{flag:>9}  x{r['ratio']:.2f}  {r['current_s']:.4f}s (base {r['baseline_s']:.4f}s)  {r['key']}")
+        print(f"{len(regressions)} regresiones de {len(rows)} casos comparados (tolerancia x{args.tolerance}).")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
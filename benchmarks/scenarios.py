@@ -0,0 +1,156 @@
+# benchmarks/scenarios.py
+"""
+Escenarios parametrizados del benchmark. Cada Case tiene grupo, nombre, un dict
+params y fn(params): las funciones bench_* reciben ese dict, preparan su entorno,
+miden la zona caliente y devuelven {"seconds": float, ...extras}. _cases arma un
+Case por combinación del producto cartesiano de valores y suite() junta los de
+quick / full. run.py los ejecuta aislados para medir RSS pico.
+"""
+import time
+from dataclasses import dataclass, field
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+import tempfile
+
+import numpy as np
+
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.layouts import rack_layout_spec
+from src.warehouse.routing import shortest_path_steps, multi_stop_tour_steps
+from src.warehouse.sku_map import generate_hotspot_map
+from src.demand.generator import make_orders
+from src.demand.orders import Catalog
+from src.sim.policies import build_jobs_sequential, build_jobs_batch_size, build_jobs_batch_time
+from src.sim.engine import Simulator, SimConfig
+from src.visual.frames import pack_frames
+from src.experiments.runner import run_grid
+
+POLICIES = ["Secuencial_FCFS", "Batching_Size", "Batching_Time"]
+
+
+@dataclass
+class Case:
+    name: str
+    group: str
+    params: Dict[str, Any]
+    fn: Callable[[Dict[str, Any]], Dict[str, Any]] = field(repr=False)
+
+    def key(self) -> str:
+        args = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.group}/{self.name}[{args}]"
+
+
+# -------------------- entornos --------------------
+
+def _grid(size: int, layout: str) -> WarehouseGrid:
+    if layout == "racks":
+        return WarehouseGrid(rack_layout_spec(width=size, height=size))
+    spec = WarehouseGrid.default_spec()
+    spec["width"] = spec["height"] = size
+    return WarehouseGrid(spec)
+
+def _env(size: int, lam: float, horizon: int = 60, n_skus: int = 120, seed: int = 7, layout: str = "open"):
+    grid = _grid(size, layout)
+    ids = Catalog(n_skus=n_skus).ids()
+    placement = generate_hotspot_map(grid, ids[: n_skus // 5], ids[n_skus // 5:])
+    orders = make_orders(seed=seed, horizon=horizon, lam=lam, popularity="concentrada", n_skus=n_skus)[2]
+    return grid, placement, orders
+
+def _timed(fn, repeat: int = 1) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+# -------------------- casos --------------------
+
+def bench_routing(p):
+    grid = _grid(p["size"], p["layout"])
+    free = grid.free_cells()
+    rng = np.random.default_rng(0)
+    pairs = free[rng.integers(0, len(free), size=(p["queries"], 2))]
+    stops = [tuple(c) for c in free[rng.integers(0, len(free), size=5)].tolist()]
+    sp = _timed(lambda: [shortest_path_steps(grid, tuple(a), tuple(b)) for a, b in pairs.tolist()])
+    ms = _timed(lambda: multi_stop_tour_steps(grid, grid.station_xy, stops))
+    return {"seconds": sp + ms, "shortest_path_s": sp, "multi_stop_s": ms,
+            "per_query_ms": 1000.0 * sp / max(1, p["queries"])}
+
+def bench_build_jobs(p):
+    grid, placement, orders = _env(p["size"], p["lam"], horizon=p["horizon"])
+    builders = {
+        "Secuencial_FCFS": lambda: build_jobs_sequential(orders, grid, placement, 60.0),
+        "Batching_Size": lambda: build_jobs_batch_size(orders, grid, placement, 60.0, 10),
+        "Batching_Time": lambda: build_jobs_batch_time(orders, grid, placement, 60.0, 2.0),
+    }
+    secs = _timed(builders[p["policy"]])
+    return {"seconds": secs, "orders": len(orders), "per_order_ms": 1000.0 * secs / max(1, len(orders))}
+
+def bench_engine(p):
+    grid, placement, orders = _env(p["size"], p["lam"], horizon=p["horizon"])
+    cfg = SimConfig(policy=p["policy"], n_pickers=p["pickers"], speed_m_per_min=60.0,
+                    horizon_min=p["horizon"], trace=p["trace"])
+    t0 = time.perf_counter()
+    sim = Simulator(grid, placement, orders, cfg)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    res = sim.run()
+    t_run = time.perf_counter() - t0
+    return {"seconds": t_build + t_run, "build_s": t_build, "run_s": t_run,
+            "orders": res.orders_completed, "frames": len(sim.trace_frames)}
+
+def bench_pack_frames(p):
+    grid, placement, orders = _env(p["size"], p["lam"], horizon=p["horizon"])
+    cfg = SimConfig(policy="Secuencial_FCFS", n_pickers=p["pickers"], speed_m_per_min=60.0,
+                    horizon_min=p["horizon"], trace=True)
+    sim = Simulator(grid, placement, orders, cfg)
+    sim.run()
+    flat = [dict(pk, t=fr["t"]) for fr in sim.trace_frames for pk in fr["pickers"]]
+    for rec in flat:
+        rec["job_id"] = -1 if rec["job_id"] is None else rec["job_id"]
+    secs = _timed(lambda: pack_frames(flat, round_dt=0.25), repeat=3)
+    return {"seconds": secs, "records": len(flat)}
+
+def bench_run_grid(p):
+    with tempfile.TemporaryDirectory() as tmp:
+        secs = _timed(lambda: run_grid(
+            Path(tmp) / "grid.csv",
+            policies=POLICIES, n_pickers_list=[1, 2, 3], speeds=[60.0],
+            congestion_modes=["off", "light"], batch_sizes=[5, 10], time_thresholds=[1.0, 2.0],
+            popularity_modes=["uniforme"], seeds=[7], horizon_min=p["horizon"],
+            lam_per_min=p["lam"], n_skus=120,
+        ))
+    return {"seconds": secs}
+
+
+# -------------------- suites --------------------
+
+def _cases(group, fn, name, grid_params: Dict[str, List[Any]]) -> List[Case]:
+    keys = list(grid_params)
+    return [Case(name=name, group=group, params=dict(zip(keys, vals)), fn=fn)
+            for vals in product(*(grid_params[k] for k in keys))]
+
+def suite(name: str) -> List[Case]:
+    """quick: minutos en un portátil (CI) | full: barrido completo del pedido."""
+    if name == "quick":
+        return (
+            _cases("routing", bench_routing, "bfs", {"size": [30, 100], "layout": ["open", "racks"], "queries": [50]})
+            + _cases("jobs", bench_build_jobs, "build_jobs", {"size": [30], "lam": [0.5, 5.0], "horizon": [60], "policy": POLICIES})
+            + _cases("engine", bench_engine, "run", {"size": [30], "lam": [1.0], "horizon": [60], "pickers": [1, 10],
+                                                     "policy": POLICIES, "trace": [False, True]})
+            + _cases("frames", bench_pack_frames, "pack_frames", {"size": [30], "lam": [1.0], "horizon": [60], "pickers": [3]})
+            + _cases("sweep", bench_run_grid, "run_grid", {"horizon": [60], "lam": [0.6]})
+        )
+    if name == "full":
+        return (
+            _cases("routing", bench_routing, "bfs", {"size": [30, 100, 200, 500], "layout": ["open", "racks"], "queries": [200]})
+            + _cases("jobs", bench_build_jobs, "build_jobs", {"size": [30, 100], "lam": [0.5, 5.0, 50.0], "horizon": [60], "policy": POLICIES})
+            + _cases("engine", bench_engine, "run", {"size": [30, 100], "lam": [0.5, 5.0, 50.0], "horizon": [60],
+                                                     "pickers": [1, 10, 200], "policy": POLICIES, "trace": [False, True]})
+            + _cases("frames", bench_pack_frames, "pack_frames", {"size": [30], "lam": [1.0, 10.0], "horizon": [120], "pickers": [3, 30]})
+            + _cases("sweep", bench_run_grid, "run_grid", {"horizon": [120, 240], "lam": [0.8]})
+        )
+    raise ValueError(f"Suite desconocida: {name} (usa quick o full)")
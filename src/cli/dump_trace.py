@@ -9,11 +9,13 @@ from src.demand.arrivals import PoissonArrivals
 from src.demand.orders import Catalog, Popularity, OrderSpec, OrderGenerator
 from src.sim.engine import SimConfig
 from src.api.simtrace import simulate_with_trace
+from src.warehouse.dist_cache import enable_disk_cache
 
 OUT_DIR = Path("outputs/ui_trace")
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 def main():
+    enable_disk_cache()   # CLI: distancias persistentes entre corridas (WAREHOUSE_DIST_CACHE)
     # --- layout y placement demo ---
     grid = WarehouseGrid(WarehouseGrid.default_spec())
     catalog = Catalog(n_skus=40)
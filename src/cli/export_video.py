@@ -0,0 +1,76 @@
+"""
+Export headless de una corrida a MP4 / GIF / PNGs (Agg, en paralelo).
+
+    python -m src.cli.export_video --trace outputs/ui_trace/trace.json --out outputs/video/run.mp4
+    python -m src.cli.export_video --policy Batching_Size --pickers 3 --horizon 120 --out outputs/video/run.gif
+    python -m src.cli.export_video --out outputs/video/frames/      # sólo secuencia PNG
+
+Sin --trace se re-corre la config con el mismo entorno que la UI (grilla por defecto,
+SKUs al azar por seed, demanda uniforme). Sin ffmpeg/imageio, .mp4 queda como PNGs.
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+from src.warehouse.dist_cache import attach_router, enable_disk_cache
+from src.demand.generator import make_orders
+from src.sim.engine import Simulator, SimConfig
+from src.visual.export import RenderStyle, export_video, load_trace, meta_for_grid
+
+
+def _trace_from_config(args):
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    placement = SKUPlacement.random_sample(grid, n_skus=args.n_skus, seed=args.seed)
+    attach_router(grid, placement)
+    orders = make_orders(seed=args.seed, horizon=args.horizon, lam=args.lam, popularity="uniforme")[2]
+    cfg = SimConfig(policy=args.policy, n_pickers=args.pickers, speed_m_per_min=args.speed,
+                    congestion=args.congestion, batch_size=args.batch_size,
+                    time_threshold_min=args.time_threshold, horizon_min=args.horizon, round_dt=args.dt)
+    sim = Simulator(grid, placement, orders, cfg)
+    sim.run()
+    return meta_for_grid(grid), sim.trace_frames
+
+
+def main(argv=None):
+    enable_disk_cache()   # CLI: distancias persistentes entre corridas (WAREHOUSE_DIST_CACHE)
+    ap = argparse.ArgumentParser(description="Export headless de trazas a video/GIF/PNG")
+    ap.add_argument("--trace", type=Path, help="JSON {meta, timeline} (p.ej. de dump_trace)")
+    ap.add_argument("--out", type=Path, default=Path("outputs/video/run.mp4"))
+    ap.add_argument("--fps", type=float, default=20.0)
+    ap.add_argument("--dt", type=float, default=0.25, help="minutos de simulación por frame")
+    ap.add_argument("--max-frames", type=int, default=None)
+    ap.add_argument("--procs", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--width", type=int, default=800, help="ancho en píxeles")
+    ap.add_argument("--keep-png", action="store_true")
+    # re-correr una config (sin --trace)
+    ap.add_argument("--policy", default="Batching_Size",
+                    choices=["Secuencial_FCFS", "Batching_Size", "Batching_Time", "Batching_Proximity"])
+    ap.add_argument("--pickers", type=int, default=2)
+    ap.add_argument("--speed", type=float, default=60.0)
+    ap.add_argument("--congestion", default="off", choices=["off", "light", "aisle"])
+    ap.add_argument("--batch-size", type=int, default=10)
+    ap.add_argument("--time-threshold", type=float, default=2.0)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--horizon", type=float, default=120.0)
+    ap.add_argument("--lam", type=float, default=1.0)
+    ap.add_argument("--n-skus", type=int, default=120)
+    args = ap.parse_args(argv)
+
+    t0 = time.time()
+    meta, frames = load_trace(args.trace) if args.trace else _trace_from_config(args)
+    t1 = time.time()
+    out, n = export_video(meta, frames, args.out, fps=args.fps, dt=args.dt, procs=args.procs,
+                          max_frames=args.max_frames, style=RenderStyle(width_px=args.width),
+                          keep_png=args.keep_png)
+    t2 = time.time()
+    print(f"Traza: {len(frames)} frames ({t1 - t0:.1f}s) · render: {n} frames en {t2 - t1:.1f}s "
+          f"con {args.procs} procesos → {out}")
+    if out.is_dir() and args.out.suffix:
+        print(f"[!] Sin encoder para {args.out.suffix} (ffmpeg/imageio): quedó la secuencia PNG.")
+
+
+if __name__ == "__main__":
+    main()
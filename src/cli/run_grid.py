@@ -1,8 +1,11 @@
+import os
 from pathlib import Path
 from src.experiments.runner import run_grid
 from src.experiments.plots import plot_throughput_by_policy, plot_wait_box_by_policy
+from src.warehouse.dist_cache import enable_disk_cache
 
 def main():
+    enable_disk_cache()   # CLI: distancias persistentes entre corridas (WAREHOUSE_DIST_CACHE)
     out_csv = Path("outputs/experiments/exp_grid.csv")
     csv_path = run_grid(
         out_csv=out_csv,
@@ -16,7 +19,8 @@ def main():
         seeds=[7,11],       # rápido para demo; puedes ampliarlo
         horizon_min=180,
         lam_per_min=0.8,
-        n_skus=120
+        n_skus=120,
+        workers=os.cpu_count() or 1,   # entornos en memoria compartida, un proceso por CPU
     )
     print(f"CSV: {csv_path}")
 
@@ -4,8 +4,10 @@ from src.demand.rng import RNG
 from src.demand.arrivals import PoissonArrivals
 from src.demand.orders import Catalog, Popularity, OrderSpec, OrderGenerator
 from src.sim.engine import Simulator, SimConfig
+from src.warehouse.dist_cache import enable_disk_cache
 
 def main():
+    enable_disk_cache()   # CLI: distancias persistentes entre corridas (WAREHOUSE_DIST_CACHE)
     grid = WarehouseGrid(WarehouseGrid.default_spec())
 
     catalog = Catalog(n_skus=120)
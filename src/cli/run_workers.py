@@ -0,0 +1,88 @@
+"""
+Barrido distribuido sobre una cola SQLite en un directorio compartido.
+
+    python -m src.cli.run_workers publish                # publica el barrido de demo (idempotente)
+    python -m src.cli.run_workers work --procs 4         # workers locales (repetir en otros hosts)
+    python -m src.cli.run_workers status
+    python -m src.cli.run_workers export                 # CSV con el formato de run_grid
+"""
+import argparse
+import multiprocessing as mp
+import time
+from pathlib import Path
+
+from src.experiments.workqueue import (
+    SQLiteWorkQueue, publish_grid, run_worker, export_csv, default_worker_id
+)
+from src.warehouse.dist_cache import enable_disk_cache
+
+DEFAULT_DB = Path("outputs/experiments/queue.sqlite")
+
+
+def _demo_grid():
+    # mismo barrido que src.cli.run_grid
+    return dict(
+        policies=["Secuencial_FCFS", "Batching_Size", "Batching_Time"],
+        n_pickers_list=[1, 2, 3],
+        speeds=[60.0],
+        congestion_modes=["off", "light"],
+        batch_sizes=[5, 10],
+        time_thresholds=[1.0, 2.0],
+        popularity_modes=["uniforme", "concentrada"],
+        seeds=[7, 11],
+        horizon_min=180,
+        lam_per_min=0.8,
+        n_skus=120,
+    )
+
+
+def _status_line(p) -> str:
+    return (f"{p['done']}/{p['total']} listas · {p['running']} corriendo · "
+            f"{p['pending']} pendientes · {p['failed']} fallidas")
+
+
+def _work(db: Path, lease_s: float, wait_s: float, idx: int):
+    run_worker(SQLiteWorkQueue(db), worker_id=f"{default_worker_id()}#{idx}", lease_s=lease_s, wait_s=wait_s)
+
+
+def main(argv=None):
+    enable_disk_cache()   # CLI: distancias persistentes entre corridas (WAREHOUSE_DIST_CACHE)
+    ap = argparse.ArgumentParser(description="Workers de barrido sobre cola SQLite compartida")
+    ap.add_argument("--db", type=Path, default=DEFAULT_DB)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("publish")
+    w = sub.add_parser("work")
+    w.add_argument("--procs", type=int, default=mp.cpu_count())
+    w.add_argument("--lease", type=float, default=600.0, help="segundos antes de re-asignar una tarea")
+    w.add_argument("--wait", type=float, default=0.0, help="segundos a esperar tareas nuevas con la cola vacía")
+    w.add_argument("--every", type=float, default=5.0, help="segundos entre reportes de progreso")
+    sub.add_parser("status")
+    e = sub.add_parser("export")
+    e.add_argument("--out", type=Path, default=Path("outputs/experiments/exp_grid_queue.csv"))
+    args = ap.parse_args(argv)
+
+    queue = SQLiteWorkQueue(args.db)
+    if args.cmd == "publish":
+        ids = publish_grid(queue, **_demo_grid())
+        print(f"Tareas publicadas: {len(ids)} ({_status_line(queue.progress())})")
+    elif args.cmd == "work":
+        procs = [mp.Process(target=_work, args=(args.db, args.lease, args.wait, i)) for i in range(max(1, args.procs))]
+        for p in procs:
+            p.start()
+        t0 = time.time()
+        while any(p.is_alive() for p in procs):
+            time.sleep(args.every)
+            print(f"[{time.time() - t0:6.0f}s] {_status_line(queue.progress())}", flush=True)
+        for p in procs:
+            p.join()
+        print(f"Fin: {_status_line(queue.progress())}")
+    elif args.cmd == "status":
+        print(_status_line(queue.progress()))
+        for tid, err in queue.errors():
+            print(f"  {tid}: {(err or '').strip().splitlines()[-1:]}")
+    elif args.cmd == "export":
+        print(f"CSV: {export_csv(queue, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,10 @@ from src.demand.arrivals import PoissonArrivals
 from src.demand.orders import Catalog, Popularity, OrderSpec, OrderGenerator
 from src.picking.tours import order_tour, batch_tour
 from src.picking.batching import SizeThresholdBatching, TimeThresholdBatching
+from src.warehouse.dist_cache import enable_disk_cache
 
 def main():
+    enable_disk_cache()   # CLI: distancias persistentes entre corridas (WAREHOUSE_DIST_CACHE)
     # Layout
     grid = WarehouseGrid(WarehouseGrid.default_spec())
 
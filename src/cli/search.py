@@ -0,0 +1,34 @@
+import json
+from pathlib import Path
+from src.experiments.search import SimEvaluator, grid_candidates, search
+from src.warehouse.dist_cache import enable_disk_cache
+
+def main():
+    enable_disk_cache()   # CLI: distancias persistentes entre corridas (WAREHOUSE_DIST_CACHE)
+    evaluator = SimEvaluator(horizon_min=180, lam_per_min=0.8, n_skus=120, popularity="uniforme")
+    candidates = grid_candidates(
+        policies=["Secuencial_FCFS", "Batching_Size", "Batching_Time"],
+        n_pickers_list=[1, 2, 3, 4],
+        batch_sizes=[5, 10, 15],
+        time_thresholds=[1.0, 2.0, 5.0],
+    )
+    res = search(evaluator, candidates, seeds=[7, 11, 23, 31, 47, 59, 71, 83, 97],
+                 sla_p95_min=5.0, continuous={"time_threshold_min": (0.5, 10.0)})
+
+    print(f"Simulaciones: {res.n_sims} (grilla completa: {len(candidates) * 9})")
+    print("Mejor bajo SLA p95 ≤ 5 min:", res.best.params if res.best else "ninguna cumple")
+    for e in res.front:
+        print(f"  {e.throughput_per_hour:7.1f} ped/h  p95={e.wait_p95_min:6.2f} min  {e.params}")
+
+    out = Path("outputs/experiments/search.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({
+        "best": res.best.to_dict() if res.best else None,
+        "front": [e.to_dict() for e in res.front],
+        "n_sims": res.n_sims,
+        "history": res.history,
+    }, indent=2), encoding="utf-8")
+    print(f"JSON: {out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,19 @@
 # src/demand/__init__.py
-from .arrivals import PoissonArrivals
+from .arrivals import PoissonArrivals, NonHomogeneousPoissonArrivals, make_arrivals
 from .orders import Catalog, Popularity, OrderSpec, Order, OrderGenerator
+from .due_dates import DueDateSpec, assign_due_dates
 from .rng import RNG
 
 __all__ = [
     "PoissonArrivals",
+    "NonHomogeneousPoissonArrivals",
+    "make_arrivals",
     "Catalog",
     "Popularity",
     "OrderSpec",
     "Order",
     "OrderGenerator",
+    "DueDateSpec",
+    "assign_due_dates",
     "RNG",
 ]
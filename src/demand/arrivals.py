@@ -1,7 +1,16 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+import numpy as np
 from .rng import RNG
 
+# λ(t) por tramos: [(t_inicio_min, λ_por_min), ...] ordenado por t_inicio;
+# cada tasa rige desde su t_inicio hasta el siguiente (o hasta el horizonte).
+RateSteps = Sequence[Tuple[float, float]]
+RateFn = Callable[[np.ndarray], np.ndarray]
+
+# reintentos de thinning cuando la cota estimada de λ(t) resulta chica
+_MAX_BOUND_RETRIES = 8
+
 @dataclass
 class PoissonArrivals:
     """Genera tiempos de llegada (minutos) en [0, horizon_min] para un proceso Poisson(λ)."""
@@ -24,3 +33,101 @@ class PoissonArrivals:
             return []
         u = self.rng.random(n) * self.horizon_min
         return sorted(u.tolist())
+
+@dataclass
+class NonHomogeneousPoissonArrivals:
+    """
+    Proceso Poisson no homogéneo en [0, horizon_min] con λ(t) por tramos o callable.
+
+    - Tramos (lista de (t_inicio, λ)): inversión exacta; N_k ~ Poisson(λ_k·Δ_k) por tramo
+      y tiempos uniformes dentro de cada tramo, todo en una pasada de NumPy.
+    - Callable λ(t) (vectorizado sobre arrays): thinning de Lewis–Shedler con cota lam_max
+      (si no se da, se estima sobre una malla fina con 10% de margen). Si algún punto
+      propuesto supera la cota: con lam_max explícito es ValueError; con la estimada se
+      re-muestrea con una cota mayor. Un pico más angosto que la malla puede no caer
+      en ningún punto propuesto: para λ(t) con picos angostos, pasar lam_max.
+    - batch_mean > 1: arribos compuestos; cada época trae 1 + Poisson(batch_mean − 1)
+      pedidos en el mismo instante (λ(t) es entonces la tasa de épocas).
+    """
+    rate: Union[RateSteps, RateFn]
+    horizon_min: int
+    rng: RNG
+    lam_max: Optional[float] = None
+    batch_mean: float = 1.0
+
+    def _steps(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        steps = sorted((float(t), float(l)) for t, l in self.rate)
+        starts = np.array([t for t, _ in steps], dtype=float)
+        rates = np.array([l for _, l in steps], dtype=float)
+        assert np.all(rates >= 0.0), "λ(t) debe ser >= 0"
+        keep = starts < self.horizon_min
+        starts, rates = np.clip(starts[keep], 0.0, None), rates[keep]
+        ends = np.append(starts[1:], float(self.horizon_min))
+        return starts, ends - starts, rates
+
+    def _eval_rate(self, t: np.ndarray) -> np.ndarray:
+        out = np.asarray(self.rate(t), dtype=float)
+        if out.shape != t.shape:
+            out = np.vectorize(lambda x: float(self.rate(x)))(t)
+        return out
+
+    def _epoch_times(self) -> np.ndarray:
+        if callable(self.rate):
+            lam_max = self.lam_max
+            if lam_max is None:
+                grid = np.linspace(0.0, float(self.horizon_min), 4097)
+                lam_max = 1.1 * float(np.max(self._eval_rate(grid)))
+            if lam_max <= 0.0:
+                return np.empty(0)
+            # el thinning sólo es válido si λ(t) <= lam_max en todo punto propuesto:
+            # con cota explícita se avisa; con cota estimada se reintenta con una mayor
+            for _ in range(_MAX_BOUND_RETRIES):
+                n = int(self.rng.poisson(lam_max * self.horizon_min))
+                t = self.rng.random(n) * self.horizon_min
+                lam_t = self._eval_rate(t)
+                peak = float(lam_t.max()) if n else 0.0
+                if peak <= lam_max:
+                    keep = self.rng.random(n) * lam_max < lam_t
+                    return t[keep]
+                if self.lam_max is not None:
+                    raise ValueError(f"λ(t) = {peak:.4g} supera lam_max = {lam_max:.4g}")
+                lam_max = max(2.0 * lam_max, 1.1 * peak)
+            raise ValueError("No se encontró una cota lam_max válida para λ(t); pasala explícita")
+
+        starts, widths, rates = self._steps()
+        counts = self.rng.poisson(rates * widths)
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0)
+        return np.repeat(starts, counts) + self.rng.random(total) * np.repeat(widths, counts)
+
+    def sample_times(self) -> List[float]:
+        assert self.horizon_min > 0
+        assert self.batch_mean >= 1.0
+        t = np.sort(self._epoch_times())
+        if self.batch_mean > 1.0 and t.size:
+            sizes = 1 + self.rng.poisson(self.batch_mean - 1.0, size=t.size)
+            t = np.repeat(t, sizes)
+        return t.tolist()
+
+    def expected_count(self) -> float:
+        """E[N] en el horizonte (pedidos, contando el tamaño medio de lote)."""
+        if callable(self.rate):
+            grid = np.linspace(0.0, float(self.horizon_min), 4097)
+            y = self._eval_rate(grid)
+            lam_int = float(np.sum((y[1:] + y[:-1]) * 0.5 * np.diff(grid)))
+        else:
+            _, widths, rates = self._steps()
+            lam_int = float(np.sum(rates * widths))
+        return lam_int * self.batch_mean
+
+def make_arrivals(lam_per_min: float, horizon_min: int, rng: RNG,
+                  rate_profile: Union[RateSteps, RateFn, None] = None,
+                  batch_mean: float = 1.0):
+    """Poisson homogéneo por defecto; NHPP si hay rate_profile o lotes (batch_mean > 1)."""
+    if rate_profile is None and batch_mean == 1.0:
+        return PoissonArrivals(lam_per_min=lam_per_min, horizon_min=horizon_min, rng=rng)
+    return NonHomogeneousPoissonArrivals(
+        rate=rate_profile if rate_profile is not None else [(0.0, lam_per_min)],
+        horizon_min=horizon_min, rng=rng, batch_mean=batch_mean,
+    )
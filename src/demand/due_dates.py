@@ -0,0 +1,47 @@
+# src/demand/due_dates.py
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+import bisect
+
+from .rng import RNG
+from .orders import Order
+
+
+@dataclass
+class DueDateSpec:
+    """
+    Reglas para la fecha compromiso (due) de cada pedido.
+
+    - estándar: due = llegada + sla_min; con cortes de transportista, el primer
+      corte >= llegada + sla_min (si ya pasaron todos, queda llegada + sla_min).
+    - express (fracción express_share, sorteada por pedido): due = llegada + express_sla_min,
+      sin esperar al corte.
+    """
+    sla_min: float = 60.0
+    express_share: float = 0.0
+    express_sla_min: float = 15.0
+    cutoffs: Optional[Sequence[float]] = None   # minutos de salida de transportistas
+
+
+def due_for(arrival_min: float, spec: DueDateSpec, express: bool = False,
+            cutoffs: Optional[List[float]] = None) -> float:
+    if express:
+        return arrival_min + spec.express_sla_min
+    ready = arrival_min + spec.sla_min
+    cuts = cutoffs if cutoffs is not None else sorted(spec.cutoffs or [])
+    i = bisect.bisect_left(cuts, ready)
+    return float(cuts[i]) if i < len(cuts) else ready
+
+
+def assign_due_dates(orders: Sequence[Order], spec: DueDateSpec, rng: RNG) -> None:
+    """Completa due_min / express in-place (un sorteo por pedido, en el orden de la lista)."""
+    if not orders:
+        return
+    cuts = sorted(spec.cutoffs or [])
+    if spec.express_share > 0:
+        draws = rng.random(len(orders)).tolist()
+    else:
+        draws = [1.0] * len(orders)
+    for o, u in zip(orders, draws):
+        o.express = u < spec.express_share
+        o.due_min = due_for(o.arrival_min, spec, o.express, cuts)
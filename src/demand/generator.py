@@ -1,8 +1,9 @@
 # src/demand/generator.py
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from .rng import RNG
-from .arrivals import PoissonArrivals
+from .arrivals import make_arrivals
 from .orders import Catalog, Popularity, OrderSpec, OrderGenerator, Order
+from .due_dates import DueDateSpec, assign_due_dates
 
 def make_orders(
     seed: int,
@@ -13,10 +14,18 @@ def make_orders(
     min_items: int = 1,
     max_items: int = 5,
     allow_duplicates: bool = True,
+    rate_profile=None,
+    batch_mean: float = 1.0,
+    due_dates: Optional[DueDateSpec] = None,
 ) -> Tuple[None, None, List[Order]]:
     """
     Devuelve (None, None, orders) para ser compatible con tu app actual,
     que usa el índice [2] para extraer la lista de órdenes.
+
+    rate_profile (opcional): λ(t) por tramos [(t_inicio, λ), ...] o callable; si se da,
+    reemplaza a `lam` por un proceso no homogéneo (con lotes si batch_mean > 1).
+    due_dates (opcional): asigna due_min / express con un RNG aparte (seed + 1), así
+    llegadas y SKUs son los mismos con o sin fechas compromiso.
     """
     rng = RNG(seed=seed)
 
@@ -25,8 +34,10 @@ def make_orders(
     spec = OrderSpec(min_items=min_items, max_items=max_items, allow_duplicates=allow_duplicates)
     og = OrderGenerator(catalog=catalog, popularity=pop, spec=spec, rng=rng)
 
-    arrivals = PoissonArrivals(lam_per_min=lam, horizon_min=int(horizon), rng=rng)
+    arrivals = make_arrivals(lam, int(horizon), rng, rate_profile=rate_profile, batch_mean=batch_mean)
     times = arrivals.sample_times()
 
     orders = [og.make_order(t) for t in times]
+    if due_dates is not None:
+        assign_due_dates(orders, due_dates, RNG(seed=None if seed is None else seed + 1))
     return (None, None, orders)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Dict, Literal, Tuple
+from typing import List, Dict, Literal, Optional, Tuple
 import math
 from .rng import RNG
 
@@ -50,6 +50,8 @@ class Order:
     arrival_min: float
     items: List[str]            # lista con posibles repetidos = cantidad por SKU
     item_counts: Dict[str, int] # diccionario SKU -> cantidad
+    due_min: Optional[float] = None  # fecha compromiso (min); None = sin SLA (ver due_dates.py)
+    express: bool = False            # pedido con SLA corto
 
 def _count_items(items: List[str]) -> Dict[str, int]:
     d: Dict[str, int] = {}
@@ -20,13 +20,19 @@ class RowKPIs:
     avg_wait_min: float
     util_avg: float
     util_max: float
+    distance_per_order_m: float = 0.0
+    slotting: str = "hotspot"
+
+    # bloqueos_por_congestion (sólo congestion="aisle")
+    congestion_blocks: int = 0
+    congestion_block_min: float = 0.0
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
 def to_row(policy: str, n_pickers: int, speed: float, congestion: str,
            batch_size: int, time_thr: float, sku_pop: str, seed: int,
-           res: SimResult) -> RowKPIs:
+           res: SimResult, slotting: str = "hotspot") -> RowKPIs:
     util_avg = mean(res.picker_utilization) if res.picker_utilization else 0.0
     util_max = max(res.picker_utilization) if res.picker_utilization else 0.0
     return RowKPIs(
@@ -43,5 +49,9 @@ def to_row(policy: str, n_pickers: int, speed: float, congestion: str,
         throughput_per_hour=res.throughput_per_hour,
         avg_wait_min=res.avg_wait_min,
         util_avg=util_avg,
-        util_max=util_max
+        util_max=util_max,
+        distance_per_order_m=res.distance_per_order_avg_m,
+        slotting=slotting,
+        congestion_blocks=res.congestion_blocks,
+        congestion_block_min=res.congestion_block_min,
     )
@@ -1,30 +1,138 @@
 from pathlib import Path
-from typing import List, Dict, Any, Iterable
+from typing import List, Dict, Any, Iterable, Optional
+from dataclasses import replace
 import csv
+import json
 
 from src.warehouse.grid import WarehouseGrid
-from src.warehouse.sku_map import generate_hotspot_map
+from src.warehouse.sku_map import generate_hotspot_map, SKUPlacement
+from src.warehouse.slotting import optimize_slotting
+from src.warehouse.dist_cache import attach_router
 from src.demand.rng import RNG
-from src.demand.arrivals import PoissonArrivals
+from src.demand.arrivals import make_arrivals
 from src.demand.orders import Catalog, Popularity, OrderSpec, OrderGenerator
-from src.sim.engine import Simulator, SimConfig
+from src.sim.engine import SimConfig
+from src.sim.job_cache import JobCache
+from src.sim.fastpath import simulate
+from src.experiments.surrogate import estimate, surrogate_error
+from src.sim.profiling import SimProfiler, merge_reports, NULL_PHASE
 from src.experiments.kpis import to_row
 
-def _env(seed:int, n_skus:int, lam:float, horizon:int, pop_mode:str):
+def _placement(grid: WarehouseGrid, catalog: Catalog, pop: Popularity, slotting: str, seed: int):
+    """hotspot: ABC fijo (20% A) | optimized: slotting por popularidad | random: celdas al azar."""
+    if slotting == "hotspot":
+        popular = catalog.ids()[: max(1, catalog.n_skus//5)]
+        others  = catalog.ids()[len(popular):]
+        return generate_hotspot_map(grid, popular, others)
+    if slotting == "optimized":
+        return optimize_slotting(grid, catalog.ids(), weights=pop.probs())[0]
+    if slotting == "random":
+        return SKUPlacement.random_sample(grid, catalog.n_skus, seed=seed)
+    raise ValueError(f"Slotting no soportado: {slotting}")
+
+def _env(seed:int, n_skus:int, lam:float, horizon:int, pop_mode:str, rate_profile=None, batch_mean:float=1.0,
+         slotting:str="hotspot"):
     grid = WarehouseGrid(WarehouseGrid.default_spec())
     catalog = Catalog(n_skus=n_skus)
-    popular = catalog.ids()[: max(1, n_skus//5)]
-    others  = catalog.ids()[len(popular):]
-    placement = generate_hotspot_map(grid, popular, others)
+    pop = Popularity.make(catalog, mode=pop_mode, alpha=1.2 if pop_mode=="concentrada" else 1.0)
+    placement = _placement(grid, catalog, pop, slotting, seed)
+    # distancias slot↔slot/estación desde el cache en disco (tours por lookup, sin BFS)
+    attach_router(grid, placement)
 
     rng = RNG(seed=seed)
-    arrivals = PoissonArrivals(lam_per_min=lam, horizon_min=horizon, rng=rng)
+    arrivals = make_arrivals(lam, horizon, rng, rate_profile=rate_profile, batch_mean=batch_mean)
     t = arrivals.sample_times()
-    pop = Popularity.make(catalog, mode=pop_mode, alpha=1.2 if pop_mode=="concentrada" else 1.0)
     gen = OrderGenerator(catalog, pop, OrderSpec(1,5,True), rng)
     orders = [gen.make_order(tt) for tt in t]
     return grid, placement, orders
 
+def _policy_params(policy: str, batch_sizes, time_thresholds):
+    """(kwargs de SimConfig, batch_size, time_threshold) por variante de la política (columnas del CSV)."""
+    if policy == "Secuencial_FCFS":
+        return [({}, 0, 0.0)]
+    if policy == "Batching_Size":
+        return [({"batch_size": bsz}, bsz, 0.0) for bsz in batch_sizes]
+    if policy == "Batching_Time":
+        return [({"time_threshold_min": thr}, 0, thr) for thr in time_thresholds]
+    if policy == "Batching_Proximity":
+        return [({"batch_size": bsz, "time_threshold_min": thr}, bsz, thr)
+                for bsz in batch_sizes for thr in time_thresholds]
+    return []
+
+def _fieldnames(prescreen: Optional[str] = None) -> List[str]:
+    """Columnas del CSV del barrido (+ las del surrogate si hay pre-screening)."""
+    return [
+        "policy","n_pickers","speed_m_per_min","congestion",
+        "batch_size","time_threshold_min","sku_popularity","slotting","seed",
+        "orders_total","makespan_min","throughput_per_hour",
+        "avg_wait_min","util_avg","util_max","distance_per_order_m",
+        "congestion_blocks","congestion_block_min"
+    ] + (["source","screen","surrogate_rho","surrogate_wait_min","surrogate_throughput_per_hour"]
+         if prescreen else [])
+
+def _tasks(policies, n_pickers_list, speeds, congestion_modes, batch_sizes, time_thresholds):
+    """Configs de un entorno en el orden de filas del CSV: (policy, n_pickers, speed, congestión, kw, bsz, thr)."""
+    return [(policy, n_pickers, speed, congest, kw, bsz, thr)
+            for policy in policies
+            for n_pickers in n_pickers_list
+            for speed in speeds
+            for congest in congestion_modes
+            for kw, bsz, thr in _policy_params(policy, batch_sizes, time_thresholds)]
+
+def _run_task(grid, placement, orders, cache: JobCache, task, ctx: Dict[str, Any], phase=None):
+    """
+    Corre (o poda) una config. ctx: seed, pop_mode, slot_mode, horizon_min, profile,
+    prescreen, rho_saturated, rho_idle. Devuelve (fila, estimación | None, resultado | None).
+    """
+    policy, n_pickers, speed, congest, kw, bsz, thr = task
+    horizon_min, prescreen = ctx["horizon_min"], ctx["prescreen"]
+    cfg = SimConfig(policy=policy, n_pickers=n_pickers, speed_m_per_min=speed, congestion=congest,
+                    horizon_min=horizon_min, trace=False, profile=ctx["profile"], **kw)
+    jobs, paths = cache.for_config(cfg)
+    est = estimate(jobs, n_pickers, horizon_min, ctx["rho_saturated"], ctx["rho_idle"]) if prescreen else None
+    sim_res = None
+    if est is not None and prescreen == "prune" and est.status != "ok":
+        res, source = est.as_result(horizon_min), "surrogate"
+    else:
+        with (phase("simulate") if phase is not None else NULL_PHASE):
+            # congestión "off" → cola FIFO analítica; resto → motor de eventos
+            res = sim_res = simulate(grid, placement, orders, cfg, jobs=jobs, path_cache=paths, series=False)
+        source = "sim"
+    row = to_row(policy, n_pickers, speed, congest, bsz, thr, ctx["pop_mode"], ctx["seed"], res,
+                 slotting=ctx["slot_mode"]).to_dict()
+    if est is not None:
+        row.update(source=source, screen=est.status, surrogate_rho=est.rho,
+                   surrogate_wait_min=est.avg_wait_min,
+                   surrogate_throughput_per_hour=est.throughput_per_hour)
+    return row, est, sim_res
+
+# estado por worker: entorno adjunto + JobCache, por clave de EnvHandle
+_WORKER_ENVS: Dict[str, tuple] = {}
+
+def _worker_chunk(handle, ctx: Dict[str, Any], tasks: list) -> list:
+    """Tareas de un worker: se adjunta (una vez) al entorno compartido y corre las configs."""
+    from src.experiments.shm_env import attach_env
+    env = _WORKER_ENVS.get(handle.key)
+    if env is None:
+        for k in list(_WORKER_ENVS):
+            if k != handle.key:
+                _WORKER_ENVS.pop(k)      # suelta vistas del entorno anterior
+        grid, placement, orders = attach_env(handle).env()
+        env = _WORKER_ENVS[handle.key] = (grid, placement, orders, JobCache(orders, grid, placement))
+    grid, placement, orders, cache = env
+    out = []
+    for task in tasks:
+        row, est, res = _run_task(grid, placement, orders, cache, task, ctx)
+        if res is not None:
+            # sólo lo que usa el padre (surrogate_error / perfiles): sin series ni esperas crudas
+            res = replace(res, ts_queue=[], ts_completed=[], gantt=[], waits_raw=[])
+        out.append((row, est, res))
+    return out
+
+def _chunks(seq: list, n: int) -> List[list]:
+    size = max(1, -(-len(seq) // max(1, n)))
+    return [seq[i:i + size] for i in range(0, len(seq), size)]
+
 def run_grid(
     out_csv: Path,
     # dominio de escenarios
@@ -35,55 +143,93 @@ def run_grid(
     batch_sizes: List[int] = (5,10,15),
     time_thresholds: List[float] = (1.0,2.0,5.0),
     popularity_modes: List[str] = ("uniforme","concentrada"),
+    slotting_modes: List[str] = ("hotspot",),     # "hotspot" | "optimized" | "random"
     seeds: List[int] = (7,11,23),
     # parámetros comunes del entorno
     horizon_min: int = 240,
     lam_per_min: float = 0.8,
-    n_skus: int = 120
+    n_skus: int = 120,
+    # demanda variable en el tiempo (opcional): λ(t) por tramos o callable, y lotes
+    rate_profile=None,
+    arrival_batch_mean: float = 1.0,
+    # perfilado: agrega las fases de todas las corridas en <out_csv>.profile.json
+    profile: bool = False,
+    # pre-screening M/G/c: None | "flag" (simula todo y anota) | "prune" (no simula saturadas/ociosas)
+    prescreen: Optional[str] = None,
+    rho_saturated: float = 1.05,
+    rho_idle: float = 0.1,
+    # procesos worker (>1): cada entorno se publica en memoria compartida y los workers se adjuntan
+    workers: int = 1,
 ) -> Path:
+    if prescreen not in (None, "flag", "prune"):
+        raise ValueError(f"prescreen no soportado: {prescreen} (usa None, 'flag' o 'prune')")
     out_csv.parent.mkdir(parents=True, exist_ok=True)
-    with out_csv.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=[
-            "policy","n_pickers","speed_m_per_min","congestion",
-            "batch_size","time_threshold_min","sku_popularity","seed",
-            "orders_total","makespan_min","throughput_per_hour",
-            "avg_wait_min","util_avg","util_max"
-        ])
-        w.writeheader()
+    grid_prof = SimProfiler() if profile else None
+    phase = (lambda name: grid_prof.phase(name)) if grid_prof is not None else (lambda name: NULL_PHASE)
+    sim_reports: List[Dict[str, Any]] = []
+    screened: List[tuple] = []     # (estimación, resultado simulado) para medir el error del surrogate
+    pruned = 0
+    tasks = _tasks(policies, n_pickers_list, speeds, congestion_modes, batch_sizes, time_thresholds)
+    pool = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from src.experiments.shm_env import SharedEnv
+        pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        with out_csv.open("w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=_fieldnames(prescreen))
+            w.writeheader()
+
+            for seed in seeds:
+                for pop_mode in popularity_modes:
+                    for slot_mode in slotting_modes:
+                        with phase("env"):
+                            grid, placement, orders = _env(seed, n_skus, lam_per_min, horizon_min, pop_mode,
+                                                          rate_profile=rate_profile, batch_mean=arrival_batch_mean,
+                                                          slotting=slot_mode)
+                        ctx = dict(seed=seed, pop_mode=pop_mode, slot_mode=slot_mode, horizon_min=horizon_min,
+                                   profile=profile, prescreen=prescreen,
+                                   rho_saturated=rho_saturated, rho_idle=rho_idle)
+                        if pool is None:
+                            # jobs y paths se rutean una vez por (política, parámetro) y se reutilizan
+                            # en todas las combinaciones de n_pickers × velocidad × congestión
+                            cache = JobCache(orders, grid, placement)
+                            results = [_run_task(grid, placement, orders, cache, t, ctx, phase) for t in tasks]
+                        else:
+                            # se publica una vez; los workers reciben sólo el handle (nombres de bloques)
+                            with SharedEnv(grid, placement, orders) as shenv, phase("simulate"):
+                                futs = [pool.submit(_worker_chunk, shenv.handle, ctx, chunk)
+                                        for chunk in _chunks(tasks, workers)]
+                                results = [r for fut in futs for r in fut.result()]
+                        # filas en el mismo orden que la corrida serial
+                        for row, est, res in results:
+                            if res is not None:
+                                sim_reports.append(res.profile)
+                                if est is not None:
+                                    screened.append((est, res))
+                            elif est is not None:
+                                pruned += 1
+                            w.writerow(row)
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
-        for seed in seeds:
-            for pop_mode in popularity_modes:
-                grid, placement, orders = _env(seed, n_skus, lam_per_min, horizon_min, pop_mode)
+    if prescreen:
+        by_status: Dict[str, list] = {}
+        for est, res in screened:
+            by_status.setdefault(est.status, []).append((est, res))
+        report = {
+            "mode": prescreen,
+            "pruned": pruned,
+            "simulated": len(screened),
+            "error": surrogate_error(screened),
+            "error_by_status": {k: surrogate_error(v) for k, v in by_status.items()},
+        }
+        out_csv.with_suffix(".surrogate.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
 
-                for policy in policies:
-                    for n_pickers in n_pickers_list:
-                        for speed in speeds:
-                            for congest in congestion_modes:
-                                # elegir params según policy
-                                if policy == "Secuencial_FCFS":
-                                    cfg = SimConfig(policy=policy, n_pickers=n_pickers,
-                                                    speed_m_per_min=speed, congestion=congest,
-                                                    horizon_min=horizon_min)
-                                    sim = Simulator(grid, placement, orders, cfg)
-                                    res = sim.run()
-                                    row = to_row(policy, n_pickers, speed, congest, 0, 0.0, pop_mode, seed, res)
-                                    w.writerow(row.to_dict())
-                                elif policy == "Batching_Size":
-                                    for bsz in batch_sizes:
-                                        cfg = SimConfig(policy=policy, n_pickers=n_pickers,
-                                                        speed_m_per_min=speed, congestion=congest,
-                                                        batch_size=bsz, horizon_min=horizon_min)
-                                        sim = Simulator(grid, placement, orders, cfg)
-                                        res = sim.run()
-                                        row = to_row(policy, n_pickers, speed, congest, bsz, 0.0, pop_mode, seed, res)
-                                        w.writerow(row.to_dict())
-                                elif policy == "Batching_Time":
-                                    for thr in time_thresholds:
-                                        cfg = SimConfig(policy=policy, n_pickers=n_pickers,
-                                                        speed_m_per_min=speed, congestion=congest,
-                                                        time_threshold_min=thr, horizon_min=horizon_min)
-                                        sim = Simulator(grid, placement, orders, cfg)
-                                        res = sim.run()
-                                        row = to_row(policy, n_pickers, speed, congest, 0, thr, pop_mode, seed, res)
-                                        w.writerow(row.to_dict())
+    if grid_prof is not None:
+        summary = merge_reports(sim_reports)
+        summary["grid_phases_s"] = grid_prof.report()["phases_s"]
+        prof_path = out_csv.with_suffix(".profile.json")
+        prof_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
     return out_csv
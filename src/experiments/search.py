@@ -0,0 +1,270 @@
+# src/experiments/search.py
+"""
+Búsqueda adaptativa de configuraciones (en lugar del producto cartesiano de run_grid).
+
+- successive_halving: todas las configs discretas con pocas réplicas (seeds); en cada
+  ronda se queda con 1/eta (por rango de Pareto y luego por SLA) y triplica réplicas.
+- es_optimize: (μ/μ_w, λ)-ES diagonal estilo CMA para parámetros continuos
+  (p.ej. time_threshold_min), con paso adaptado por regla de éxito.
+- pareto_front: frente throughput (max) vs espera p95 (min).
+
+La caja negra es el simulador (fastpath.simulate → mismos KPIs que Simulator.run);
+cada (config, seed) se simula una sola vez y se cachea.
+"""
+import math
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+from src.sim.engine import SimConfig
+from src.sim.fastpath import simulate
+from src.sim.job_cache import JobCache
+
+Params = Dict[str, Any]
+
+
+@dataclass
+class Evaluation:
+    params: Params
+    seeds: Tuple[int, ...]
+    throughput_per_hour: float
+    wait_p95_min: float
+    avg_wait_min: float
+    util_avg: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class SearchResult:
+    best: Optional[Evaluation]
+    front: List[Evaluation]
+    evaluations: List[Evaluation]       # evaluaciones con todas las réplicas
+    n_sims: int                         # simulaciones (config, seed) efectivamente corridas
+    history: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _key(params: Params) -> Tuple:
+    return tuple(sorted(params.items()))
+
+
+class SimEvaluator:
+    """
+    Evalúa configs promediando réplicas. Entorno (grid/placement/orders) y JobCache
+    por seed se construyen una vez; los resultados por (config, seed) se cachean.
+    """
+
+    def __init__(self, horizon_min: int = 240, lam_per_min: float = 0.8, n_skus: int = 120,
+                 popularity: str = "uniforme", slotting: str = "hotspot",
+                 speed_m_per_min: float = 60.0, congestion: str = "off",
+                 env_fn: Optional[Callable[[int], tuple]] = None):
+        from src.experiments.runner import _env
+        self.horizon_min = horizon_min
+        self.speed = speed_m_per_min
+        self.congestion = congestion
+        self._env_fn = env_fn or (lambda seed: _env(seed, n_skus, lam_per_min, horizon_min, popularity, slotting=slotting))
+        self._envs: Dict[int, tuple] = {}
+        self._runs: Dict[Tuple, Tuple[float, float, float, float]] = {}
+        self.n_sims = 0
+
+    def _env(self, seed: int):
+        env = self._envs.get(seed)
+        if env is None:
+            grid, placement, orders = self._env_fn(seed)
+            env = self._envs[seed] = (grid, placement, orders, JobCache(orders, grid, placement))
+        return env
+
+    def run_one(self, params: Params, seed: int) -> Tuple[float, float, float, float]:
+        key = (_key(params), seed)
+        out = self._runs.get(key)
+        if out is None:
+            grid, placement, orders, cache = self._env(seed)
+            kw = dict(speed_m_per_min=self.speed, congestion=self.congestion)
+            kw.update(params)
+            cfg = SimConfig(horizon_min=self.horizon_min, trace=False, **kw)
+            jobs, paths = cache.for_config(cfg)
+            res = simulate(grid, placement, orders, cfg, jobs=jobs, path_cache=paths, series=False)
+            util = float(np.mean(res.picker_utilization)) if res.picker_utilization else 0.0
+            out = self._runs[key] = (res.throughput_per_hour, res.wait_p95_min, res.avg_wait_min, util)
+            self.n_sims += 1
+        return out
+
+    def __call__(self, params: Params, seeds: Sequence[int]) -> Evaluation:
+        runs = np.array([self.run_one(params, s) for s in seeds], dtype=float)
+        thr, p95, avg, util = runs.mean(axis=0).tolist()
+        return Evaluation(dict(params), tuple(seeds), thr, p95, avg, util)
+
+
+# -------------------- Pareto y ranking --------------------
+
+def _dominates(a: Evaluation, b: Evaluation) -> bool:
+    return (a.throughput_per_hour >= b.throughput_per_hour and a.wait_p95_min <= b.wait_p95_min
+            and (a.throughput_per_hour > b.throughput_per_hour or a.wait_p95_min < b.wait_p95_min))
+
+def pareto_front(evals: Iterable[Evaluation]) -> List[Evaluation]:
+    """No dominados en (throughput ↑, p95 ↓), ordenados por throughput."""
+    evals = list(evals)
+    front = [e for e in evals if not any(_dominates(o, e) for o in evals if o is not e)]
+    return sorted(front, key=lambda e: (-e.throughput_per_hour, e.wait_p95_min))
+
+def pareto_ranks(evals: Sequence[Evaluation]) -> List[int]:
+    """Rango por ordenamiento no dominado (0 = frente)."""
+    rank = [-1] * len(evals)
+    left = set(range(len(evals)))
+    r = 0
+    while left:
+        layer = {i for i in left if not any(_dominates(evals[j], evals[i]) for j in left if j != i)}
+        for i in layer:
+            rank[i] = r
+        left -= layer
+        r += 1
+    return rank
+
+def sla_key(e: Evaluation, sla_p95_min: Optional[float]) -> Tuple:
+    """Orden de preferencia: cumple SLA → mayor throughput → menos pickers → menor p95."""
+    ok = sla_p95_min is None or e.wait_p95_min <= sla_p95_min
+    return (0 if ok else 1, -round(e.throughput_per_hour, 6), e.params.get("n_pickers", 0), e.wait_p95_min)
+
+def best_under_sla(evals: Iterable[Evaluation], sla_p95_min: Optional[float]) -> Optional[Evaluation]:
+    evals = list(evals)
+    if not evals:
+        return None
+    best = min(evals, key=lambda e: sla_key(e, sla_p95_min))
+    if sla_p95_min is not None and best.wait_p95_min > sla_p95_min:
+        return None
+    return best
+
+
+# -------------------- Espacio discreto --------------------
+
+def grid_candidates(policies: Sequence[str], n_pickers_list: Sequence[int],
+                    batch_sizes: Sequence[int] = (), time_thresholds: Sequence[float] = ()) -> List[Params]:
+    """Mismas variantes que run_grid (FCFS sin parámetro, Size × batch, Time × umbral, Proximity × ambos)."""
+    out: List[Params] = []
+    for policy in policies:
+        for n in n_pickers_list:
+            if policy == "Secuencial_FCFS":
+                out.append({"policy": policy, "n_pickers": n})
+            elif policy == "Batching_Size":
+                out += [{"policy": policy, "n_pickers": n, "batch_size": b} for b in batch_sizes]
+            elif policy == "Batching_Time":
+                out += [{"policy": policy, "n_pickers": n, "time_threshold_min": float(t)} for t in time_thresholds]
+            elif policy == "Batching_Proximity":
+                out += [{"policy": policy, "n_pickers": n, "batch_size": b, "time_threshold_min": float(t)}
+                        for b in batch_sizes for t in time_thresholds]
+    return out
+
+def successive_halving(evaluator: SimEvaluator, candidates: Sequence[Params], seeds: Sequence[int],
+                       eta: int = 3, min_seeds: int = 1, sla_p95_min: Optional[float] = None) -> SearchResult:
+    """
+    Rondas con min_seeds·eta^k réplicas; se conservan ceil(n/eta) por (rango Pareto, SLA).
+    La última ronda evalúa a los sobrevivientes con todas las seeds.
+    """
+    seeds = list(seeds)
+    alive = list(candidates)
+    n_seeds = max(1, min(min_seeds, len(seeds)))
+    history = []
+    while True:
+        evals = [evaluator(p, seeds[:n_seeds]) for p in alive]
+        history.append({"seeds": n_seeds, "candidates": len(alive), "n_sims": evaluator.n_sims})
+        if n_seeds >= len(seeds) or len(alive) <= 1:
+            break
+        ranks = pareto_ranks(evals)
+        order = sorted(range(len(evals)), key=lambda i: (ranks[i], sla_key(evals[i], sla_p95_min)))
+        keep = max(1, math.ceil(len(alive) / eta))
+        alive = [alive[i] for i in order[:keep]]
+        n_seeds = min(len(seeds), n_seeds * eta)
+    return SearchResult(
+        best=best_under_sla(evals, sla_p95_min),
+        front=pareto_front(evals),
+        evaluations=evals,
+        n_sims=evaluator.n_sims,
+        history=history,
+    )
+
+
+# -------------------- Espacio continuo (ES estilo CMA) --------------------
+
+def es_optimize(f: Callable[[np.ndarray], float], x0: Sequence[float], sigma0: float,
+                bounds: Sequence[Tuple[float, float]], iters: int = 15, popsize: int = 6,
+                seed: int = 0, tol: float = 1e-3) -> Tuple[np.ndarray, float, List[Tuple[np.ndarray, float]]]:
+    """
+    Minimiza f con una (μ/μ_w, λ)-ES de covarianza diagonal (sep-CMA simplificada):
+    recombinación ponderada de los μ mejores, adaptación de varianzas por coordenada
+    y paso global por regla de éxito 1/5. Trabaja en [0,1]^d normalizado a `bounds`.
+    """
+    rng = np.random.default_rng(seed)
+    lo = np.array([b[0] for b in bounds], dtype=float)
+    hi = np.array([b[1] for b in bounds], dtype=float)
+    span = hi - lo
+    to_x = lambda z: lo + np.clip(z, 0.0, 1.0) * span
+    m = (np.asarray(x0, dtype=float) - lo) / span
+    d = m.size
+    diag = np.ones(d)
+    sigma = sigma0
+    mu = max(1, popsize // 2)
+    w = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    w /= w.sum()
+    c_diag = 0.3
+    best_x, best_f = to_x(m), f(to_x(m))
+    hist = [(best_x, best_f)]
+    f_mean = best_f
+    for _ in range(iters):
+        z = rng.standard_normal((popsize, d))
+        cand = np.clip(m + sigma * np.sqrt(diag) * z, 0.0, 1.0)
+        fx = np.array([f(to_x(c)) for c in cand])
+        hist += [(to_x(c), float(v)) for c, v in zip(cand, fx)]
+        idx = np.argsort(fx, kind="stable")[:mu]
+        step = (cand[idx] - m) / max(sigma, 1e-12)
+        m = m + (w[:, None] * (cand[idx] - m)).sum(axis=0)
+        diag = (1 - c_diag) * diag + c_diag * (w[:, None] * step ** 2).sum(axis=0)
+        success = np.mean(fx < f_mean)
+        sigma *= math.exp((success - 0.2) / 0.8)
+        f_mean = float(np.dot(w, fx[idx]))
+        if fx[idx[0]] < best_f:
+            best_x, best_f = to_x(cand[idx[0]]), float(fx[idx[0]])
+        if sigma * math.sqrt(diag.max()) < tol:
+            break
+    return best_x, best_f, hist
+
+
+def tune_continuous(evaluator: SimEvaluator, base: Params, name: str, bounds: Tuple[float, float],
+                    seeds: Sequence[int], sla_p95_min: Optional[float] = None,
+                    iters: int = 10, popsize: int = 6, seed: int = 0) -> Evaluation:
+    """
+    Afina un parámetro continuo de `base` (p.ej. time_threshold_min) con es_optimize.
+    Objetivo: −throughput + penalización por violar el SLA de p95.
+    """
+    def score(x: np.ndarray) -> float:
+        ev = evaluator(dict(base, **{name: round(float(x[0]), 3)}), seeds)
+        pen = 0.0 if sla_p95_min is None else max(0.0, ev.wait_p95_min - sla_p95_min) * 1e3
+        return -ev.throughput_per_hour + pen + 1e-3 * ev.wait_p95_min
+
+    x0 = [float(base.get(name, 0.5 * (bounds[0] + bounds[1])))]
+    x, _, _ = es_optimize(score, x0, 0.3, [bounds], iters=iters, popsize=popsize, seed=seed)
+    return evaluator(dict(base, **{name: round(float(x[0]), 3)}), seeds)
+
+
+def search(evaluator: SimEvaluator, candidates: Sequence[Params], seeds: Sequence[int],
+           sla_p95_min: Optional[float] = None, eta: int = 3,
+           continuous: Optional[Dict[str, Tuple[float, float]]] = None, es_iters: int = 8) -> SearchResult:
+    """
+    successive_halving sobre el espacio discreto y, si `continuous` = {param: (lo, hi)},
+    afinado ES del parámetro continuo en los sobrevivientes que lo usan.
+    """
+    res = successive_halving(evaluator, candidates, seeds, eta=eta, sla_p95_min=sla_p95_min)
+    if continuous:
+        tuned = list(res.evaluations)
+        for ev in res.evaluations:
+            for name, bounds in continuous.items():
+                if name in ev.params:
+                    tuned.append(tune_continuous(evaluator, ev.params, name, bounds, seeds, sla_p95_min, iters=es_iters))
+        res = SearchResult(
+            best=best_under_sla(tuned, sla_p95_min),
+            front=pareto_front(tuned),
+            evaluations=tuned,
+            n_sims=evaluator.n_sims,
+            history=res.history + [{"es_tuned": len(tuned) - len(res.evaluations), "n_sims": evaluator.n_sims}],
+        )
+    return res
@@ -0,0 +1,166 @@
+# src/experiments/shm_env.py
+"""
+Entornos compartidos (multiprocessing.shared_memory) para workers de barridos.
+
+El padre publica una vez por entorno (seed × popularidad × slotting):
+  - pedidos en columnas: arrival, due (NaN = sin due), express, item_ptr / item_sku (CSR);
+  - placement: coordenadas por SKU (en el orden de sku_ids);
+  - tabla de distancias del SlotRouter (coords + matriz), si la grilla tiene router.
+Los workers reciben sólo un EnvHandle (nombres de bloques, shapes y la lista de SKUs)
+y se adjuntan sin copiar: los arrays son vistas sobre la memoria compartida. Los
+objetos Order se re-arman una vez por worker y entorno desde las columnas (sin
+pickle); la matriz de distancias, lo más pesado, nunca se copia.
+"""
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+import math
+import uuid
+import numpy as np
+
+from src.demand.orders import Order, _count_items
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+from src.warehouse.dist_cache import SlotRouter
+
+
+@dataclass(frozen=True)
+class ArraySpec:
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+@dataclass
+class EnvHandle:
+    """Lo único que viaja al worker (chico y picklable)."""
+    key: str
+    spec: Dict[str, Any]
+    sku_ids: List[str]
+    arrays: Dict[str, ArraySpec] = field(default_factory=dict)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(int(np.prod(a.shape)) * np.dtype(a.dtype).itemsize for a in self.arrays.values())
+
+
+def _columns(placement: SKUPlacement, orders: List[Order], router: Optional[SlotRouter]):
+    sku_ids = list(placement.sku_to_coord)
+    index = {s: i for i, s in enumerate(sku_ids)}
+    for o in orders:
+        for s in o.items:
+            if s not in index:
+                index[s] = len(sku_ids)
+                sku_ids.append(s)
+    n = len(orders)
+    lens = np.fromiter((len(o.items) for o in orders), dtype=np.int64, count=n)
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(lens, out=ptr[1:])
+    cols: Dict[str, np.ndarray] = {
+        "arrival": np.fromiter((o.arrival_min for o in orders), dtype=np.float64, count=n),
+        "due": np.fromiter((math.nan if o.due_min is None else o.due_min for o in orders), dtype=np.float64, count=n),
+        "express": np.fromiter((bool(o.express) for o in orders), dtype=bool, count=n),
+        "item_ptr": ptr,
+        "item_sku": np.fromiter((index[s] for o in orders for s in o.items), dtype=np.int32, count=int(ptr[-1])),
+        "slot_xy": np.array([placement.sku_to_coord.get(s, (-1, -1)) for s in sku_ids], dtype=np.int32).reshape(-1, 2),
+    }
+    if router is not None:
+        cols["router_xy"] = np.array(list(router.index), dtype=np.int32).reshape(-1, 2)
+        cols["router_d"] = np.ascontiguousarray(router.matrix, dtype=np.int32)
+    return sku_ids, cols
+
+
+class SharedEnv:
+    """
+    Publica (grid, placement, orders) en memoria compartida. Usar como context manager
+    o llamar close(): libera y borra (unlink) los bloques.
+    """
+
+    def __init__(self, grid: WarehouseGrid, placement: SKUPlacement, orders: List[Order]):
+        router = grid.router if isinstance(getattr(grid, "router", None), SlotRouter) else None
+        sku_ids, cols = _columns(placement, orders, router)
+        self._blocks: List[shared_memory.SharedMemory] = []
+        arrays: Dict[str, ArraySpec] = {}
+        try:
+            for name, arr in cols.items():
+                shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+                self._blocks.append(shm)
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+                arrays[name] = ArraySpec(shm.name, tuple(arr.shape), arr.dtype.str)
+        except BaseException:
+            self.close()
+            raise
+        self.handle = EnvHandle(key=uuid.uuid4().hex, spec=grid.spec, sku_ids=sku_ids, arrays=arrays)
+
+    def close(self) -> None:
+        for shm in self._blocks:
+            try:
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+
+    def __enter__(self) -> "SharedEnv":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class AttachedEnv:
+    """Vista de un EnvHandle en el worker: arrays sobre la memoria compartida."""
+
+    def __init__(self, handle: EnvHandle):
+        self.handle = handle
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, a in handle.arrays.items():
+            shm = shared_memory.SharedMemory(name=a.name)
+            self._blocks.append(shm)
+            arr = np.ndarray(a.shape, dtype=np.dtype(a.dtype), buffer=shm.buf)
+            arr.flags.writeable = False
+            self.arrays[name] = arr
+        self._env: Optional[Tuple[WarehouseGrid, SKUPlacement, List[Order]]] = None
+
+    def env(self) -> Tuple[WarehouseGrid, SKUPlacement, List[Order]]:
+        if self._env is None:
+            h, a = self.handle, self.arrays
+            grid = WarehouseGrid(h.spec)
+            if "router_d" in a:
+                grid.router = SlotRouter([tuple(xy) for xy in a["router_xy"].tolist()], a["router_d"])
+            placement = SKUPlacement({s: (int(x), int(y)) for s, (x, y) in zip(h.sku_ids, a["slot_xy"].tolist())
+                                      if x >= 0})
+            ptr = a["item_ptr"].tolist()
+            skus = [h.sku_ids[i] for i in a["item_sku"].tolist()]
+            orders = []
+            for i, (t, due, exp) in enumerate(zip(a["arrival"].tolist(), a["due"].tolist(), a["express"].tolist())):
+                items = skus[ptr[i]:ptr[i + 1]]
+                orders.append(Order(arrival_min=t, items=items, item_counts=_count_items(items),
+                                    due_min=None if math.isnan(due) else due, express=bool(exp)))
+            self._env = (grid, placement, orders)
+        return self._env
+
+    def close(self) -> None:
+        self._env = None
+        self.arrays = {}
+        for shm in self._blocks:
+            try:
+                shm.close()
+            except BufferError:
+                pass          # queda alguna vista viva (p.ej. SlotRouter): se libera al salir
+        self._blocks = []
+
+
+# adjuntos del proceso actual (un worker reusa el entorno entre tareas)
+_ATTACHED: Dict[str, AttachedEnv] = {}
+_MAX_ATTACHED = 2
+
+
+def attach_env(handle: EnvHandle) -> AttachedEnv:
+    env = _ATTACHED.get(handle.key)
+    if env is None:
+        while len(_ATTACHED) >= _MAX_ATTACHED:
+            _ATTACHED.pop(next(iter(_ATTACHED))).close()
+        env = _ATTACHED[handle.key] = AttachedEnv(handle)
+    return env
@@ -0,0 +1,166 @@
+# src/experiments/surrogate.py
+"""
+Surrogate analítico de colas para pre-filtrar barridos.
+
+Cada config se aproxima como una M/G/c (Allen–Cunneen):
+    Wq ≈ C(c, a) / (c·μ − λ) · (ca² + cs²) / 2
+con λ = jobs/min, μ = 1/E[S], a = λ/μ, C = Erlang C, ca²/cs² = SCV de
+inter-arribos y de servicio medidos sobre la lista de jobs. La espera por pedido
+suma además el tiempo de formación del lote (release − llegada del pedido).
+Saturada (ρ ≥ 1) con horizonte T: aproximación fluida, el k-ésimo job atendido
+espera k·(1/cμ − 1/λ) → Wq ≈ T/2 · (1 − 1/ρ).
+"""
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import math
+import numpy as np
+
+from src.sim.engine import SimResult
+from src.sim.events import Job
+
+
+@dataclass
+class QueueEstimate:
+    lam_jobs_per_min: float
+    mean_service_min: float
+    scv_service: float
+    scv_arrival: float
+    orders_per_job: float
+    n_pickers: int
+    rho: float                   # λ / (c·μ); > 1 → saturado
+    utilization: float           # min(1, ρ)
+    wq_min: float                # espera en cola por job (fluida si saturado; inf sin horizonte)
+    avg_wait_min: float          # espera por pedido (cola + formación del lote)
+    throughput_per_hour: float   # pedidos/h
+    distance_per_order_m: float
+    status: str                  # "ok" | "saturated" | "idle"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def as_result(self, horizon_min: float) -> SimResult:
+        """SimResult sintético (para escribir filas podadas con to_row)."""
+        orders = int(round(self.throughput_per_hour * horizon_min / 60.0))
+        util = [self.utilization] * self.n_pickers
+        return SimResult(
+            makespan_min=float(horizon_min),
+            orders_completed=orders,
+            throughput_per_hour=self.throughput_per_hour,
+            avg_wait_min=self.avg_wait_min,
+            picker_utilization=util,
+            wait_p90_min=float("nan"),
+            wait_p95_min=float("nan"),
+            distance_total_m=self.distance_per_order_m * orders,
+            distance_per_order_avg_m=self.distance_per_order_m,
+            batches_count=0,
+            batch_avg_size=0.0,
+            batch_pct_ge2=0.0,
+            batch_avg_release_min=0.0,
+            batch_avg_fill_min=0.0,
+            ts_queue=[(0.0, 0)],
+            ts_completed=[(0.0, 0)],
+            gantt=[[] for _ in range(self.n_pickers)],
+            waits_raw=[],
+            picker_idle_min=[max(0.0, horizon_min * (1.0 - self.utilization))] * self.n_pickers,
+            picker_tours=[0] * self.n_pickers,
+        )
+
+
+def erlang_c(c: int, a: float) -> float:
+    """P(esperar) en M/M/c con carga ofrecida a = λ/μ (recursión estable vía Erlang B)."""
+    if c <= 0:
+        return 1.0
+    rho = a / c
+    if rho >= 1.0:
+        return 1.0
+    b = 1.0
+    for k in range(1, c + 1):
+        b = a * b / (k + a * b)
+    return b / (1.0 - rho * (1.0 - b))
+
+
+def _scv(x: np.ndarray) -> float:
+    if x.size < 2:
+        return 1.0
+    m = float(x.mean())
+    return float(x.var() / (m * m)) if m > 0 else 0.0
+
+
+def estimate(jobs: Sequence[Job], n_pickers: int, horizon_min: Optional[float] = None,
+             rho_saturated: float = 1.05, rho_idle: float = 0.1) -> QueueEstimate:
+    """Estimación M/G/c para una lista de jobs (la misma que simularía el motor)."""
+    if not jobs:
+        return QueueEstimate(0.0, 0.0, 0.0, 1.0, 0.0, n_pickers, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, "idle")
+    arr = np.sort(np.array([j.arrival_min for j in jobs], dtype=float))
+    svc = np.array([j.service_min for j in jobs], dtype=float)
+    n_orders = np.array([j.n_orders for j in jobs], dtype=float)
+    span = float(horizon_min) if horizon_min else float(arr[-1]) or 1.0
+    lam = len(jobs) / span
+    es = float(svc.mean())
+    opj = float(n_orders.mean())
+    ca2 = _scv(np.diff(arr)) if arr.size > 2 else 1.0
+    cs2 = _scv(svc)
+
+    c = max(1, int(n_pickers))
+    a = lam * es
+    rho = a / c
+    if rho < 1.0:
+        wq = erlang_c(c, a) / (c / es - lam) * (ca2 + cs2) / 2.0 if es > 0 else 0.0
+        thr_jobs = lam
+    else:
+        wq = 0.5 * float(horizon_min) * (1.0 - 1.0 / rho) if horizon_min else math.inf
+        thr_jobs = c / es
+    # formación del lote: release del job − llegada de cada pedido
+    form = [j.arrival_min - o.arrival_min for j in jobs for o in (j.orders or [])]
+    form_mean = float(np.mean(form)) if form else 0.0
+    meters = np.array([j.meters for j in jobs], dtype=float)
+    dist = float(meters.sum() / n_orders.sum()) if n_orders.sum() > 0 else 0.0
+
+    status = "saturated" if rho >= rho_saturated else ("idle" if rho <= rho_idle else "ok")
+    return QueueEstimate(
+        lam_jobs_per_min=lam,
+        mean_service_min=es,
+        scv_service=cs2,
+        scv_arrival=ca2,
+        orders_per_job=opj,
+        n_pickers=c,
+        rho=rho,
+        utilization=min(1.0, rho),
+        wq_min=wq,
+        avg_wait_min=wq + form_mean,
+        throughput_per_hour=thr_jobs * opj * 60.0,
+        distance_per_order_m=dist,
+        status=status,
+    )
+
+
+def surrogate_error(pairs: Iterable[tuple]) -> Dict[str, Any]:
+    """
+    Error del surrogate contra simulación sobre pares (QueueEstimate, SimResult).
+    Devuelve MAE y MAPE (%) de throughput, utilización media y espera media;
+    estimaciones no finitas (saturada sin horizonte) se excluyen.
+    """
+    err: Dict[str, List[float]] = {"throughput_per_hour": [], "utilization": [], "avg_wait_min": []}
+    rel: Dict[str, List[float]] = {k: [] for k in err}
+    n = 0
+    for est, res in pairs:
+        n += 1
+        util = float(np.mean(res.picker_utilization)) if res.picker_utilization else 0.0
+        obs = {"throughput_per_hour": res.throughput_per_hour, "utilization": util, "avg_wait_min": res.avg_wait_min}
+        hat = {"throughput_per_hour": est.throughput_per_hour, "utilization": est.utilization,
+               "avg_wait_min": est.avg_wait_min}
+        for k in err:
+            if not math.isfinite(hat[k]):
+                continue
+            e = abs(hat[k] - obs[k])
+            err[k].append(e)
+            if abs(obs[k]) > 1e-9:
+                rel[k].append(100.0 * e / abs(obs[k]))
+    out: Dict[str, Any] = {"n": n}
+    for k in err:
+        out[k] = {
+            "mae": float(np.mean(err[k])) if err[k] else float("nan"),
+            "mape_pct": float(np.mean(rel[k])) if rel[k] else float("nan"),
+            "n": len(err[k]),
+        }
+    return out
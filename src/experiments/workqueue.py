@@ -0,0 +1,359 @@
+# src/experiments/workqueue.py
+"""
+Barridos multi-nodo con una cola de trabajo en disco (sin servicios externos).
+
+- publish_grid() publica una tarea por config del barrido (la misma grilla que
+  run_grid). El id es el hash de la config (entorno + política + parámetros), así
+  que re-publicar es idempotente.
+- run_worker() reclama tareas con lease, corre cada config y guarda la fila en la
+  misma base. Cualquier cantidad de procesos, en cualquier host que vea el
+  directorio, puede trabajar a la vez. Una tarea con el lease vencido (worker
+  muerto) vuelve a reclamarse hasta max_attempts.
+- export_csv() escribe las filas en el orden de publicación, con las columnas de run_grid.
+
+Mientras corre una tarea, un hilo renueva el lease (heartbeat cada lease_s / 3):
+sólo se reclaman tareas de workers muertos o colgados, no las largas. complete() y
+fail() exigen que la tarea siga siendo del worker: un lease perdido no pisa la fila
+de quien la reclamó después.
+
+Reproducibilidad: la fila de una tarea depende sólo de su payload (seeds explícitas y
+tours con desempates determinísticos, sin depender de PYTHONHASHSEED), así que una
+tarea re-corrida en otro host/proceso da la misma fila que run_grid.
+
+SQLiteWorkQueue usa el journal por defecto (no WAL): WAL no es seguro sobre
+sistemas de archivos de red. WorkQueue es la interfaz para otros backends.
+"""
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import csv
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+
+from src.experiments.runner import _env, _tasks, _run_task, _fieldnames
+from src.sim.job_cache import JobCache
+
+
+def task_id(payload: Dict[str, Any]) -> str:
+    """Id idempotente: hash de la config canónica (JSON con claves ordenadas)."""
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:24]
+
+
+class WorkQueue(ABC):
+    """Interfaz de cola: publish / claim / heartbeat / complete / fail / progress / results."""
+
+    @abstractmethod
+    def publish(self, payloads: Iterable[Dict[str, Any]]) -> List[str]:
+        ...
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_s: float) -> Optional[Tuple[str, Dict[str, Any]]]:
+        ...
+
+    @abstractmethod
+    def heartbeat(self, tid: str, worker_id: str, lease_s: float) -> bool:
+        """Extiende el lease; False si la tarea ya no es de este worker."""
+
+    @abstractmethod
+    def complete(self, tid: str, worker_id: str, row: Dict[str, Any]) -> bool:
+        """Guarda la fila; False (sin escribir) si la tarea ya no es de este worker."""
+
+    @abstractmethod
+    def fail(self, tid: str, worker_id: str, error: str) -> None:
+        ...
+
+    @abstractmethod
+    def progress(self) -> Dict[str, int]:
+        ...
+
+    @abstractmethod
+    def results(self) -> List[Dict[str, Any]]:
+        ...
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',      -- pending | running | done | failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    error TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks(state, seq);
+CREATE TABLE IF NOT EXISTS results (
+    id TEXT PRIMARY KEY,
+    row TEXT NOT NULL,
+    worker TEXT,
+    finished REAL
+);
+"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """Cola + resultados en un archivo SQLite compartido (una conexión por hilo y proceso)."""
+
+    def __init__(self, path, max_attempts: int = 3, timeout_s: float = 60.0):
+        self.path = Path(path)
+        self.max_attempts = int(max_attempts)
+        self.timeout_s = float(timeout_s)
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db().executescript(_SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        # una conexión por hilo (el heartbeat corre aparte) y por proceso (fork)
+        loc = self._local
+        if getattr(loc, "conn", None) is None or loc.pid != os.getpid():
+            loc.conn = sqlite3.connect(str(self.path), timeout=self.timeout_s, isolation_level=None)
+            loc.pid = os.getpid()
+        return loc.conn
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _tx(self):
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")   # toma el lock de escritura: claim atómico entre procesos/hosts
+        return db
+
+    def publish(self, payloads: Iterable[Dict[str, Any]]) -> List[str]:
+        ids: List[str] = []
+        rows = []
+        for p in payloads:
+            tid = task_id(p)
+            ids.append(tid)
+            rows.append((tid, json.dumps(p, sort_keys=True), time.time()))
+        db = self._tx()
+        try:
+            db.executemany("INSERT OR IGNORE INTO tasks(id, payload, updated) VALUES (?, ?, ?)", rows)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return ids
+
+    def claim(self, worker_id: str, lease_s: float = 600.0) -> Optional[Tuple[str, Dict[str, Any]]]:
+        db = self._tx()
+        try:
+            now = time.time()
+            while True:
+                cur = db.execute(
+                    "SELECT id, payload, attempts FROM tasks "
+                    "WHERE state = 'pending' OR (state = 'running' AND lease_until < ?) "
+                    "ORDER BY seq LIMIT 1", (now,))
+                hit = cur.fetchone()
+                if hit is None:
+                    db.execute("COMMIT")
+                    return None
+                tid, payload, attempts = hit
+                if attempts >= self.max_attempts:
+                    db.execute("UPDATE tasks SET state = 'failed', error = COALESCE(error, 'lease vencido'), "
+                               "updated = ? WHERE id = ?", (now, tid))
+                    continue
+                db.execute("UPDATE tasks SET state = 'running', worker = ?, lease_until = ?, "
+                           "attempts = attempts + 1, updated = ? WHERE id = ?",
+                           (worker_id, now + lease_s, now, tid))
+                db.execute("COMMIT")
+                return tid, json.loads(payload)
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def heartbeat(self, tid: str, worker_id: str, lease_s: float = 600.0) -> bool:
+        """Extiende el lease; False si la tarea ya no es de este worker."""
+        cur = self._db().execute(
+            "UPDATE tasks SET lease_until = ?, updated = ? WHERE id = ? AND worker = ? AND state = 'running'",
+            (time.time() + lease_s, time.time(), tid, worker_id))
+        return cur.rowcount == 1
+
+    def complete(self, tid: str, worker_id: str, row: Dict[str, Any]) -> bool:
+        db = self._tx()
+        try:
+            cur = db.execute("UPDATE tasks SET state = 'done', error = NULL, lease_until = NULL, updated = ? "
+                             "WHERE id = ? AND worker = ? AND state = 'running'",
+                             (time.time(), tid, worker_id))
+            if cur.rowcount != 1:
+                db.execute("ROLLBACK")     # lease perdido: la tarea es de otro (o ya terminó/falló)
+                return False
+            db.execute("INSERT OR REPLACE INTO results(id, row, worker, finished) VALUES (?, ?, ?, ?)",
+                       (tid, json.dumps(row), worker_id, time.time()))
+            db.execute("COMMIT")
+            return True
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def fail(self, tid: str, worker_id: str, error: str) -> None:
+        db = self._tx()
+        try:
+            db.execute("UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                       "error = ?, worker = NULL, lease_until = NULL, updated = ? "
+                       "WHERE id = ? AND worker = ? AND state = 'running'",
+                       (self.max_attempts, error, time.time(), tid, worker_id))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def progress(self) -> Dict[str, int]:
+        out = {"pending": 0, "running": 0, "done": 0, "failed": 0}
+        for state, n in self._db().execute("SELECT state, COUNT(*) FROM tasks GROUP BY state"):
+            out[state] = n
+        out["total"] = sum(out.values())
+        return out
+
+    def results(self) -> List[Dict[str, Any]]:
+        cur = self._db().execute(
+            "SELECT r.row FROM tasks t JOIN results r ON r.id = t.id ORDER BY t.seq")
+        return [json.loads(r) for (r,) in cur]
+
+    def errors(self) -> List[Tuple[str, str]]:
+        return list(self._db().execute(
+            "SELECT id, error FROM tasks WHERE state = 'failed' ORDER BY seq"))
+
+
+# ------------------------------ barridos ------------------------------
+
+def grid_payloads(
+    policies=("Secuencial_FCFS", "Batching_Size", "Batching_Time"),
+    n_pickers_list=(1, 2, 3),
+    speeds=(60.0,),
+    congestion_modes=("off", "light"),
+    batch_sizes=(5, 10, 15),
+    time_thresholds=(1.0, 2.0, 5.0),
+    popularity_modes=("uniforme", "concentrada"),
+    slotting_modes=("hotspot",),
+    seeds=(7, 11, 23),
+    horizon_min: int = 240,
+    lam_per_min: float = 0.8,
+    n_skus: int = 120,
+    rate_profile=None,
+    arrival_batch_mean: float = 1.0,
+    prescreen: Optional[str] = None,
+    rho_saturated: float = 1.05,
+    rho_idle: float = 0.1,
+) -> List[Dict[str, Any]]:
+    """Una tarea por fila de run_grid (mismos argumentos y mismo orden)."""
+    if callable(rate_profile):
+        raise ValueError("rate_profile callable no se puede publicar: usa tramos [(t_inicio, λ), ...]")
+    if prescreen not in (None, "flag", "prune"):
+        raise ValueError(f"prescreen no soportado: {prescreen} (usa None, 'flag' o 'prune')")
+    tasks = _tasks(policies, n_pickers_list, speeds, congestion_modes, batch_sizes, time_thresholds)
+    out = []
+    for seed in seeds:
+        for pop_mode in popularity_modes:
+            for slot_mode in slotting_modes:
+                env = dict(seed=seed, n_skus=n_skus, lam=lam_per_min, horizon=horizon_min, pop_mode=pop_mode,
+                           rate_profile=[list(x) for x in rate_profile] if rate_profile else None,
+                           batch_mean=arrival_batch_mean, slotting=slot_mode)
+                ctx = dict(seed=seed, pop_mode=pop_mode, slot_mode=slot_mode, horizon_min=horizon_min,
+                           profile=False, prescreen=prescreen, rho_saturated=rho_saturated, rho_idle=rho_idle)
+                for task in tasks:
+                    out.append({"env": env, "ctx": ctx, "task": list(task)})
+    return out
+
+
+def publish_grid(queue: WorkQueue, **grid_kwargs) -> List[str]:
+    """Publica el barrido (argumentos de run_grid, sin out_csv). Devuelve los ids de tarea."""
+    return queue.publish(grid_payloads(**grid_kwargs))
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class _LeaseKeeper:
+    """Hilo que renueva el lease de una tarea mientras corre (cada lease_s / 3)."""
+
+    def __init__(self, queue: WorkQueue, tid: str, worker_id: str, lease_s: float):
+        self.queue, self.tid, self.worker_id, self.lease_s = queue, tid, worker_id, lease_s
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name=f"lease-{tid}", daemon=True)
+
+    def _loop(self) -> None:
+        every = max(self.lease_s / 3.0, 0.01)
+        while not self._stop.wait(every):
+            try:
+                if not self.queue.heartbeat(self.tid, self.worker_id, self.lease_s):
+                    self.lost = True
+                    return
+            except sqlite3.OperationalError:
+                pass                        # base ocupada: se reintenta en el próximo tick
+
+    def __enter__(self) -> "_LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(queue: WorkQueue, worker_id: Optional[str] = None, lease_s: float = 600.0,
+               max_tasks: Optional[int] = None, wait_s: float = 0.0, poll_s: float = 2.0) -> int:
+    """
+    Reclama y corre tareas hasta vaciar la cola (o max_tasks). Con wait_s > 0 espera
+    tareas nuevas (o leases por vencer) hasta wait_s segundos sin trabajo. Devuelve
+    cuántas tareas completó. El entorno y su JobCache se reusan entre tareas seguidas.
+    Mientras corre cada tarea el lease se renueva en segundo plano; si igual se pierde
+    (p.ej. el proceso estuvo suspendido), la fila se descarta en complete().
+    """
+    worker_id = worker_id or default_worker_id()
+    env_key = None
+    env = None
+    done = 0
+    idle_since = time.time()
+    while max_tasks is None or done < max_tasks:
+        claimed = queue.claim(worker_id, lease_s)
+        if claimed is None:
+            if time.time() - idle_since >= wait_s:
+                break
+            time.sleep(poll_s)
+            continue
+        tid, payload = claimed
+        try:
+            with _LeaseKeeper(queue, tid, worker_id, lease_s):
+                key = json.dumps(payload["env"], sort_keys=True)
+                if key != env_key:
+                    e = payload["env"]
+                    grid, placement, orders = _env(e["seed"], e["n_skus"], e["lam"], e["horizon"], e["pop_mode"],
+                                                   rate_profile=e["rate_profile"], batch_mean=e["batch_mean"],
+                                                   slotting=e["slotting"])
+                    env, env_key = (grid, placement, orders, JobCache(orders, grid, placement)), key
+                row, _, _ = _run_task(*env, payload["task"], payload["ctx"])
+            if queue.complete(tid, worker_id, row):
+                done += 1
+        except Exception:
+            queue.fail(tid, worker_id, traceback.format_exc(limit=5))
+        idle_since = time.time()
+    return done
+
+
+def export_csv(queue: WorkQueue, out_csv: Path, prescreen: Optional[str] = None) -> Path:
+    """Filas terminadas, en el orden de publicación, con el formato de run_grid."""
+    out_csv = Path(out_csv)
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    with out_csv.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=_fieldnames(prescreen))
+        w.writeheader()
+        for row in queue.results():
+            w.writerow(row)
+    return out_csv
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import List, Iterable, Optional
+from typing import Callable, List, Iterable, Optional, Sequence, Tuple
+import numpy as np
 from src.demand.orders import Order
 
 @dataclass
@@ -7,6 +8,7 @@ class Batch:
     orders: List[Order]
     first_arrival_min: float
     last_arrival_min: float
+    release_min: Optional[float] = None   # cierre de ventana (si la política lo define)
 
 class SizeThresholdBatching:
     """Libera un batch cuando acumula N pedidos."""
@@ -74,3 +76,160 @@ class TimeThresholdBatching:
                 last_arrival_min=buf[-1].arrival_min
             ))
         return batches
+
+
+class ProximityBatching:
+    """
+    Batching por proximidad (ahorros estilo Clarke–Wright) dentro de ventanas de release.
+
+    Los pedidos se agrupan en ventanas como TimeThresholdBatching (primer arribo + window_min).
+    Dentro de cada ventana los ahorros salen de la matriz de pasos (dist_fn: celdas → (k, k),
+    p.ej. la submatriz slots+estaciones de grid.router): cada pedido se representa por su
+    slot medoide y s_ij = d(depósito, i) + d(depósito, j) − d(i, j), vectorizado.
+    Sin matriz (dist_fn None o devuelve None: grilla sin router) se cae a una estimación
+    por caja envolvente de ubicaciones ∪ depósito, L = 2·(ancho + alto), con
+    s_ij = L_i + L_j − L_{i∪j}; ignora obstáculos (dos lados de un rack "están cerca").
+    Se fusionan clusters en orden de ahorro decreciente mientras s_ij > 0 y el tamaño
+    resultante no supere `capacity` pedidos.
+    """
+
+    def __init__(self, window_min: float, capacity: int,
+                 coords_fn: Callable[[Order], Sequence[Tuple[int, int]]],
+                 depot: Tuple[int, int] = (0, 0),
+                 dist_fn: Optional[Callable[[Sequence[Tuple[int, int]]], Optional[np.ndarray]]] = None):
+        assert window_min > 0.0
+        assert capacity >= 1
+        self.window_min = window_min
+        self.capacity = capacity
+        self.coords_fn = coords_fn
+        self.depot = (int(depot[0]), int(depot[1]))
+        self.dist_fn = dist_fn
+
+    def _windows(self, orders: Iterable[Order]) -> List[Tuple[List[Order], float]]:
+        out: List[Tuple[List[Order], float]] = []
+        buf: List[Order] = []
+        first_time = 0.0
+        for o in orders:
+            if buf and o.arrival_min - first_time >= self.window_min:
+                out.append((buf, first_time + self.window_min))
+                buf = []
+            if not buf:
+                first_time = o.arrival_min
+            buf.append(o)
+        if buf:
+            out.append((buf, first_time + self.window_min))
+        return out
+
+    def _boxes(self, orders: List[Order]) -> np.ndarray:
+        """(n, 4) = xmin, xmax, ymin, ymax de ubicaciones ∪ depósito."""
+        dx, dy = self.depot
+        box = np.empty((len(orders), 4), dtype=np.int64)
+        for k, o in enumerate(orders):
+            pts = np.asarray(list(self.coords_fn(o)) or [self.depot], dtype=np.int64).reshape(-1, 2)
+            box[k] = (min(dx, pts[:, 0].min()), max(dx, pts[:, 0].max()),
+                      min(dy, pts[:, 1].min()), max(dy, pts[:, 1].max()))
+        return box
+
+    @staticmethod
+    def savings_matrix(box: np.ndarray) -> np.ndarray:
+        """s_ij = L_i + L_j − L_{i∪j} con L = 2·(Δx + Δy) de la caja (diagonal = −inf)."""
+        L = 2 * ((box[:, 1] - box[:, 0]) + (box[:, 3] - box[:, 2]))
+        x0 = np.minimum(box[:, None, 0], box[None, :, 0])
+        x1 = np.maximum(box[:, None, 1], box[None, :, 1])
+        y0 = np.minimum(box[:, None, 2], box[None, :, 2])
+        y1 = np.maximum(box[:, None, 3], box[None, :, 3])
+        s = (L[:, None] + L[None, :] - 2 * ((x1 - x0) + (y1 - y0))).astype(float)
+        np.fill_diagonal(s, -np.inf)
+        return s
+
+    @staticmethod
+    def savings_from_matrix(D: np.ndarray, reps: np.ndarray, depot: int = 0) -> np.ndarray:
+        """s_ij = d(depot, i) + d(depot, j) − d(i, j) sobre la matriz de pasos D (−1 → −inf)."""
+        D = np.asarray(D, dtype=np.int64)
+        d0 = D[depot, reps]
+        dij = D[np.ix_(reps, reps)]
+        s = (d0[:, None] + d0[None, :] - dij).astype(float)
+        bad = (d0[:, None] < 0) | (d0[None, :] < 0) | (dij < 0)
+        s[bad] = -np.inf
+        np.fill_diagonal(s, -np.inf)
+        return s
+
+    def _matrix_savings(self, orders: List[Order]) -> Optional[np.ndarray]:
+        """Ahorros con la matriz de dist_fn (slot medoide por pedido); None → sin matriz."""
+        if self.dist_fn is None:
+            return None
+        cells = [self.depot]
+        index = {self.depot: 0}
+        slots: List[List[int]] = []
+        for o in orders:
+            ids = []
+            for x, y in self.coords_fn(o):
+                c = (int(x), int(y))
+                if c not in index:
+                    index[c] = len(cells)
+                    cells.append(c)
+                ids.append(index[c])
+            slots.append(sorted(set(ids)) or [0])
+        D = self.dist_fn(cells)
+        if D is None:
+            return None
+        D = np.asarray(D, dtype=np.int64)
+        reps = np.empty(len(orders), dtype=np.int64)
+        for k, ids in enumerate(slots):
+            if len(ids) == 1:
+                reps[k] = ids[0]
+                continue
+            sub = D[np.ix_(ids, ids)]
+            cost = np.where(sub < 0, np.iinfo(np.int32).max, sub).sum(axis=1)
+            reps[k] = ids[int(np.argmin(cost))]      # medoide: menor suma de pasos al resto
+        return self.savings_from_matrix(D, reps)
+
+    def _cluster(self, orders: List[Order]) -> List[List[int]]:
+        n = len(orders)
+        if n <= 1 or self.capacity == 1:
+            return [[i] for i in range(n)]
+        s = self._matrix_savings(orders)
+        if s is None:
+            s = self.savings_matrix(self._boxes(orders))
+        iu, ju = np.triu_indices(n, k=1)
+        sv = s[iu, ju]
+        keep = sv > 0
+        iu, ju, sv = iu[keep], ju[keep], sv[keep]
+        # ahorro decreciente; empates por índice (orden de llegada) para ser determinista
+        order = np.lexsort((ju, iu, -sv))
+
+        parent = list(range(n))
+        size = [1] * n
+
+        def find(a: int) -> int:
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        for i, j in zip(iu[order].tolist(), ju[order].tolist()):
+            ri, rj = find(i), find(j)
+            if ri == rj or size[ri] + size[rj] > self.capacity:
+                continue
+            if rj < ri:
+                ri, rj = rj, ri
+            parent[rj] = ri
+            size[ri] += size[rj]
+
+        groups = {}
+        for i in range(n):
+            groups.setdefault(find(i), []).append(i)
+        return sorted(groups.values(), key=lambda g: g[0])
+
+    def make_batches(self, orders: Iterable[Order]) -> List[Batch]:
+        batches: List[Batch] = []
+        for window, close in self._windows(orders):
+            for g in self._cluster(window):
+                members = [window[i] for i in g]
+                batches.append(Batch(
+                    orders=members,
+                    first_arrival_min=members[0].arrival_min,
+                    last_arrival_min=members[-1].arrival_min,
+                    release_min=max(close, members[-1].arrival_min),
+                ))
+        return batches
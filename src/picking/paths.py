@@ -0,0 +1,147 @@
+# src/picking/paths.py
+"""
+Paths celda a celda que respetan obstáculos, para animación y congestión.
+
+Cada tramo (desde, hasta) se arma bajando por el campo BFS de `hasta` (estación o
+slot, del DistanceCache: mmapeado si hay disco): en cada paso se va al vecino con
+distancia − 1, prefiriendo avanzar en x hacia el destino y después en y. Sin
+obstáculos en el medio sale la misma L (x, luego y) que el camino Manhattan.
+Si la grilla tiene un router con path() (ALT, grafo de pasillos) se usa ése: no
+hace falta un campo por destino en pisos enormes.
+
+Los tramos se memorizan en un LRU acotado por (desde, hasta) como arrays int16
+(k, 2) de sólo lectura; un path de job es la concatenación de sus tramos.
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from src.warehouse.grid import WarehouseGrid, Coord
+
+HOP_CACHE_SIZE = 50_000      # tramos recordados por grilla
+FIELD_CACHE_SIZE = 64        # campos BFS vivos en memoria (el resto, en disco)
+
+
+def manhattan_path(a: Coord, b: Coord) -> np.ndarray:
+    """Camino Manhattan simple (recto en x, luego en y), ignora obstáculos."""
+    x0, y0 = int(a[0]), int(a[1])
+    x1, y1 = int(b[0]), int(b[1])
+    nx, ny = abs(x1 - x0), abs(y1 - y0)
+    out = np.empty((nx + ny + 1, 2), dtype=np.int16)
+    sx = 1 if x1 >= x0 else -1
+    sy = 1 if y1 >= y0 else -1
+    out[:nx + 1, 0] = np.arange(x0, x1 + sx, sx) if nx else x0
+    out[:nx + 1, 1] = y0
+    out[nx:, 0] = x1
+    out[nx:, 1] = np.arange(y0, y1 + sy, sy) if ny else y0
+    return out
+
+
+class HopPathCache:
+    """LRU (desde, hasta) → path int16 (k, 2) que incluye ambos extremos."""
+
+    def __init__(self, grid: WarehouseGrid, max_items: int = HOP_CACHE_SIZE, dist_cache=None):
+        self.grid = grid
+        self.max_items = int(max_items)
+        self._dist_cache = dist_cache
+        self._hops: "OrderedDict[Tuple[Coord, Coord], np.ndarray]" = OrderedDict()
+        self._fields: "OrderedDict[Coord, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._hops)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(p.nbytes for p in self._hops.values())
+
+    def get(self, a: Coord, b: Coord) -> np.ndarray:
+        key = ((int(a[0]), int(a[1])), (int(b[0]), int(b[1])))
+        p = self._hops.get(key)
+        if p is not None:
+            self._hops.move_to_end(key)
+            self.hits += 1
+            return p
+        self.misses += 1
+        p = self._build(*key)
+        p.setflags(write=False)
+        self._hops[key] = p
+        if len(self._hops) > self.max_items:
+            self._hops.popitem(last=False)
+        return p
+
+    # --------------------------- internos ---------------------------
+    def _field(self, b: Coord) -> np.ndarray:
+        f = self._fields.get(b)
+        if f is None:
+            if self._dist_cache is None:
+                from src.warehouse.dist_cache import default_cache
+                self._dist_cache = default_cache()
+            f = self._fields[b] = self._dist_cache.field(self.grid, b)
+            if len(self._fields) > FIELD_CACHE_SIZE:
+                self._fields.popitem(last=False)
+        else:
+            self._fields.move_to_end(b)
+        return f
+
+    def _build(self, a: Coord, b: Coord) -> np.ndarray:
+        if a == b:
+            return np.array([a], dtype=np.int16)
+        grid = self.grid
+        if not (grid.in_bounds(a) and grid.in_bounds(b)):
+            return manhattan_path(a, b)
+        router_path = getattr(getattr(grid, "router", None), "path", None)
+        if router_path is not None:
+            cells = router_path(a, b)
+            return np.asarray(cells, dtype=np.int16).reshape(-1, 2) if cells else manhattan_path(a, b)
+        f = self._field(b)
+        d = int(f[a[1], a[0]])
+        if d < 0:
+            return manhattan_path(a, b)          # inalcanzable: se dibuja recto
+        W, H = grid.width, grid.height
+        out = np.empty((d + 1, 2), dtype=np.int16)
+        x, y = a
+        out[0] = a
+        bx, by = b
+        for k in range(1, d + 1):
+            want = d - k
+            sx = 1 if bx > x else -1
+            sy = 1 if by > y else -1
+            for nx, ny in ((x + sx, y) if bx != x else (-1, -1),
+                           (x, y + sy) if by != y else (-1, -1),
+                           (x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= nx < W and 0 <= ny < H and f[ny, nx] == want:
+                    x, y = nx, ny
+                    break
+            out[k] = (x, y)
+        return out
+
+
+def hop_cache(grid: WarehouseGrid) -> HopPathCache:
+    """Cache de tramos de la grilla (se rehace si cambian obstáculos o estaciones)."""
+    key = (id(grid._obstacles_array()), tuple(grid.stations_xy), id(getattr(grid, "router", None)))
+    cached = grid.__dict__.get("_hop_cache")
+    if cached is None or cached[0] != key:
+        cached = (key, HopPathCache(grid))
+        grid.__dict__["_hop_cache"] = cached
+    return cached[1]
+
+
+def hop_path(grid: WarehouseGrid, a: Coord, b: Coord) -> np.ndarray:
+    return hop_cache(grid).get(a, b)
+
+
+def stitch(grid: WarehouseGrid, start: Coord, stops: Sequence[Coord], end: Optional[Coord] = None) -> np.ndarray:
+    """Concatena los tramos start → stops… → end (cada tramo con sus dos extremos)."""
+    cache = hop_cache(grid)
+    hops: List[np.ndarray] = []
+    cur = start
+    for c in stops:
+        hops.append(cache.get(cur, c))
+        cur = c
+    if end is not None:
+        hops.append(cache.get(cur, end))
+    if not hops:
+        return np.array([start], dtype=np.int16)
+    return np.concatenate(hops)
@@ -1,9 +1,11 @@
 from dataclasses import dataclass
 from typing import List, Iterable, Tuple, Set
+import numpy as np
 from src.warehouse.grid import WarehouseGrid, Coord
-from src.warehouse.routing import multi_stop_tour_steps
+from src.warehouse.routing import multi_stop_tour_steps, shortest_path_steps, nearest_station
 from src.warehouse.sku_map import SKUPlacement
 from src.demand.orders import Order
+from src.picking.paths import stitch
 
 @dataclass
 class TourResult:
@@ -40,8 +42,11 @@ def _sku_list(order: Order) -> List[str]:
 def _station(grid: WarehouseGrid) -> Tuple[int, int]:
     """
     Devuelve coordenada de estación de empaque de forma robusta.
-    Prioriza: grid.spec.packing_station → grid.packing_xy → (0,0)
+    Prioriza: grid.station_xy (spec dict) → grid.spec.packing_station → grid.packing_xy → (0,0)
     """
+    # 0) WarehouseGrid con spec dict
+    if hasattr(grid, "station_xy"):
+        return tuple(grid.station_xy)
     # 1) layout en spec
     if hasattr(grid, "spec") and hasattr(grid.spec, "packing_station"):
         ps = grid.spec.packing_station
@@ -54,19 +59,47 @@ def _station(grid: WarehouseGrid) -> Tuple[int, int]:
     # 3) fallback
     return (0, 0)
 
+def _stations(grid: WarehouseGrid) -> List[Coord]:
+    return list(grid.stations_xy) if hasattr(grid, "stations_xy") else [_station(grid)]
+
+def _start_station(grid: WarehouseGrid, stops: List[Coord]) -> Coord:
+    """Estación de salida: la más cercana (Manhattan) al centroide de las paradas."""
+    stations = _stations(grid)
+    if len(stations) == 1 or not stops:
+        return stations[0]
+    cx = sum(c[0] for c in stops) / len(stops)
+    cy = sum(c[1] for c in stops) / len(stops)
+    return min(stations, key=lambda s: abs(s[0] - cx) + abs(s[1] - cy))
+
+def _drop_off(grid: WarehouseGrid, xy: Coord) -> Tuple[Coord, int]:
+    """Estación de entrega más cercana (en pasos) al último punto visitado."""
+    if not hasattr(grid, "stations_xy"):
+        st = _station(grid)
+        return st, shortest_path_steps(grid, xy, st)
+    return nearest_station(grid, xy)
+
+def _drop_station(grid: WarehouseGrid, xy: Coord) -> Coord:
+    """Como _drop_off pero sólo la coordenada (sin BFS si hay una única estación)."""
+    stations = _stations(grid)
+    return stations[0] if len(stations) == 1 else nearest_station(grid, xy)[0]
+
 # -------------------- Conversión pedido → coords únicas --------------------
 
 def _coords_for_order(placement: SKUPlacement, order: Order) -> List[Coord]:
-    """Convierte ítems del pedido a coordenadas (se cuentan ubicaciones únicas para ruteo)."""
+    """
+    Convierte ítems del pedido a coordenadas (se cuentan ubicaciones únicas para ruteo).
+    Orden determinístico (SKUs ordenados): el NN desempata por orden de la lista y no
+    debe depender de PYTHONHASHSEED.
+    """
     unique_skus: Set[str] = set(_sku_list(order))
-    return [placement.coord_of(sku) for sku in unique_skus]
+    return [placement.coord_of(sku) for sku in sorted(unique_skus)]
 
 # -------------------- Tours (métricas) --------------------
 
 def order_tour(grid: WarehouseGrid, placement: SKUPlacement, order: Order, return_to_station: bool=False) -> TourResult:
     """Ruta NN desde estación de empaque por todas las ubicaciones del pedido (únicas)."""
-    start = _station(grid)  # antes: grid.spec.packing_station
     stops = _coords_for_order(placement, order)
+    start = _start_station(grid, stops)
     steps = 0
     if stops:
         steps = multi_stop_tour_steps(grid, start, stops)
@@ -85,9 +118,8 @@ def order_tour(grid: WarehouseGrid, placement: SKUPlacement, order: Order, retur
                     if best_steps is None or d < best_steps:
                         best_steps, best_idx = d, i
                 current = remaining.pop(best_idx)
-            # sumar regreso
-            from src.warehouse.routing import shortest_path_steps
-            back = shortest_path_steps(grid, current, start)
+            # sumar regreso a la estación de entrega más cercana
+            _, back = _drop_off(grid, current)
             steps += back
     return TourResult(steps=steps, meters=grid.meters(steps))
 
@@ -95,12 +127,12 @@ def batch_tour(grid: WarehouseGrid, placement: SKUPlacement, orders: List[Order]
     """Ruta NN por el conjunto de ubicaciones (únicas) de todos los pedidos del batch."""
     if not orders:
         return TourResult(steps=0, meters=0.0)
-    start = _station(grid)  # antes: grid.spec.packing_station
     # conjunto de ubicaciones únicas del batch
     seen: Set[Coord] = set()
     for o in orders:
         seen.update(_coords_for_order(placement, o))
-    stops = list(seen)
+    stops = sorted(seen)          # determinístico (ver _coords_for_order)
+    start = _start_station(grid, stops)
     steps = 0
     if stops:
         steps = multi_stop_tour_steps(grid, start, stops)
@@ -117,42 +149,19 @@ def batch_tour(grid: WarehouseGrid, placement: SKUPlacement, orders: List[Order]
                     if best_steps is None or d < best_steps:
                         best_steps, best_idx = d, i
                 current = remaining.pop(best_idx)
-            from src.warehouse.routing import shortest_path_steps
-            back = shortest_path_steps(grid, current, start)
+            _, back = _drop_off(grid, current)
             steps += back
     return TourResult(steps=steps, meters=grid.meters(steps))
 
-# -------------------- Paths Manhattan para visualización --------------------
-
-def _manhattan_path(a: Tuple[int,int], b: Tuple[int,int]) -> List[Tuple[int,int]]:
-    """Camino Manhattan simple (recto en x, luego en y). 1 celda = 1 m."""
-    x0, y0 = a
-    x1, y1 = b
-    path: List[Tuple[int,int]] = [(x0, y0)]
-    # mover en x
-    if x1 != x0:
-        dx = 1 if x1 > x0 else -1
-        for x in range(x0 + dx, x1 + dx, dx):
-            path.append((x, y0))
-            if x == x1:
-                break
-    # mover en y
-    if y1 != y0:
-        dy = 1 if y1 > y0 else -1
-        for y in range(y0 + dy, y1 + dy, dy):
-            path.append((x1, y))
-            if y == y1:
-                break
-    # garantizar final exacto
-    if not path or path[-1] != (x1, y1):
-        path.append((x1, y1))
-    return path
-
-def _nn_visit_sequence(grid: WarehouseGrid, placement: SKUPlacement, coords: List[Tuple[int,int]]) -> List[Tuple[int,int]]:
+# -------------------- Paths celda a celda para visualización --------------------
+# Los tramos respetan obstáculos y se cachean por (desde, hasta): ver src.picking.paths.
+
+def _nn_visit_sequence(grid: WarehouseGrid, placement: SKUPlacement, coords: List[Tuple[int,int]],
+                       start: Tuple[int,int] = None) -> List[Tuple[int,int]]:
     """Secuencia por vecino más cercano (aprox para dibujar)."""
     seq: List[Tuple[int,int]] = []
-    cur = _station(grid)
-    remaining = set(coords)
+    cur = start if start is not None else _station(grid)
+    remaining = sorted(set(coords))   # empates por orden de coords, no de hash
     while remaining:
         nxt = min(remaining, key=lambda c: abs(c[0]-cur[0]) + abs(c[1]-cur[1]))
         seq.append(nxt)
@@ -160,37 +169,25 @@ def _nn_visit_sequence(grid: WarehouseGrid, placement: SKUPlacement, coords: Lis
         remaining.remove(nxt)
     return seq
 
-def order_tour_path(grid: WarehouseGrid, placement: SKUPlacement, order: Order, return_to_station: bool = True) -> List[Tuple[int,int]]:
-    """Path Manhattan para visualizar el tour de un pedido."""
-    station = _station(grid)
+def order_tour_path(grid: WarehouseGrid, placement: SKUPlacement, order: Order, return_to_station: bool = True) -> np.ndarray:
+    """Path (k, 2) int16 para visualizar el tour de un pedido."""
     coords = [placement.coord_of(sku) for sku in _sku_list(order)]
+    station = _start_station(grid, coords)
     if not coords:
-        return [station]
-    visit_seq = _nn_visit_sequence(grid, placement, coords)
-    path: List[Tuple[int,int]] = []
-    cur = station
-    for c in visit_seq:
-        path += _manhattan_path(cur, c)
-        cur = c
-    if return_to_station:
-        path += _manhattan_path(cur, station)
-    return path or [station]
-
-def batch_tour_path(grid: WarehouseGrid, placement: SKUPlacement, orders: List[Order], return_to_station: bool = True) -> List[Tuple[int,int]]:
-    """Path Manhattan para visualizar un batch (concatena SKUs de todos)."""
-    station = _station(grid)
+        return stitch(grid, station, [])
+    visit_seq = _nn_visit_sequence(grid, placement, coords, start=station)
+    end = _drop_station(grid, visit_seq[-1]) if return_to_station else None
+    return stitch(grid, station, visit_seq, end)
+
+def batch_tour_path(grid: WarehouseGrid, placement: SKUPlacement, orders: List[Order], return_to_station: bool = True) -> np.ndarray:
+    """Path (k, 2) int16 para visualizar un batch (concatena SKUs de todos)."""
     all_coords: List[Tuple[int,int]] = []
     for o in orders:
         for sku in _sku_list(o):
             all_coords.append(placement.coord_of(sku))
+    station = _start_station(grid, all_coords)
     if not all_coords:
-        return [station]
-    visit_seq = _nn_visit_sequence(grid, placement, all_coords)
-    path: List[Tuple[int,int]] = []
-    cur = station
-    for c in visit_seq:
-        path += _manhattan_path(cur, c)
-        cur = c
-    if return_to_station:
-        path += _manhattan_path(cur, station)
-    return path or [station]
+        return stitch(grid, station, [])
+    visit_seq = _nn_visit_sequence(grid, placement, all_coords, start=station)
+    end = _drop_station(grid, visit_seq[-1]) if return_to_station else None
+    return stitch(grid, station, visit_seq, end)
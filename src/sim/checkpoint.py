@@ -0,0 +1,217 @@
+# src/sim/checkpoint.py
+"""
+Checkpoints y forks del Simulator para análisis what-if a mitad de corrida.
+
+take_checkpoint(sim) copia el estado mutable (heap de eventos, cola de espera,
+pickers, acumuladores, series, traza y reservas de pasillo) y comparte lo que es
+de sólo lectura (grilla, placement, pedidos, jobs, paths). El motor no usa RNG:
+la demanda viene pre-muestreada, así que el estado copiado es todo el estado.
+
+fork(ckpt, **overrides) arma un Simulator nuevo desde el checkpoint con la
+SimConfig modificada; el prefijo [0, t] no se vuelve a simular. Soporta:
+  - n_pickers: los nuevos arrancan libres en la estación; al reducir, los últimos
+    terminan su tour en curso y no toman más trabajo.
+  - speed_m_per_min: re-escala los jobs que aún no arrancaron (meters / speed).
+  - policy / batch_size / time_threshold_min: re-arma lotes con los pedidos pendientes.
+  - queue_discipline, picker_zones, congestion, horizon_min, trace.
+Sin overrides, fork(ckpt).run() da exactamente el mismo resultado que la corrida original.
+"""
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.sim.engine import Simulator, SimConfig, SimResult, PickerState, build_jobs
+from src.sim.events import Event, Job
+from src.sim.congestion import AisleOccupancy
+from src.sim.heatmap import FloorHeatmap
+from src.sim.histogram import WaitHistogram
+from src.sim.policies import assign_job_zones
+from src.sim.profiling import SimProfiler
+from src.sim.queues import ZoneQueues, waiting_factory
+
+# atributos de sólo lectura (se comparten entre checkpoint y forks)
+_SHARED = ("grid", "placement", "orders", "jobs", "_path_cache")
+# escalares
+_SCALARS = ("now", "orders_completed", "distance_total_m", "events_processed", "_done")
+# listas planas de valores inmutables (floats, ints, tuplas)
+_FLAT = ("order_waits", "order_lateness", "picker_tours", "ts_queue", "ts_completed",
+         "batches_sizes", "batches_release", "batches_fill",
+         "_picker_xy", "_picker_job", "_picker_state", "trace_frames")
+# listas de listas (por picker)
+_NESTED = ("gantt", "_tracks")
+
+_PLAN_FIELDS = ("policy", "batch_size", "time_threshold_min")
+
+
+@dataclass
+class SimCheckpoint:
+    t: float
+    cfg: SimConfig
+    state: Dict[str, Any]
+
+    def restore(self) -> Simulator:
+        """Simulator independiente en el estado del checkpoint (se puede restaurar varias veces)."""
+        sim = Simulator.__new__(Simulator)
+        sim.__dict__.update(_copy_state(self.state))
+        sim.cfg = self.cfg
+        sim._prof = None
+        sim._result = None
+        return sim
+
+
+def _copy_state(st: Dict[str, Any]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {k: st[k] for k in _SHARED + _SCALARS}
+    for k in _FLAT:
+        out[k] = list(st[k])
+    for k in _NESTED:
+        out[k] = [list(x) for x in st[k]]
+    out["evq"] = st["evq"].copy()
+    out["waiting"] = st["waiting"].copy()
+    out["pickers"] = [replace(p) for p in st["pickers"]]
+    out["occupancy"] = st["occupancy"].copy() if st["occupancy"] is not None else None
+    out["heatmap"] = st["heatmap"].copy() if st.get("heatmap") is not None else None
+    out["analytics"] = {
+        k: ({pid: list(v2) for pid, v2 in v.items()} if isinstance(v, dict)
+            else v.copy() if isinstance(v, WaitHistogram) else list(v))
+        for k, v in st["analytics"].items()
+    }
+    return out
+
+
+def take_checkpoint(sim: Simulator) -> SimCheckpoint:
+    """Copia el estado del simulador (antes de finalize). Costo O(estado), sin re-simular."""
+    if sim._result is not None:
+        raise ValueError("No se puede checkpointear un Simulator ya finalizado")
+    state = {k: getattr(sim, k) for k in _SHARED + _SCALARS + _FLAT + _NESTED}
+    state.update(evq=sim.evq, waiting=sim.waiting, pickers=sim.pickers,
+                 occupancy=sim.occupancy, heatmap=sim.heatmap, analytics=sim.analytics)
+    return SimCheckpoint(t=sim.now, cfg=sim.cfg, state=_copy_state(state))
+
+
+def checkpoints_every(sim: Simulator, every_min: float = 60.0) -> Iterator[SimCheckpoint]:
+    """Avanza sim y entrega un checkpoint en cada múltiplo de every_min (p.ej. cada hora)."""
+    t = every_min * (sim.now // every_min)
+    while not sim.done:
+        t += every_min
+        sim.run_until(t)
+        if not sim.done:
+            yield take_checkpoint(sim)
+
+
+# ------------------------------ fork ------------------------------
+
+def _drain(queue) -> List[Job]:
+    out: List[Job] = []
+    if isinstance(queue, ZoneQueues):
+        for q in queue._q.values():
+            while q:
+                out.append(q.popleft())
+        out.sort(key=lambda j: j.arrival_min)
+    else:
+        while queue:
+            out.append(queue.popleft())
+    return out
+
+
+def _resize_pickers(sim: Simulator, n: int) -> None:
+    spec = sim.grid.spec
+    stx, sty = int(spec["station"]["x"]), int(spec["station"]["y"])
+    for _ in range(len(sim.pickers), n):
+        sim.pickers.append(PickerState(busy_until=sim.now))
+        sim.picker_tours.append(0)
+        sim.gantt.append([])
+        sim._picker_xy.append((stx, sty))
+        sim._picker_job.append(None)
+        sim._picker_state.append("idle")
+        sim._tracks.append([(sim.now, stx, sty, "idle", None)])
+    # al reducir no se borra nada: los pickers >= n quedan fuera del despacho
+
+
+def fork(ckpt: SimCheckpoint, **overrides) -> Simulator:
+    """Simulator desde el checkpoint con SimConfig = replace(ckpt.cfg, **overrides)."""
+    cfg = replace(ckpt.cfg, **overrides)
+    sim = ckpt.restore()
+    old = ckpt.cfg
+    sim.cfg = cfg
+
+    if cfg.picker_zones is not None:
+        if len(cfg.picker_zones) != cfg.n_pickers:
+            raise ValueError("picker_zones debe tener una zona (o None) por picker")
+        unknown = {z for z in cfg.picker_zones if z is not None} - set(sim.grid.zones)
+        if unknown:
+            raise ValueError(f"Zonas no definidas en la grilla: {sorted(unknown)}")
+
+    if cfg.profile or cfg.profile_cprofile or cfg.profile_tracemalloc:
+        sim._prof = SimProfiler(cprofile=cfg.profile_cprofile, tracemalloc=cfg.profile_tracemalloc)
+        sim._prof.start()
+
+    if cfg.n_pickers > len(sim.pickers):
+        _resize_pickers(sim, cfg.n_pickers)
+
+    if cfg.congestion == "aisle" and sim.occupancy is None:
+        sim.occupancy = AisleOccupancy()   # los tours en curso no quedan reservados
+    elif cfg.congestion != "aisle":
+        sim.occupancy = None
+    if cfg.heatmap and sim.heatmap is None:
+        sim.heatmap = FloorHeatmap(sim.grid.width, sim.grid.height)   # acumula desde el fork
+    elif not cfg.heatmap:
+        sim.heatmap = None
+
+    replan = any(getattr(cfg, f) != getattr(old, f) for f in _PLAN_FIELDS)
+    respeed = cfg.speed_m_per_min != old.speed_m_per_min
+    requeue = (replan or respeed or cfg.queue_discipline != old.queue_discipline
+               or cfg.picker_zones != old.picker_zones)
+
+    if requeue:
+        waiting = _drain(sim.waiting)
+        arrivals: List[Job] = []
+        rezone = cfg.picker_zones is not None
+        if replan or respeed or rezone:
+            # jobs que todavía no llegaron: se sacan del heap (los PICKER_FREE quedan)
+            keep = []
+            for item in sim.evq._h:
+                if item[2].etype == "ARRIVAL":
+                    arrivals.append(item[2].payload)
+                else:
+                    keep.append(item)
+            sim.evq._h = keep
+            sim.evq._h.sort()
+        pending = waiting + arrivals
+
+        if replan:
+            orders = sorted((o for j in pending for o in (j.orders or [])), key=lambda o: o.arrival_min)
+            offset = 1 + max((j.job_id for j in sim.jobs), default=-1)
+            new_jobs = [replace(j, job_id=j.job_id + offset)
+                        for j in build_jobs(orders, sim.grid, sim.placement, cfg)]
+            pending_ids = {j.job_id for j in pending}
+            sim.jobs = [j for j in sim.jobs if j.job_id not in pending_ids] + new_jobs
+            sim._path_cache = {}   # el cache de paths era del plan anterior
+            waiting = [j for j in new_jobs if j.arrival_min <= sim.now]
+            arrivals = [j for j in new_jobs if j.arrival_min > sim.now]
+        elif respeed:
+            speed = max(cfg.speed_m_per_min, 1e-9)
+            waiting = [replace(j, service_min=j.meters / speed) for j in waiting]
+            arrivals = [replace(j, service_min=j.meters / speed) for j in arrivals]
+
+        if rezone:
+            # copias con zona: los jobs pueden ser compartidos (JobCache / otros forks)
+            waiting = assign_job_zones(waiting, sim.grid, sim.placement)
+            arrivals = assign_job_zones(arrivals, sim.grid, sim.placement)
+        make_queue = waiting_factory(cfg.queue_discipline)
+        sim.waiting = ZoneQueues(cfg.picker_zones, factory=make_queue) if cfg.picker_zones is not None else make_queue()
+        for job in waiting:
+            sim.waiting.append(job)
+        if replan or respeed or rezone:
+            for job in sorted(arrivals, key=lambda j: j.arrival_min):
+                sim.evq.push(Event(time=job.arrival_min, etype="ARRIVAL", payload=job))
+
+    # un horizonte más largo reabre una corrida que había cortado
+    if sim._done and not sim.evq.empty() and (cfg.horizon_min is None or sim.evq.peek_time() <= cfg.horizon_min):
+        sim._done = False
+    if not sim._done and (requeue or cfg.n_pickers != old.n_pickers):
+        sim._assign_if_possible()
+    return sim
+
+
+def what_if(ckpt: SimCheckpoint, variants: Dict[str, Dict[str, Any]]) -> Dict[str, SimResult]:
+    """Corre cada variante (nombre → overrides de SimConfig) desde el mismo checkpoint."""
+    return {name: fork(ckpt, **ov).run() for name, ov in variants.items()}
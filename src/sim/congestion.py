@@ -0,0 +1,171 @@
+# src/sim/congestion.py
+from dataclasses import dataclass
+from bisect import bisect_left, insort
+from heapq import heappop, heappush
+from typing import Dict, List, Sequence, Tuple
+
+# Pasillo = recta de la grilla: ("h", y) fila y recorrida en x | ("v", x) columna x recorrida en y
+AisleKey = Tuple[str, int]
+# Tramo recto de un path: (pasillo, celda_lo, celda_hi, paso_inicial, paso_final)
+Segment = Tuple[AisleKey, int, int, int, int]
+
+
+def path_segments(path: Sequence[Sequence[int]]) -> List[Segment]:
+    """
+    Parte un path celda a celda en tramos rectos sobre un mismo pasillo.
+    El rango [lo, hi] cubre las celdas que el picker ENTRA durante el tramo
+    (excluye la celda de partida, que ya ocupaba).
+    """
+    if hasattr(path, "tolist"):
+        path = path.tolist()          # arrays int16 de route_job: indexar listas es mucho más barato
+    segs: List[Segment] = []
+    n = len(path)
+    if n < 2:
+        return segs
+    i0 = 0
+    key0 = None
+    for i in range(n - 1):
+        x0, y0 = int(path[i][0]), int(path[i][1])
+        x1, y1 = int(path[i + 1][0]), int(path[i + 1][1])
+        if (x0, y0) == (x1, y1):
+            key = key0  # paso nulo: se absorbe en el tramo actual
+        else:
+            key = ("h", y0) if y0 == y1 else ("v", x0)
+        if key0 is not None and key != key0:
+            segs.append(_make_segment(path, key0, i0, i))
+            i0 = i
+        key0 = key
+    if key0 is not None:
+        segs.append(_make_segment(path, key0, i0, n - 1))
+    return segs
+
+
+def _make_segment(path, key: AisleKey, i0: int, i1: int) -> Segment:
+    axis = 0 if key[0] == "h" else 1
+    start = int(path[i0][axis])
+    end = int(path[i1][axis])
+    step = 1 if end >= start else -1
+    first = start + step if end != start else start
+    lo, hi = (first, end) if step > 0 else (end, first)
+    return (key, lo, hi, i0, i1)
+
+
+@dataclass
+class Reservation:
+    t0: float
+    t1: float
+    lo: int
+    hi: int
+    pid: int
+
+
+class AisleOccupancy:
+    """
+    Modelo espacial de congestión: índice de intervalos (t0, t1, celdas) por pasillo.
+
+    Cuando un picker entra a un tramo de pasillo ocupado por otro picker en el mismo
+    rango de celdas, espera a que el ocupante lo libere. No hay sondeo por dt:
+    cada job reserva sus tramos una sola vez al asignarse y las consultas sólo
+    revisan los intervalos vivos del pasillo (los vencidos se podan al consultar).
+    Cada pasillo guarda además un min-heap de vencimientos (t1): saber si hay algo
+    que podar es O(1) y la lista sólo se filtra cuando de verdad venció algo.
+    """
+
+    def __init__(self, max_retries: int = 8):
+        self.max_retries = max_retries
+        self._idx: Dict[AisleKey, List[Tuple[float, int, Reservation]]] = {}
+        self._exp: Dict[AisleKey, List[float]] = {}     # min-heap de t1 por pasillo
+        self._seq = 0
+        self.blocks: int = 0
+        self.block_min: float = 0.0
+
+    def copy(self) -> "AisleOccupancy":
+        """Copia independiente del índice (las Reservation no se modifican: se comparten)."""
+        occ = AisleOccupancy(self.max_retries)
+        occ._idx = {k: list(v) for k, v in self._idx.items()}
+        occ._exp = {k: list(v) for k, v in self._exp.items()}
+        occ._seq = self._seq
+        occ.blocks = self.blocks
+        occ.block_min = self.block_min
+        return occ
+
+    def _live(self, key: AisleKey, now: float) -> List[Tuple[float, int, Reservation]]:
+        lst = self._idx.get(key)
+        if lst is None:
+            lst = []
+            self._idx[key] = lst
+            self._exp[key] = []
+            return lst
+        exp = self._exp[key]
+        if exp and exp[0] <= now:
+            while exp and exp[0] <= now:
+                heappop(exp)
+            lst[:] = [item for item in lst if item[2].t1 > now]
+        return lst
+
+    def _clear_time(self, lst, pid: int, t_in: float, t_out: float, lo: int, hi: int) -> float:
+        """Máximo t1 de los intervalos de otros pickers que chocan con [t_in, t_out) × [lo, hi]."""
+        clear = t_in
+        # sólo interesan los que empiezan antes de t_out
+        end = bisect_left(lst, (t_out, -1))
+        for k in range(end):
+            r = lst[k][2]
+            if r.pid == pid or r.t1 <= t_in:
+                continue
+            if r.hi < lo or r.lo > hi:
+                continue
+            if r.t1 > clear:
+                clear = r.t1
+        return clear
+
+    def _last_exit(self, lst, pid: int, t_in: float, lo: int, hi: int) -> float:
+        """Máximo t1 de los intervalos de otros pickers sobre [lo, hi] que siguen vivos en t_in."""
+        clear = t_in
+        for _, _, r in lst:
+            if r.pid != pid and r.t1 > clear and not (r.hi < lo or r.lo > hi):
+                clear = r.t1
+        return clear
+
+    def reserve(self, pid: int, path: Sequence[Sequence[int]], start_t: float, service_min: float) -> float:
+        """
+        Reserva los tramos del path a partir de start_t repartiendo service_min
+        uniformemente por paso. Devuelve el retraso total (min) por bloqueos.
+        """
+        segs = path_segments(path)
+        n_steps = len(path) - 1
+        if not segs or n_steps <= 0:
+            return 0.0
+        step_min = service_min / n_steps
+        delay = 0.0
+        for (key, lo, hi, i0, i1) in segs:
+            t_in = start_t + i0 * step_min + delay
+            t_out = t_in + (i1 - i0) * step_min
+            lst = self._live(key, start_t)
+
+            blocked = 0.0
+            for _ in range(self.max_retries):
+                clear = self._clear_time(lst, pid, t_in, t_out, lo, hi)
+                if clear <= t_in:
+                    break
+                wait = clear - t_in
+                blocked += wait
+                t_in += wait
+                t_out += wait
+            else:
+                # se agotaron los reintentos (cola larga de reservas pegadas): saltar al
+                # último t1 de las que pisan esas celdas; después de eso no queda ninguna
+                clear = self._last_exit(lst, pid, t_in, lo, hi)
+                if clear > t_in:
+                    wait = clear - t_in
+                    blocked += wait
+                    t_in += wait
+                    t_out += wait
+            if blocked > 0.0:
+                self.blocks += 1
+                self.block_min += blocked
+                delay += blocked
+
+            self._seq += 1
+            insort(lst, (t_in, self._seq, Reservation(t_in, t_out, lo, hi, pid)))
+            heappush(self._exp[key], t_out)
+        return delay
@@ -1,19 +1,67 @@
 # src/sim/engine.py
 from dataclasses import dataclass
-from typing import List, Literal, Optional, Deque, Tuple
-from collections import deque
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
+import math
 import numpy as np
 
 from src.sim.events import Event, EventQueue, Job
+from src.sim.congestion import AisleOccupancy
 from src.sim.policies import (
-    build_jobs_sequential, build_jobs_batch_size, build_jobs_batch_time
+    build_jobs_sequential, build_jobs_batch_size, build_jobs_batch_time, build_jobs_batch_proximity,
+    assign_job_zones
 )
+from src.sim.queues import ZoneQueues, waiting_factory
+from src.sim.profiling import SimProfiler, NULL_PHASE
+from src.sim.heatmap import FloorHeatmap
+from src.sim.histogram import WaitHistogram
 from src.warehouse.grid import WarehouseGrid
 from src.warehouse.sku_map import SKUPlacement
 from src.demand.orders import Order
 from src.picking.tours import order_tour_path, batch_tour_path
 
-CongestionMode = Literal["off", "light"]
+CongestionMode = Literal["off", "light", "aisle"]
+
+
+# --------------------------- Jobs y paths ---------------------------
+
+def build_jobs(orders: List[Order], grid: WarehouseGrid, placement: SKUPlacement, cfg: "SimConfig") -> List[Job]:
+    """Construye los jobs de la política de cfg (orders ya ordenadas por llegada)."""
+    if cfg.policy == "Secuencial_FCFS":
+        return build_jobs_sequential(orders, grid, placement, cfg.speed_m_per_min)
+    if cfg.policy == "Batching_Size":
+        return build_jobs_batch_size(orders, grid, placement, cfg.speed_m_per_min, cfg.batch_size)
+    if cfg.policy == "Batching_Time":
+        return build_jobs_batch_time(orders, grid, placement, cfg.speed_m_per_min, cfg.time_threshold_min)
+    if cfg.policy == "Batching_Proximity":
+        # ventana = time_threshold_min, capacidad = batch_size
+        return build_jobs_batch_proximity(orders, grid, placement, cfg.speed_m_per_min,
+                                          cfg.time_threshold_min, cfg.batch_size)
+    raise ValueError(f"Política no soportada: {cfg.policy}")
+
+def route_job(grid: WarehouseGrid, placement: SKUPlacement, job: Job) -> np.ndarray:
+    """Path celda a celda (k, 2) int16 del job (el que anima la UI y mide distance_total_m)."""
+    orders = getattr(job, "orders", None)
+    if not orders:
+        return np.empty((0, 2), dtype=np.int16)
+    if job.n_orders == 1:
+        return order_tour_path(grid, placement, orders[0], return_to_station=True)
+    return batch_tour_path(grid, placement, orders, return_to_station=True)
+
+
+def due_kpis(lateness: List[float]) -> Dict[str, float]:
+    """KPIs de cumplimiento sobre lateness = fin − due de cada pedido completado con due."""
+    if not lateness:
+        return {"orders_with_due": 0, "lateness_avg_min": 0.0, "tardiness_avg_min": 0.0,
+                "tardiness_max_min": 0.0, "tardy_pct": 0.0}
+    lat = np.asarray(lateness, dtype=float)
+    tard = np.maximum(lat, 0.0)
+    return {
+        "orders_with_due": int(lat.size),
+        "lateness_avg_min": float(lat.mean()),
+        "tardiness_avg_min": float(tard.mean()),
+        "tardiness_max_min": float(tard.max()),
+        "tardy_pct": float(100.0 * np.mean(lat > 0.0)),
+    }
 
 
 # --------------------------- Estados y resultados ---------------------------
@@ -27,7 +75,7 @@ class PickerState:
 
 @dataclass
 class SimConfig:
-    policy: str                      # "Secuencial_FCFS" | "Batching_Size" | "Batching_Time"
+    policy: str                      # "Secuencial_FCFS" | "Batching_Size" | "Batching_Time" | "Batching_Proximity"
     n_pickers: int
     speed_m_per_min: float
     congestion: CongestionMode = "off"
@@ -35,6 +83,13 @@ class SimConfig:
     time_threshold_min: float = 2.0
     horizon_min: Optional[float] = None  # si None, corre hasta acabar jobs
     round_dt: float = 0.25               # dt SOLO para traza visual
+    trace: bool = True                   # False → sólo KPIs (sin keyframes ni timeline)
+    picker_zones: Optional[List[Optional[str]]] = None  # zona por picker (None = flotante)
+    profile: bool = False                # cronómetros por fase, contadores y marcas de agua
+    profile_cprofile: bool = False       # + cProfile (implica profile)
+    profile_tracemalloc: bool = False    # + pico de memoria con tracemalloc (implica profile)
+    queue_discipline: str = "FCFS"       # "FCFS" | "EDD" | "SPT" | "SLACK" (ver sim/queues.py)
+    heatmap: bool = False                # mapas de calor del piso en streaming (ver sim/heatmap.py)
 
 
 @dataclass
@@ -68,6 +123,23 @@ class SimResult:
     picker_idle_min: List[float]
     picker_tours: List[int]
 
+    # Congestión espacial (congestion="aisle"; 0 en otros modos)
+    congestion_blocks: int = 0
+    congestion_block_min: float = 0.0
+
+    # Fechas compromiso (sólo pedidos completados con due_min; 0 si no hay)
+    orders_with_due: int = 0
+    lateness_avg_min: float = 0.0     # media de (fin − due), negativa = antes de tiempo
+    tardiness_avg_min: float = 0.0    # media de max(0, fin − due)
+    tardiness_max_min: float = 0.0
+    tardy_pct: float = 0.0            # % de pedidos terminados después del due
+
+    # Reporte de perfilado (sólo si SimConfig.profile*)
+    profile: Optional[Dict[str, Any]] = None
+
+    # Tránsito / permanencia / picks por celda (sólo si SimConfig.heatmap)
+    heatmap: Optional[FloorHeatmap] = None
+
 
 # ------------------------------- Simulador ---------------------------------
 
@@ -82,26 +154,44 @@ class Simulator:
         placement: SKUPlacement,
         orders: List[Order],
         cfg: SimConfig,
+        jobs: Optional[List[Job]] = None,
+        path_cache: Optional[Dict[int, list]] = None,
     ):
+        """
+        jobs: lista pre-construida (p.ej. JobCache.for_config) → se omite el ruteo de jobs;
+              debe corresponder a cfg (política, parámetro y velocidad) y no se modifica.
+        path_cache: dict job_id → path compartido entre corridas con el mismo plan.
+        """
         self.grid = grid
         self.placement = placement
         self.orders = sorted(orders, key=lambda o: o.arrival_min)
         self.cfg = cfg
+        self._path_cache = path_cache
+
+        # Perfilado opt-in (None → sin costo)
+        self._prof: Optional[SimProfiler] = None
+        if cfg.profile or cfg.profile_cprofile or cfg.profile_tracemalloc:
+            self._prof = SimProfiler(cprofile=cfg.profile_cprofile, tracemalloc=cfg.profile_tracemalloc)
+            self._prof.start()
 
         # Construcción de jobs según política
-        if cfg.policy == "Secuencial_FCFS":
-            self.jobs = build_jobs_sequential(self.orders, grid, placement, cfg.speed_m_per_min)
-        elif cfg.policy == "Batching_Size":
-            self.jobs = build_jobs_batch_size(self.orders, grid, placement, cfg.speed_m_per_min, cfg.batch_size)
-        elif cfg.policy == "Batching_Time":
-            self.jobs = build_jobs_batch_time(self.orders, grid, placement, cfg.speed_m_per_min, cfg.time_threshold_min)
-        else:
-            raise ValueError(f"Política no soportada: {cfg.policy}")
+        with self._phase("build_jobs"):
+            self.jobs = list(jobs) if jobs is not None else build_jobs(self.orders, grid, placement, cfg)
 
         # Estado de simulación
         self.now: float = 0.0
         self.evq = EventQueue()
-        self.waiting: Deque[Job] = deque()
+        # cola de espera: deque (FCFS) o heap indexado por prioridad (EDD/SPT/SLACK)
+        make_queue = waiting_factory(cfg.queue_discipline)
+        self.waiting = make_queue()
+        if cfg.picker_zones is not None:
+            if len(cfg.picker_zones) != cfg.n_pickers:
+                raise ValueError("picker_zones debe tener una zona (o None) por picker")
+            unknown = {z for z in cfg.picker_zones if z is not None} - set(grid.zones)
+            if unknown:
+                raise ValueError(f"Zonas no definidas en la grilla: {sorted(unknown)}")
+            self.jobs = assign_job_zones(self.jobs, grid, placement)
+            self.waiting = ZoneQueues(cfg.picker_zones, factory=make_queue)
         self.pickers: List[PickerState] = [PickerState() for _ in range(cfg.n_pickers)]
         self.analytics = {
             "queue_t": [0.0],          # tiempos de muestreo de cola
@@ -109,12 +199,14 @@ class Simulator:
             "completed_t": [0.0],      # tiempos de completadas acumuladas
             "completed_y": [0],        # completadas acumuladas
             "gantt": {},               # pid -> [(start, dur), ...]
-            "waits": []                # lista de esperas por pedido (min)
+            "waits": [],               # lista de esperas por pedido (min)
+            "wait_hist": WaitHistogram(),  # las mismas esperas, pre-binneadas (UI)
         }
         self.orders_completed: int = 0
 
         # Métricas agregadas
         self.order_waits: List[float] = []                # lista cruda de esperas por pedido
+        self.order_lateness: List[float] = []             # fin − due por pedido completado con due
         self.picker_tours: List[int] = [0] * cfg.n_pickers
         self.distance_total_m: float = 0.0
 
@@ -128,6 +220,13 @@ class Simulator:
         self.batches_release: List[float] = []   # instante de release del lote
         self.batches_fill: List[float] = []      # tiempo de llenado (size)
 
+        # Congestión espacial por ocupación de pasillos
+        self.occupancy: Optional[AisleOccupancy] = AisleOccupancy() if cfg.congestion == "aisle" else None
+
+        # Mapas de calor (se acumulan por job, sin traza)
+        self.heatmap: Optional[FloorHeatmap] = (FloorHeatmap(self.grid.width, self.grid.height)
+                                                if cfg.heatmap else None)
+
         # --------- Traza visual ----------
         spec = self.grid.spec
         if not isinstance(spec, dict):
@@ -150,15 +249,24 @@ class Simulator:
         for pid in range(cfg.n_pickers):
             self._tracks[pid].append((0.0, stx, sty, "idle", None))
 
+        # Estado de la API incremental (step / run_until / finalize)
+        self.events_processed: int = 0
+        self._done: bool = False
+        self._result: Optional[SimResult] = None
+
         # Arribos de jobs
         for job in self.jobs:
             self.evq.push(Event(time=job.arrival_min, etype="ARRIVAL", payload=job))
 
     # ----------------------- Utilidades internas -----------------------
 
+    def _phase(self, name: str):
+        return self._prof.phase(name) if self._prof is not None else NULL_PHASE
+
     def _congestion_multiplier(self, active_pickers: int) -> float:
         mode = self.cfg.congestion
-        if mode == "off":
+        if mode in ("off", "aisle"):
+            # "aisle" no usa factor global: los retrasos salen de AisleOccupancy
             return 1.0
         # activa desde 2 en adelante: 1 + alpha*(active-1)
         alpha = 0.15  # “light”: ~15% por picker extra
@@ -210,25 +318,28 @@ class Simulator:
                 ],
             })
 
-    def _build_path_for_job(self, job: Job) -> List[Tuple[float, float]]:
-        orders = getattr(job, "orders", None)
-        if not orders:
-            return []
-        if job.n_orders == 1:
-            return order_tour_path(self.grid, self.placement, orders[0], return_to_station=True)
-        return batch_tour_path(self.grid, self.placement, orders, return_to_station=True)
+    def _build_path_for_job(self, job: Job) -> np.ndarray:
+        if self._path_cache is not None:
+            path = self._path_cache.get(job.job_id)
+            if path is None:
+                path = self._path_cache[job.job_id] = self._route_job(job)
+            return path
+        return self._route_job(job)
 
-    def _path_length_m(self, path: List[Tuple[int, int]]) -> float:
-        if not path or len(path) < 2:
+    def _route_job(self, job: Job) -> np.ndarray:
+        return route_job(self.grid, self.placement, job)
+
+    def _path_length_m(self, path) -> float:
+        if len(path) < 2:
             return 0.0
         return float(len(path) - 1)  # 1 m por celda
 
-    def _animate_job(self, pid: int, job: Job, start_t: float, duration_min: float, job_path: List[Tuple[int, int]]):
+    def _animate_job(self, pid: int, job: Job, start_t: float, duration_min: float, job_path):
         """Emite keyframes por picker; la fusión a frames completos se hace al final."""
-        path = job_path
+        path = job_path.tolist() if hasattr(job_path, "tolist") else job_path   # int16 → ints de Python
 
         # Sin path (o trivial)
-        if not path or len(path) < 2:
+        if path is None or len(path) < 2:
             # mantén posición actual y crea dos keyframes
             self._picker_job[pid] = job.job_id
             self._picker_state[pid] = "moving"
@@ -266,28 +377,44 @@ class Simulator:
         self._picker_job[pid] = None
         self._keyframe(pid, t, self._picker_xy[pid], "idle", None)
 
+    def _next_job_for(self, pid: int) -> Optional[Job]:
+        if isinstance(self.waiting, ZoneQueues):
+            return self.waiting.pop_for(self.cfg.picker_zones[pid])
+        return self.waiting.popleft()
+
     def _assign_if_possible(self):
         changed_queue = False
 
         # Asignar en bucle: mientras haya cola y pickers libres al tiempo actual
         while self.waiting:
-            free = [(pid, p) for pid, p in enumerate(self.pickers) if p.busy_until <= self.now]
-            if not free:
+            # pickers libres por (busy_until, pid): el más “disponible” primero
+            # (sólo los primeros cfg.n_pickers: un fork con menos pickers retira a los últimos)
+            free = sorted((p.busy_until, pid) for pid, p in enumerate(self.pickers[:self.cfg.n_pickers])
+                          if p.busy_until <= self.now)
+            job = None
+            for _, pid in free:
+                job = self._next_job_for(pid)
+                if job is not None:
+                    break
+            if job is None:
                 break
-
-            # toma el picker libre con menor busy_until (el más “disponible”)
-            pid, p = min(free, key=lambda x: x[1].busy_until)
-
-            job = self.waiting.popleft()
+            p = self.pickers[pid]
             changed_queue = True
 
             # path y distancia
-            path = self._build_path_for_job(job)
+            with self._phase("path"):
+                path = self._build_path_for_job(job)
             self.distance_total_m += self._path_length_m(path)
 
             # congestión (si está off, _congestion_multiplier() devuelve 1.0)
             active = sum(1 for x in self.pickers if x.busy_until > self.now)
             dur = job.service_min * self._congestion_multiplier(active + 1)
+            if self.occupancy is not None:
+                with self._phase("congestion"):
+                    dur += self.occupancy.reserve(pid, path, self.now, job.service_min)
+            if self.heatmap is not None:
+                with self._phase("heatmap"):
+                    self.heatmap.add_job(path, dur, job, self.placement)
 
             # Gantt/analytics
             self.analytics.setdefault("gantt", {}).setdefault(pid, []).append((float(self.now), float(dur)))
@@ -297,22 +424,26 @@ class Simulator:
                 for o in job.orders:
                     wait = max(0.0, float(self.now - o.arrival_min))
                     self.analytics["waits"].append(wait)
+                    self.analytics["wait_hist"].add(wait)
                     self.order_waits.append(wait)
             else:
                 wait = max(0.0, float(self.now - job.arrival_min))
                 self.analytics["waits"].append(wait)
+                self.analytics["wait_hist"].add(wait)
                 self.order_waits.append(wait)
 
             # Gantt por picker (para métricas finales)
             self.gantt[pid].append((self.now, self.now + dur, int(job.job_id)))
 
             # Animación con keyframes
-            try:
-                self._animate_job(pid, job, start_t=self.now, duration_min=dur, job_path=path)
-            except Exception:
-                # Fallback mínimo: dos keyframes
-                self._keyframe(pid, self.now, self._picker_xy[pid], "moving", job.job_id)
-                self._keyframe(pid, self.now + dur, self._picker_xy[pid], "idle", None)
+            if self.cfg.trace:
+                with self._phase("keyframes"):
+                    try:
+                        self._animate_job(pid, job, start_t=self.now, duration_min=dur, job_path=path)
+                    except Exception:
+                        # Fallback mínimo: dos keyframes
+                        self._keyframe(pid, self.now, self._picker_xy[pid], "moving", job.job_id)
+                        self._keyframe(pid, self.now + dur, self._picker_xy[pid], "idle", None)
 
             # Actualiza estado del picker y agenda su evento de fin
             p.busy_until = self.now + dur
@@ -325,38 +456,146 @@ class Simulator:
             self.ts_queue.append((self.now, len(self.waiting)))
 
     # ------------------------------- Run --------------------------------
-
-    def run(self) -> SimResult:
-        while not self.evq.empty():
-            ev = self.evq.pop()
-
-            if self.cfg.horizon_min is not None and ev.time > self.cfg.horizon_min:
-                self.now = self.cfg.horizon_min
-                break
-
-            self.now = ev.time
-            if ev.etype == "ARRIVAL":
-                job: Job = ev.payload
-                self.waiting.append(job)
-                self._log_queue()
-                self.ts_queue.append((self.now, len(self.waiting)))
+    # API incremental: step() procesa un evento, run_until(t) avanza hasta t,
+    # events() itera eventos y snapshot() da KPIs parciales sin cerrar la corrida.
+    # run() == consumir events() + finalize(); los resultados son idénticos.
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def step(self) -> Optional[Event]:
+        """Procesa el próximo evento y lo devuelve; None si ya no quedan (o cruzó el horizonte)."""
+        if self._done:
+            return None
+        if self.evq.empty():
+            self._done = True
+            return None
+        if self.cfg.horizon_min is not None and self.evq.peek_time() > self.cfg.horizon_min:
+            # el evento queda en el heap: no se procesa
+            self.now = self.cfg.horizon_min
+            self._done = True
+            return None
+
+        ev = self.evq.pop()
+        self.events_processed += 1
+        prof = self._prof
+        if prof is not None:
+            prof.count(ev.etype)
+            prof.watermark("waiting", len(self.waiting))
+            prof.watermark("event_heap", len(self.evq) + 1)
+
+        self.now = ev.time
+        if ev.etype == "ARRIVAL":
+            job: Job = ev.payload
+            self.waiting.append(job)
+            self._log_queue()
+            self.ts_queue.append((self.now, len(self.waiting)))
+            with self._phase("dispatch"):
                 self._assign_if_possible()
 
-            elif ev.etype == "PICKER_FREE":
-                info = ev.payload
-                pid = info["pid"]
-                job: Job = info["job"]
-                self.pickers[pid].completed_orders += job.n_orders
-                self.orders_completed += job.n_orders
-                self.analytics["completed_t"].append(float(self.now))
-                self.analytics["completed_y"].append(int(self.orders_completed))
-                self._log_queue()
-                self.ts_completed.append((self.now, self.orders_completed))
+        elif ev.etype == "PICKER_FREE":
+            info = ev.payload
+            pid = info["pid"]
+            job: Job = info["job"]
+            self.pickers[pid].completed_orders += job.n_orders
+            self.orders_completed += job.n_orders
+            self.analytics["completed_t"].append(float(self.now))
+            self.analytics["completed_y"].append(int(self.orders_completed))
+            self._log_queue()
+            self.ts_completed.append((self.now, self.orders_completed))
+            for o in (job.orders or []):
+                if o.due_min is not None:
+                    self.order_lateness.append(self.now - o.due_min)
+            with self._phase("dispatch"):
                 self._assign_if_possible()
+        return ev
+
+    def events(self) -> Iterator[Event]:
+        """Itera los eventos a medida que se procesan (se puede cortar y retomar)."""
+        while True:
+            ev = self.step()
+            if ev is None:
+                return
+            yield ev
+
+    def run_until(self, t: float) -> Dict[str, Any]:
+        """
+        Procesa los eventos con tiempo <= t, deja el reloj en t y devuelve snapshot(t)
+        (t recortado al horizonte). Un fork tomado después arranca exactamente en t.
+        """
+        while not self._done and self.evq.peek_time() <= t:
+            self.step()
+        if not self._done and (self.evq.empty() or
+                               (self.cfg.horizon_min is not None and t >= self.cfg.horizon_min)):
+            self.step()   # no queda nada por debajo de t: cierra (heap vacío u horizonte)
+        if not self._done and math.isfinite(t):
+            self.now = max(self.now, t)   # el reloj queda en t (el próximo evento es > t)
+        if self.cfg.horizon_min is not None:
+            t = min(t, self.cfg.horizon_min)
+        return self.snapshot(t if math.isfinite(t) else None)
+
+    def snapshots(self, every_min: float) -> Iterator[Dict[str, Any]]:
+        """
+        snapshot() cada every_min minutos simulados hasta terminar; p.ej. para cortar
+        cuando un KPI se estabiliza:
+            for snap in sim.snapshots(30): if converged(snap): break
+            res = sim.finalize()
+        """
+        t = self.now
+        while not self._done:
+            t += every_min
+            yield self.run_until(t)
+
+    def snapshot(self, t: Optional[float] = None) -> Dict[str, Any]:
+        """KPIs parciales al tiempo t (por defecto el reloj actual); O(pickers + pedidos iniciados)."""
+        t = self.now if t is None else max(float(t), self.now)
+        util = []
+        for p in self.pickers:
+            # el último tour puede terminar después de t: se descuenta lo que falta
+            busy = p.busy_time - max(0.0, p.busy_until - t)
+            util.append(busy / t if t > 0 else 0.0)
+        late = self.order_lateness
+        return {
+            "t": t,
+            "events": self.events_processed,
+            "done": self._done,
+            "orders_completed": self.orders_completed,
+            "throughput_per_hour": (self.orders_completed / t * 60.0) if t > 0 else 0.0,
+            "avg_wait_min": (sum(self.order_waits) / len(self.order_waits)) if self.order_waits else 0.0,
+            "queue_len": len(self.waiting),
+            "busy_pickers": sum(1 for p in self.pickers if p.busy_until > t),
+            "picker_utilization": util,
+            "distance_total_m": self.distance_total_m,
+            "tardy_pct": (100.0 * sum(1 for x in late if x > 0.0) / len(late)) if late else 0.0,
+        }
+
+    def finalize(self) -> SimResult:
+        """
+        Cierra la corrida y arma el SimResult (una sola vez; llamadas siguientes devuelven
+        el mismo). Si se corta antes de terminar, las métricas se recortan al reloj actual.
+        """
+        if self._result is not None:
+            return self._result
+        with self._phase("metrics"):
+            res = self._final_metrics(None if self._done else self.now)
+        if self._prof is not None:
+            self._prof.stop()
+            res.profile = self._prof.report()
+        self._result = res
+        return res
 
+    def run(self) -> SimResult:
+        while self.step() is not None:
+            pass
+        return self.finalize()
+
+    def _final_metrics(self, stop_at: Optional[float] = None) -> SimResult:
         # --------- Métricas finales ----------
         makespan = max(self.now, max((p.busy_until for p in self.pickers), default=0.0))
         sim_time = makespan if self.cfg.horizon_min is None else min(makespan, self.cfg.horizon_min)
+        if stop_at is not None:
+            sim_time = min(sim_time, stop_at)   # corrida cortada antes de terminar
 
         throughput_per_hour = (self.orders_completed / sim_time * 60.0) if sim_time > 0 else 0.0
         avg_wait = float(np.mean(self.order_waits)) if self.order_waits else 0.0
@@ -387,7 +626,9 @@ class Simulator:
         self._log_queue()
 
         # Construye timeline fusionado por tiempo para la UI
-        self._build_timeline_from_tracks(sim_time)
+        if self.cfg.trace:
+            with self._phase("timeline"):
+                self._build_timeline_from_tracks(sim_time)
 
         return SimResult(
             makespan_min=sim_time,
@@ -414,4 +655,9 @@ class Simulator:
 
             picker_idle_min=idle,
             picker_tours=self.picker_tours,
+
+            congestion_blocks=self.occupancy.blocks if self.occupancy is not None else 0,
+            congestion_block_min=self.occupancy.block_min if self.occupancy is not None else 0.0,
+            **due_kpis(self.order_lateness),
+            heatmap=self.heatmap,
         )
@@ -20,6 +20,8 @@ class Job:
     service_min: float   # tiempo de servicio (ruta ida y vuelta convertida a tiempo)
     n_orders: int        # cuántos pedidos incluye (1 si pedido individual)
     orders: Optional[List[Order]] = None  
+    zone: Optional[str] = None  # zona de picking (despacho por zonas)
+    meters: float = 0.0         # largo del tour (independiente de la velocidad)
 
 class EventQueue:
     def __init__(self):
@@ -37,5 +39,15 @@ class EventQueue:
     def empty(self) -> bool:
         return not self._h
 
+    def __len__(self) -> int:
+        return len(self._h)
+
+    def copy(self) -> "EventQueue":
+        """Copia del heap (los Event se comparten: no se modifican una vez encolados)."""
+        q = EventQueue()
+        q._h = list(self._h)
+        q._seq = self._seq
+        return q
+
     def peek_time(self) -> float:
         return self._h[0][0] if self._h else float("inf")
@@ -0,0 +1,190 @@
+# src/sim/fastpath.py
+"""
+Camino rápido para corridas de screening: cola FIFO con c pickers idénticos.
+
+Con congestión "off" y sin zonas, el orden de atención es FIFO por (release, índice)
+y cada job toma el picker libre con menor (busy_until, pid): las esperas quedan
+determinadas por llegadas y tiempos de servicio. Se calculan con un loop de heap
+sobre arrays (mismas operaciones de punto flotante que el motor → KPIs idénticos)
+y el resto de las métricas se vectoriza con NumPy.
+"""
+import heapq
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from src.sim.engine import SimConfig, SimResult, Simulator, build_jobs, route_job, due_kpis
+from src.sim.events import Job
+
+
+def fast_path_supported(cfg: SimConfig) -> bool:
+    """True si Simulator.run no aporta nada más que KPIs (FIFO, sin congestión, zonas, traza, heatmap ni perfilado)."""
+    return (
+        cfg.queue_discipline == "FCFS"
+        and cfg.congestion == "off"
+        and cfg.picker_zones is None
+        and not cfg.trace
+        and not cfg.heatmap
+        and not (cfg.profile or cfg.profile_cprofile or cfg.profile_tracemalloc)
+    )
+
+
+def fifo_schedule(arrival: np.ndarray, service: np.ndarray, n_servers: int,
+                  horizon: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Recursión multi-servidor (Kiefer–Wolfowitz) con heap de (busy_until, pid).
+    arrival debe venir en orden FIFO. Devuelve (start, end, server) de los jobs que
+    arrancan dentro del horizonte (un prefijo, porque los inicios son no decrecientes).
+    """
+    heap = [(0.0, pid) for pid in range(n_servers)]
+    hmax = float("inf") if horizon is None else horizon
+    replace = heapq.heapreplace
+    start: List[float] = []
+    end: List[float] = []
+    server: List[int] = []
+    for a, s in zip(arrival.tolist(), service.tolist()):
+        bu, pid = heap[0]
+        t0 = a if a >= bu else bu
+        if t0 > hmax:
+            break
+        t1 = t0 + s
+        replace(heap, (t1, pid))
+        start.append(t0)
+        end.append(t1)
+        server.append(pid)
+    return np.array(start, dtype=float), np.array(end, dtype=float), np.array(server, dtype=np.int64)
+
+
+def run_fast(jobs: Sequence[Job], cfg: SimConfig, path_len: Optional[Callable[[Job], float]] = None,
+             series: bool = True) -> SimResult:
+    """
+    Mismos KPIs que Simulator(...).run() para configs con fast_path_supported(cfg).
+    path_len(job): largo del path como lo mide el motor; se llama sólo para jobs que
+    arrancan. Por defecto job.meters (tour BFS, sin rutear paths).
+    series=False omite ts_queue / ts_completed / gantt (sólo KPIs, para barridos).
+    """
+    n_pickers = cfg.n_pickers
+    horizon = cfg.horizon_min
+    # FIFO del motor: ARRIVAL por (tiempo, orden de la lista)
+    arrival = np.array([j.arrival_min for j in jobs], dtype=float)
+    order = np.argsort(arrival, kind="stable")
+    jobs = [jobs[i] for i in order.tolist()]
+    arrival = arrival[order]
+    service = np.array([j.service_min for j in jobs], dtype=float)
+    start, end, server = fifo_schedule(arrival, service, n_pickers, horizon)
+    k = len(start)
+
+    # completadas dentro del horizonte
+    n_orders = np.array([j.n_orders for j in jobs[:k]], dtype=np.int64)
+    done = end <= horizon if horizon is not None else np.ones(k, dtype=bool)
+    orders_completed = int(n_orders[done].sum())
+
+    # tiempo simulado: último evento procesado (o el horizonte si se cortó)
+    last = max(float(arrival.max()) if len(arrival) else 0.0, float(end.max()) if k else 0.0)
+    sim_time = last if horizon is None else min(last, horizon)
+
+    # esperas por pedido, en el orden en que el motor las registra
+    order_arr: List[float] = []
+    per_job: List[int] = []
+    for job in jobs[:k]:
+        os_ = getattr(job, "orders", None)
+        if os_:
+            order_arr.extend(o.arrival_min for o in os_)
+            per_job.append(len(os_))
+        else:
+            order_arr.append(job.arrival_min)
+            per_job.append(1)
+    waits_arr = np.maximum(0.0, np.repeat(start, per_job) - np.array(order_arr, dtype=float))
+    waits = waits_arr.tolist()
+    avg_wait = float(np.mean(waits_arr)) if waits else 0.0
+    wait_p90 = float(np.percentile(waits_arr, 90)) if waits else 0.0
+    wait_p95 = float(np.percentile(waits_arr, 95)) if waits else 0.0
+
+    # utilización: barras recortadas a sim_time (np.add.at acumula en orden, igual que el motor)
+    clipped = np.maximum(0.0, np.minimum(end, sim_time) - np.minimum(start, sim_time))
+    eff_busy = np.zeros(n_pickers)
+    np.add.at(eff_busy, server, clipped)
+    util = [(b / sim_time) if sim_time > 0 else 0.0 for b in eff_busy.tolist()]
+    idle = [max(0.0, sim_time - b) for b in eff_busy.tolist()]
+    picker_tours = np.bincount(server, minlength=n_pickers).tolist()
+
+    # suma secuencial en orden de asignación (como el motor)
+    if path_len is None:
+        distance_total_m = sum([float(j.meters) for j in jobs[:k]], 0.0)
+    else:
+        distance_total_m = sum(map(path_len, jobs[:k]), 0.0)
+    distance_per_order = (distance_total_m / orders_completed) if orders_completed > 0 else 0.0
+
+    # lateness en el orden de los PICKER_FREE del motor: fin, luego orden de asignación
+    lateness: List[float] = []
+    done_idx = np.flatnonzero(done)
+    for i, t1 in zip(done_idx[np.argsort(end[done], kind="stable")].tolist(),
+                     np.sort(end[done], kind="stable").tolist()):
+        for o in (jobs[i].orders or []):
+            if o.due_min is not None:
+                lateness.append(t1 - o.due_min)
+
+    ts_queue: List[Tuple[float, int]] = [(0.0, 0)]
+    ts_completed: List[Tuple[float, int]] = [(0.0, 0)]
+    gantt: List[List[Tuple[float, float, int]]] = [[] for _ in range(n_pickers)]
+    if series:
+        # mismo escalón que el motor (arribos +1, inicios −1; completadas acumuladas)
+        ev_t = np.concatenate([arrival[arrival <= horizon] if horizon is not None else arrival, start])
+        ev_d = np.concatenate([np.ones(len(ev_t) - k, dtype=np.int64), -np.ones(k, dtype=np.int64)])
+        idx = np.lexsort((-ev_d, ev_t))
+        ts_queue += zip(ev_t[idx].tolist(), np.cumsum(ev_d[idx]).tolist())
+        cidx = np.argsort(end[done], kind="stable")
+        ts_completed += zip(end[done][cidx].tolist(), np.cumsum(n_orders[done][cidx]).tolist())
+
+        job_ids = np.array([int(j.job_id) for j in jobs[:k]], dtype=np.int64)
+        for pid in range(n_pickers):
+            sel = np.flatnonzero(server == pid)
+            gantt[pid] = list(zip(start[sel].tolist(), end[sel].tolist(), job_ids[sel].tolist()))
+
+    return SimResult(
+        makespan_min=sim_time,
+        orders_completed=orders_completed,
+        throughput_per_hour=(orders_completed / sim_time * 60.0) if sim_time > 0 else 0.0,
+        avg_wait_min=avg_wait,
+        picker_utilization=util,
+        wait_p90_min=wait_p90,
+        wait_p95_min=wait_p95,
+        distance_total_m=distance_total_m,
+        distance_per_order_avg_m=distance_per_order,
+        batches_count=0,
+        batch_avg_size=0.0,
+        batch_pct_ge2=0.0,
+        batch_avg_release_min=0.0,
+        batch_avg_fill_min=0.0,
+        ts_queue=ts_queue,
+        ts_completed=ts_completed,
+        gantt=gantt,
+        waits_raw=waits,
+        picker_idle_min=idle,
+        picker_tours=picker_tours,
+        **due_kpis(lateness),
+    )
+
+
+def simulate(grid, placement, orders, cfg: SimConfig, jobs: Optional[List[Job]] = None,
+             path_cache: Optional[Dict[int, list]] = None, exact_distance: bool = True,
+             series: bool = True) -> SimResult:
+    """
+    Corre el camino rápido si la config lo permite; si no, Simulator(...).run().
+    exact_distance=True mide la distancia con los mismos paths que el motor (usa/llena
+    path_cache); False usa los metros del tour BFS y evita rutear paths (screening puro).
+    """
+    if not fast_path_supported(cfg):
+        return Simulator(grid, placement, orders, cfg, jobs=jobs, path_cache=path_cache).run()
+    if jobs is None:
+        jobs = build_jobs(sorted(orders, key=lambda o: o.arrival_min), grid, placement, cfg)
+    if not exact_distance:
+        return run_fast(jobs, cfg, series=series)
+    cache = path_cache if path_cache is not None else {}
+
+    def path_len(job: Job) -> float:
+        path = cache.get(job.job_id)
+        if path is None:
+            path = cache[job.job_id] = route_job(grid, placement, job)
+        return float(len(path) - 1) if len(path) >= 2 else 0.0
+
+    return run_fast(jobs, cfg, path_len, series=series)
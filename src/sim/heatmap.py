@@ -0,0 +1,114 @@
+# src/sim/heatmap.py
+"""
+Mapas de calor del piso, acumulados en streaming durante la simulación.
+
+Por cada job que arranca se suman, con np.add.at sobre arrays (alto, ancho):
+  - traversal: entradas a cada celda (pasos no nulos del path);
+  - dwell_min: minutos de picker en cada celda (el paso i del path dura
+    duración/pasos y el picker está en path[i]; los pasos nulos del path
+    —las paradas de pick— quedan como tiempo en la cara de picking);
+  - picks: líneas pickeadas en cada slot (un pick por ítem del pedido).
+No necesita la traza (cfg.trace=False alcanza): usa el path que el motor ya rutea.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+import numpy as np
+
+
+@dataclass
+class FloorHeatmap:
+    width: int
+    height: int
+    traversal: np.ndarray = field(default=None, repr=False)
+    dwell_min: np.ndarray = field(default=None, repr=False)
+    picks: np.ndarray = field(default=None, repr=False)
+    jobs: int = 0
+
+    def __post_init__(self):
+        shape = (int(self.height), int(self.width))
+        if self.traversal is None:
+            self.traversal = np.zeros(shape, dtype=np.int64)
+        if self.dwell_min is None:
+            self.dwell_min = np.zeros(shape, dtype=np.float64)
+        if self.picks is None:
+            self.picks = np.zeros(shape, dtype=np.int64)
+
+    # ------------------------------ acumular ------------------------------
+    def add_path(self, path, duration_min: float) -> None:
+        p = np.asarray(path, dtype=np.int64).reshape(-1, 2)
+        n = len(p)
+        if n == 0:
+            return
+        ok = (p[:, 0] >= 0) & (p[:, 0] < self.width) & (p[:, 1] >= 0) & (p[:, 1] < self.height)
+        if n == 1:
+            if ok[0]:
+                self.dwell_min[p[0, 1], p[0, 0]] += float(duration_min)
+            return
+        moved = np.any(p[1:] != p[:-1], axis=1) & ok[1:]
+        np.add.at(self.traversal, (p[1:, 1][moved], p[1:, 0][moved]), 1)
+        step = float(duration_min) / (n - 1)
+        here = ok[:-1]
+        np.add.at(self.dwell_min, (p[:-1, 1][here], p[:-1, 0][here]), step)
+
+    def add_picks(self, coords) -> None:
+        c = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+        ok = (c[:, 0] >= 0) & (c[:, 0] < self.width) & (c[:, 1] >= 0) & (c[:, 1] < self.height)
+        np.add.at(self.picks, (c[ok, 1], c[ok, 0]), 1)
+
+    def add_job(self, path, duration_min: float, job, placement) -> None:
+        """Path + picks del job (los ítems de sus pedidos, ubicados por placement)."""
+        self.jobs += 1
+        self.add_path(path, duration_min)
+        orders = getattr(job, "orders", None) or []
+        loc = getattr(placement, "sku_to_coord", None) or {}
+        coords = [loc[s] for o in orders for s in o.items if s in loc]
+        if coords:
+            self.add_picks(coords)
+
+    # ------------------------------ consultas ------------------------------
+    def copy(self) -> "FloorHeatmap":
+        return FloorHeatmap(self.width, self.height, self.traversal.copy(), self.dwell_min.copy(),
+                            self.picks.copy(), self.jobs)
+
+    def merge(self, other: "FloorHeatmap") -> "FloorHeatmap":
+        """Suma otra corrida (mismo piso), p.ej. seeds de un barrido."""
+        self.traversal += other.traversal
+        self.dwell_min += other.dwell_min
+        self.picks += other.picks
+        self.jobs += other.jobs
+        return self
+
+    def layer(self, name: str) -> np.ndarray:
+        return {"traversal": self.traversal, "dwell": self.dwell_min, "dwell_min": self.dwell_min,
+                "picks": self.picks}[name]
+
+    def hottest(self, name: str = "traversal", k: int = 10):
+        """[(x, y, valor)] de las k celdas más calientes."""
+        a = self.layer(name).ravel()
+        k = min(int(k), int(np.count_nonzero(a)))
+        if k <= 0:
+            return []
+        idx = np.argpartition(-a, k - 1)[:k]
+        idx = idx[np.argsort(-a[idx], kind="stable")]
+        return [(int(i % self.width), int(i // self.width), a[i].item()) for i in idx]
+
+    def sku_weights(self, placement, skus: Sequence[str]) -> np.ndarray:
+        """Picks observados por SKU (en el orden de skus): weights para optimize_slotting."""
+        loc = placement.sku_to_coord
+        out = np.zeros(len(skus), dtype=float)
+        for i, s in enumerate(skus):
+            xy = loc.get(s)
+            if xy is not None and 0 <= xy[0] < self.width and 0 <= xy[1] < self.height:
+                out[i] = float(self.picks[xy[1], xy[0]])
+        return out
+
+    def summary(self) -> Dict[str, float]:
+        moved = int(self.traversal.sum())
+        return {
+            "jobs": self.jobs,
+            "cells_visited": int(np.count_nonzero(self.traversal)),
+            "traversals": moved,
+            "dwell_total_min": float(self.dwell_min.sum()),
+            "picks": int(self.picks.sum()),
+            "top10_traversal_share": float(sum(v for *_, v in self.hottest("traversal", 10)) / moved) if moved else 0.0,
+        }
@@ -0,0 +1,92 @@
+# src/sim/histogram.py
+"""
+Histograma de esperas en streaming (memoria fija, sin guardar la lista cruda).
+
+Bins de ancho fijo desde 0; cuando llega un valor fuera de rango se fusionan
+los bins de a pares (el ancho se duplica), así el rango se adapta solo y la
+cantidad de bins nunca pasa de n_bins. Los percentiles se interpolan dentro
+del bin: el error es a lo sumo un ancho de bin.
+"""
+from dataclasses import dataclass, field
+from typing import Iterable
+import numpy as np
+
+
+@dataclass
+class WaitHistogram:
+    n_bins: int = 128                 # par: se fusiona de a dos
+    width: float = 0.25               # ancho inicial (min)
+    counts: np.ndarray = field(default=None, repr=False)
+    n: int = 0
+    total: float = 0.0
+    vmax: float = 0.0
+
+    def __post_init__(self):
+        if self.counts is None:
+            self.counts = np.zeros(int(self.n_bins), dtype=np.int64)
+
+    def _grow(self, x: float) -> None:
+        while x >= self.width * self.n_bins:
+            half = self.counts.reshape(-1, 2).sum(axis=1)
+            self.counts = np.concatenate([half, np.zeros_like(half)])
+            self.width *= 2.0
+
+    def add(self, x: float) -> None:
+        x = max(0.0, float(x))
+        if x >= self.width * self.n_bins:
+            self._grow(x)
+        self.counts[int(x / self.width)] += 1
+        self.n += 1
+        self.total += x
+        if x > self.vmax:
+            self.vmax = x
+
+    def add_many(self, xs: Iterable[float]) -> None:
+        a = np.asarray(list(xs) if not isinstance(xs, np.ndarray) else xs, dtype=float)
+        a = np.maximum(a[np.isfinite(a)], 0.0)
+        if a.size == 0:
+            return
+        self._grow(float(a.max()))
+        idx = np.minimum((a / self.width).astype(np.int64), self.n_bins - 1)
+        self.counts += np.bincount(idx, minlength=self.n_bins)
+        self.n += int(a.size)
+        self.total += float(a.sum())
+        self.vmax = max(self.vmax, float(a.max()))
+
+    @classmethod
+    def from_values(cls, xs: Iterable[float], **kw) -> "WaitHistogram":
+        h = cls(**kw)
+        h.add_many(xs)
+        return h
+
+    def copy(self) -> "WaitHistogram":
+        return WaitHistogram(self.n_bins, self.width, self.counts.copy(), self.n, self.total, self.vmax)
+
+    # ------------------------------ consultas ------------------------------
+    @property
+    def edges(self) -> np.ndarray:
+        return np.arange(self.n_bins + 1) * self.width
+
+    def trimmed(self, max_bins: int = 40):
+        """(counts, edges) sin los bins vacíos de la cola y con a lo sumo max_bins (para dibujar)."""
+        nz = np.flatnonzero(self.counts)
+        last = int(nz[-1]) + 1 if nz.size else 1
+        k = max(1, -(-last // max(1, int(max_bins))))
+        c = np.zeros(-(-last // k) * k, dtype=np.int64)
+        c[:last] = self.counts[:last]
+        c = c.reshape(-1, k).sum(axis=1)
+        return c, np.arange(len(c) + 1) * (self.width * k)
+
+    def mean(self) -> float:
+        return self.total / self.n if self.n else 0.0
+
+    def quantile(self, q: float) -> float:
+        if self.n == 0:
+            return 0.0
+        cum = np.cumsum(self.counts)
+        target = float(q) * self.n
+        i = int(np.searchsorted(cum, target, side="left"))
+        i = min(i, self.n_bins - 1)
+        before = cum[i - 1] if i > 0 else 0
+        frac = (target - before) / self.counts[i] if self.counts[i] else 0.0
+        return min(self.vmax, (i + frac) * self.width)
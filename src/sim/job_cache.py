@@ -0,0 +1,82 @@
+# src/sim/job_cache.py
+from dataclasses import replace
+from typing import Dict, List, Tuple
+
+from src.sim.events import Job
+from src.sim.policies import (
+    build_jobs_sequential, build_jobs_batch_size, build_jobs_batch_time, build_jobs_batch_proximity
+)
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+
+
+class JobCache:
+    """
+    Cache de jobs por entorno (orders, grid, placement) para barridos.
+
+    La lista de jobs sólo depende de la política, sus parámetros (batch_size y/o umbral)
+    y la velocidad; n_pickers / congestión no la cambian. Se guarda:
+      - el plan (lotes + metros de tour) por (política, parámetro): el ruteo se hace una vez;
+      - los jobs por (plan, velocidad): service_min = meters / speed, sin re-rutear;
+      - los paths celda a celda por plan (job_id → path), compartidos entre velocidades.
+    Jobs, pedidos y paths se comparten entre simulaciones: tratarlos como sólo lectura.
+    """
+
+    def __init__(self, orders, grid: WarehouseGrid, placement: SKUPlacement):
+        self.orders = sorted(orders, key=lambda o: o.arrival_min)
+        self.grid = grid
+        self.placement = placement
+        self._plans: Dict[Tuple, List[Job]] = {}
+        self._jobs: Dict[Tuple, List[Job]] = {}
+        self._paths: Dict[Tuple, Dict[int, list]] = {}
+        self.plan_builds = 0      # cuántas veces se ruteó (para medir el ahorro)
+
+    @staticmethod
+    def plan_key(policy: str, batch_size: int = 10, time_threshold_min: float = 2.0) -> Tuple:
+        if policy == "Secuencial_FCFS":
+            return (policy,)
+        if policy == "Batching_Size":
+            return (policy, int(batch_size))
+        if policy == "Batching_Time":
+            return (policy, float(time_threshold_min))
+        if policy == "Batching_Proximity":
+            return (policy, int(batch_size), float(time_threshold_min))
+        raise ValueError(f"Política no soportada: {policy}")
+
+    def _plan(self, key: Tuple) -> List[Job]:
+        plan = self._plans.get(key)
+        if plan is None:
+            # velocidad 1 → service_min == meters; la velocidad real se aplica en jobs()
+            if key[0] == "Secuencial_FCFS":
+                plan = build_jobs_sequential(self.orders, self.grid, self.placement, 1.0)
+            elif key[0] == "Batching_Size":
+                plan = build_jobs_batch_size(self.orders, self.grid, self.placement, 1.0, key[1])
+            elif key[0] == "Batching_Time":
+                plan = build_jobs_batch_time(self.orders, self.grid, self.placement, 1.0, key[1])
+            else:
+                plan = build_jobs_batch_proximity(self.orders, self.grid, self.placement, 1.0, key[2], key[1])
+            self._plans[key] = plan
+            self.plan_builds += 1
+        return plan
+
+    def jobs(self, policy: str, speed_m_per_min: float,
+             batch_size: int = 10, time_threshold_min: float = 2.0) -> List[Job]:
+        key = self.plan_key(policy, batch_size, time_threshold_min)
+        jkey = key + (float(speed_m_per_min),)
+        jobs = self._jobs.get(jkey)
+        if jobs is None:
+            speed = max(speed_m_per_min, 1e-9)
+            jobs = [replace(j, service_min=j.meters / speed) for j in self._plan(key)]
+            self._jobs[jkey] = jobs
+        return jobs
+
+    def paths(self, policy: str, batch_size: int = 10, time_threshold_min: float = 2.0) -> Dict[int, list]:
+        """Dict job_id → path que el Simulator va llenando (válido para cualquier velocidad)."""
+        return self._paths.setdefault(self.plan_key(policy, batch_size, time_threshold_min), {})
+
+    def for_config(self, cfg) -> Tuple[List[Job], Dict[int, list]]:
+        """(jobs, path_cache) listos para Simulator(..., jobs=, path_cache=)."""
+        return (
+            self.jobs(cfg.policy, cfg.speed_m_per_min, cfg.batch_size, cfg.time_threshold_min),
+            self.paths(cfg.policy, cfg.batch_size, cfg.time_threshold_min),
+        )
@@ -1,12 +1,14 @@
+from dataclasses import replace
 from typing import List, Literal
 from src.sim.events import Job
 from src.warehouse.grid import WarehouseGrid
 from src.warehouse.sku_map import SKUPlacement
-from src.picking.tours import order_tour, batch_tour
-from src.picking.batching import SizeThresholdBatching, TimeThresholdBatching
+from src.warehouse.dist_cache import router_matrix
+from src.picking.tours import order_tour, batch_tour, _coords_for_order
+from src.picking.batching import SizeThresholdBatching, TimeThresholdBatching, ProximityBatching
 from src.demand.orders import Order
 
-PolicyName = Literal["Secuencial_FCFS", "Batching_Size", "Batching_Time"]
+PolicyName = Literal["Secuencial_FCFS", "Batching_Size", "Batching_Time", "Batching_Proximity"]
 
 def build_jobs_sequential(
     orders: List[Order],
@@ -24,7 +26,8 @@ def build_jobs_sequential(
             arrival_min=o.arrival_min,          # correcto: la llegada de la orden
             service_min=service,
             n_orders=1,
-            orders=[o]
+            orders=[o],
+            meters=tr.meters,
         ))
         jid += 1
     return jobs
@@ -55,7 +58,8 @@ def build_jobs_batch_size(
             arrival_min=release_min,       # <-- usar release, NO first_arrival
             service_min=service,
             n_orders=len(b.orders),
-            orders=b.orders
+            orders=b.orders,
+            meters=tr.meters,
         ))
         jid += 1
     return jobs
@@ -87,7 +91,58 @@ def build_jobs_batch_time(
             arrival_min=release_min,       # <-- usar fin de ventana (release)
             service_min=service,
             n_orders=len(b.orders),
-            orders=b.orders
+            orders=b.orders,
+            meters=tr.meters,
         ))
         jid += 1
     return jobs
+
+
+def build_jobs_batch_proximity(
+    orders: List[Order],
+    grid: WarehouseGrid,
+    placement: SKUPlacement,
+    speed_m_per_min: float,
+    window_min: float,
+    capacity: int
+) -> List[Job]:
+    """Lotes por proximidad (ahorros sobre la matriz de grid.router) dentro de cada ventana; se liberan al cerrar la ventana."""
+    pb = ProximityBatching(window_min, capacity,
+                           coords_fn=lambda o: _coords_for_order(placement, o),
+                           depot=grid.station_xy,
+                           dist_fn=lambda cells: router_matrix(grid, cells))
+    batches = pb.make_batches(orders)
+
+    jobs: List[Job] = []
+    for jid, b in enumerate(batches):
+        tr = batch_tour(grid, placement, b.orders, return_to_station=True)
+        service = tr.meters / max(speed_m_per_min, 1e-9)
+        jobs.append(Job(
+            job_id=jid,
+            arrival_min=b.release_min,
+            service_min=service,
+            n_orders=len(b.orders),
+            orders=b.orders,
+            meters=tr.meters,
+        ))
+    return jobs
+
+
+def assign_job_zones(jobs: List[Job], grid: WarehouseGrid, placement: SKUPlacement) -> List[Job]:
+    """
+    Copias de los jobs marcadas con la zona que concentra más paradas (None si la
+    grilla no tiene zonas). No modifica los jobs recibidos: pueden venir de un
+    JobCache compartido entre corridas.
+    """
+    if not grid.zones:
+        return list(jobs)
+    out: List[Job] = []
+    for job in jobs:
+        counts = {}
+        for o in job.orders or []:
+            for sku in o.item_counts:
+                z = grid.zone_of(placement.coord_of(sku))
+                counts[z] = counts.get(z, 0) + 1
+        counts.pop(None, None)
+        out.append(replace(job, zone=max(counts, key=counts.get) if counts else None))
+    return out
@@ -0,0 +1,105 @@
+# src/sim/profiling.py
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterable, Optional
+import time
+
+# contexto reutilizable para cuando el perfilado está apagado (costo ~0)
+NULL_PHASE = nullcontext()
+
+
+class SimProfiler:
+    """
+    Instrumentación opt-in del simulador:
+      - cronómetros de pared por fase (acumulados),
+      - contadores de eventos por tipo,
+      - marcas de agua (máximos) de cola de espera y heap de eventos,
+      - opcional: cProfile (top funciones) y tracemalloc (pico de memoria).
+    El motor sólo la crea si SimConfig.profile es True; si no, usa NULL_PHASE.
+    """
+
+    def __init__(self, cprofile: bool = False, tracemalloc: bool = False, top_n: int = 25):
+        self.phases: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.events: Dict[str, int] = {}
+        self.high_water: Dict[str, int] = {}
+        self.top_n = top_n
+        self._cprof = None
+        self._tracemalloc = tracemalloc
+        self._tm_started = False
+        self._cprofile_text: Optional[str] = None
+        self._tm_peak_mb: Optional[float] = None
+        if cprofile:
+            import cProfile
+            self._cprof = cProfile.Profile()
+
+    # ---- ciclo de vida ----
+    def start(self) -> None:
+        if self._tracemalloc:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tm_started = True
+        if self._cprof is not None:
+            self._cprof.enable()
+
+    def stop(self) -> None:
+        if self._cprof is not None:
+            self._cprof.disable()
+            import io, pstats
+            buf = io.StringIO()
+            pstats.Stats(self._cprof, stream=buf).sort_stats("cumulative").print_stats(self.top_n)
+            self._cprofile_text = buf.getvalue()
+        if self._tracemalloc:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                _, peak = tracemalloc.get_traced_memory()
+                self._tm_peak_mb = peak / (1024.0 * 1024.0)
+                if self._tm_started:
+                    tracemalloc.stop()
+
+    # ---- medición ----
+    @contextmanager
+    def phase(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - t0)
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.events[name] = self.events.get(name, 0) + n
+
+    def watermark(self, name: str, value: int) -> None:
+        if value > self.high_water.get(name, -1):
+            self.high_water[name] = int(value)
+
+    def report(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "phases_s": dict(self.phases),
+            "phase_calls": dict(self.calls),
+            "events": dict(self.events),
+            "high_water": dict(self.high_water),
+        }
+        if self._cprofile_text is not None:
+            out["cprofile"] = self._cprofile_text
+        if self._tm_peak_mb is not None:
+            out["tracemalloc_peak_mb"] = self._tm_peak_mb
+        return out
+
+
+def merge_reports(reports: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Suma fases/llamadas/eventos y toma el máximo de las marcas de agua (para barridos)."""
+    out: Dict[str, Any] = {"runs": 0, "phases_s": {}, "phase_calls": {}, "events": {}, "high_water": {}}
+    for r in reports:
+        if not r:
+            continue
+        out["runs"] += 1
+        for key in ("phases_s", "phase_calls", "events"):
+            for k, v in r.get(key, {}).items():
+                out[key][k] = out[key].get(k, 0) + v
+        for k, v in r.get("high_water", {}).items():
+            out["high_water"][k] = max(out["high_water"].get(k, 0), v)
+        if "tracemalloc_peak_mb" in r:
+            out["tracemalloc_peak_mb"] = max(out.get("tracemalloc_peak_mb", 0.0), r["tracemalloc_peak_mb"])
+    return out
@@ -0,0 +1,256 @@
+# src/sim/queues.py
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+import math
+from src.sim.events import Job
+
+QUEUE_DISCIPLINES = ("FCFS", "EDD", "SPT", "SLACK")
+
+
+class IndexedPriorityQueue:
+    """
+    Heap binario (mínimo) con índice handle → posición.
+
+    push / pop / update / remove en O(log n); peek y `in` en O(1). Cada handle
+    (hashable, p.ej. job_id) aparece una sola vez. Las claves deben ser comparables;
+    para desempatar en orden de llegada conviene incluir un contador en la clave.
+    """
+
+    def __init__(self):
+        self._heap: List[List[Any]] = []          # [key, handle, item]
+        self._pos: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def __contains__(self, handle: Hashable) -> bool:
+        return handle in self._pos
+
+    def copy(self) -> "IndexedPriorityQueue":
+        q = IndexedPriorityQueue()
+        q._heap = [list(e) for e in self._heap]   # update() muta la clave de la entrada
+        q._pos = dict(self._pos)
+        return q
+
+    def key_of(self, handle: Hashable):
+        return self._heap[self._pos[handle]][0]
+
+    def push(self, handle: Hashable, key, item: Any = None) -> None:
+        if handle in self._pos:
+            raise KeyError(f"handle duplicado: {handle!r}")
+        self._heap.append([key, handle, item])
+        self._pos[handle] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def peek(self) -> Tuple[Hashable, Any]:
+        _, handle, item = self._heap[0]
+        return handle, item
+
+    def pop(self) -> Tuple[Hashable, Any]:
+        return self._remove_at(0)
+
+    def remove(self, handle: Hashable) -> Any:
+        return self._remove_at(self._pos[handle])[1]
+
+    def update(self, handle: Hashable, key) -> None:
+        """Re-prioriza un elemento ya encolado (sube o baja según la nueva clave)."""
+        i = self._pos[handle]
+        old = self._heap[i][0]
+        self._heap[i][0] = key
+        if key < old:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    # ---- internos ----
+    def _remove_at(self, i: int) -> Tuple[Hashable, Any]:
+        heap = self._heap
+        _, handle, item = heap[i]
+        last = heap.pop()
+        del self._pos[handle]
+        if i < len(heap):
+            heap[i] = last
+            self._pos[last[1]] = i
+            self._sift_down(i)
+            self._sift_up(i)
+        return handle, item
+
+    def _sift_up(self, i: int) -> None:
+        heap, pos = self._heap, self._pos
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            pe = heap[parent]
+            if not entry[0] < pe[0]:
+                break
+            heap[i] = pe
+            pos[pe[1]] = i
+            i = parent
+        heap[i] = entry
+        pos[entry[1]] = i
+
+    def _sift_down(self, i: int) -> None:
+        heap, pos = self._heap, self._pos
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            right = child + 1
+            if right < n and heap[right][0] < heap[child][0]:
+                child = right
+            ce = heap[child]
+            if not ce[0] < entry[0]:
+                break
+            heap[i] = ce
+            pos[ce[1]] = i
+            i = child
+        heap[i] = entry
+        pos[entry[1]] = i
+
+
+def job_due_min(job: Job) -> float:
+    """Due más temprano entre los pedidos del job (inf si ninguno tiene fecha compromiso)."""
+    dues = [o.due_min for o in (getattr(job, "orders", None) or []) if getattr(o, "due_min", None) is not None]
+    return min(dues) if dues else math.inf
+
+
+def _edd(job: Job) -> float:
+    return job_due_min(job)
+
+def _spt(job: Job) -> float:
+    return job.service_min
+
+def _slack(job: Job) -> float:
+    # holgura estática: due − servicio (el "− now" es común a toda la cola)
+    return job_due_min(job) - job.service_min
+
+_PRIORITY_KEYS: Dict[str, Callable[[Job], float]] = {"EDD": _edd, "SPT": _spt, "SLACK": _slack}
+
+
+class PriorityWaiting:
+    """
+    Cola de espera por prioridad sobre IndexedPriorityQueue, con la interfaz del deque
+    que usa el motor (append / popleft / len / bool / [0]).
+
+    Clave = (prioridad(job), arrival_min, n° de ingreso): empates en orden FIFO.
+    """
+
+    def __init__(self, priority: Callable[[Job], float]):
+        self.priority = priority
+        self._pq = IndexedPriorityQueue()
+        self._seq = 0
+
+    def append(self, job: Job) -> None:
+        self._seq += 1
+        self._pq.push(job.job_id, (self.priority(job), job.arrival_min, self._seq), job)
+
+    def popleft(self) -> Job:
+        return self._pq.pop()[1]
+
+    def copy(self) -> "PriorityWaiting":
+        q = PriorityWaiting(self.priority)
+        q._pq = self._pq.copy()
+        q._seq = self._seq
+        return q
+
+    def reprioritize(self, job: Job, priority: Optional[float] = None) -> None:
+        """Cambia la prioridad de un job en cola (por defecto la recalcula con self.priority)."""
+        _, arr, seq = self._pq.key_of(job.job_id)
+        p = self.priority(job) if priority is None else priority
+        self._pq.update(job.job_id, (p, arr, seq))
+
+    def __getitem__(self, i: int) -> Job:
+        if i != 0:
+            raise IndexError("PriorityWaiting sólo expone la cabeza ([0])")
+        return self._pq.peek()[1]
+
+    def __contains__(self, job: Job) -> bool:
+        return job.job_id in self._pq
+
+    def __len__(self) -> int:
+        return len(self._pq)
+
+    def __bool__(self) -> bool:
+        return bool(self._pq)
+
+
+def waiting_factory(discipline: str = "FCFS") -> Callable[[], Any]:
+    """
+    Constructor de cola de espera por disciplina:
+      FCFS  → deque (orden de llegada)
+      EDD   → due más temprano primero (Earliest Due Date)
+      SPT   → servicio más corto primero (Shortest Processing Time)
+      SLACK → menor holgura (due − servicio) primero
+    """
+    if discipline == "FCFS":
+        return deque
+    key = _PRIORITY_KEYS.get(discipline)
+    if key is None:
+        raise ValueError(f"Disciplina de cola no soportada: {discipline} (usa {', '.join(QUEUE_DISCIPLINES)})")
+    return lambda: PriorityWaiting(key)
+
+
+class ZoneQueues:
+    """
+    Colas de espera por zona de picking (despacho zona-paralelo).
+
+    - Cada zona tiene su propia cola; la clave None es la cola compartida
+      (jobs sin zona o de zonas que ningún picker atiende).
+    - Un picker de zona toma de su zona y, si está vacía, de la compartida.
+    - Un picker flotante (zona None) toma de la compartida y, si está vacía,
+      de la cola cuya cabeza lleva más tiempo esperando.
+    Expone append/len/bool como el deque global para no cambiar el motor.
+    factory arma la cola de cada zona (deque o PriorityWaiting, ver waiting_factory);
+    con prioridad, "cabeza" es el job más prioritario de cada zona.
+    """
+
+    def __init__(self, zones: Iterable[Optional[str]], factory: Callable[[], Deque[Job]] = deque):
+        self._q: Dict[Optional[str], Deque[Job]] = {None: factory()}
+        for z in zones:
+            if z not in self._q:
+                self._q[z] = factory()
+        self._n = 0
+
+    def append(self, job: Job) -> None:
+        key = job.zone if job.zone in self._q else None
+        self._q[key].append(job)
+        self._n += 1
+
+    def _pop(self, key: Optional[str]) -> Optional[Job]:
+        q = self._q.get(key)
+        if not q:
+            return None
+        self._n -= 1
+        return q.popleft()
+
+    def pop_for(self, zone: Optional[str]) -> Optional[Job]:
+        if zone is not None:
+            return self._pop(zone) or self._pop(None)
+        job = self._pop(None)
+        if job is not None:
+            return job
+        heads = [(q[0].arrival_min, k) for k, q in self._q.items() if q]
+        if not heads:
+            return None
+        _, key = min(heads, key=lambda h: h[0])
+        return self._pop(key)
+
+    def copy(self) -> "ZoneQueues":
+        zq = ZoneQueues.__new__(ZoneQueues)
+        zq._q = {k: q.copy() for k, q in self._q.items()}
+        zq._n = self._n
+        return zq
+
+    def lengths(self) -> Dict[Optional[str], int]:
+        return {k: len(q) for k, q in self._q.items()}
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __bool__(self) -> bool:
+        return self._n > 0
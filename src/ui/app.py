@@ -15,10 +15,10 @@ import customtkinter as ctk
 
 # ---- paths del proyecto ----
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
-from src.warehouse.grid import WarehouseGrid
-from src.warehouse.sku_map import SKUPlacement
-from src.demand.generator import make_orders
-from src.sim.engine import Simulator, SimConfig
+from src.sim.engine import SimConfig
+from src.warehouse.dist_cache import enable_disk_cache
+from src.ui.cache import SIM_CACHE
+from src.visual.series import analysis_arrays
 
 # ----------------- helpers de dibujo -----------------
 def _draw_grid(ax, w: int, h: int):
@@ -40,16 +40,17 @@ def _plot_frame(ax, meta: dict, pickers: List[dict]):
     if obstacles:
         ox, oy = zip(*obstacles)
         ax.scatter(ox, oy, marker='s', s=90, alpha=0.25)
-    ax.scatter([station[0]], [station[1]], marker='o', s=120, edgecolors='k', linewidths=1.2)
+    stations = [(s["x"], s["y"]) for s in meta.get("stations", [])] or [station]
+    sx, sy = zip(*stations)
+    ax.scatter(sx, sy, marker='o', s=120, edgecolors='k', linewidths=1.2)
     for p in pickers:
         ax.scatter([p["x"]], [p["y"]], s=80)
         ax.text(p["x"] + 0.15, p["y"] - 0.15, f"P{p['picker_id']}", fontsize=8)
 
 # ----------------- simulación -----------------
-def _build_trace_from_config(policy, n_pickers, speed_m, congestion, batch_size, time_thr, seed, horizon):
-    grid = WarehouseGrid(WarehouseGrid.default_spec())
-    placement = SKUPlacement.random_sample(grid, n_skus=120, seed=seed)
-    orders = make_orders(seed=seed, horizon=horizon, lam=1.0, popularity="uniforme")[2]
+def _build_trace_from_config(policy, n_pickers, speed_m, congestion, batch_size, time_thr, seed, horizon,
+                             lam=1.0, popularity="uniforme", n_skus=120):
+    # entorno (grilla, SKUs, pedidos, jobs) y corrida memorizados: re-simular lo mismo es instantáneo
     cfg = SimConfig(
         policy=policy,
         n_pickers=n_pickers,
@@ -58,22 +59,10 @@ def _build_trace_from_config(policy, n_pickers, speed_m, congestion, batch_size,
         batch_size=batch_size,
         time_threshold_min=time_thr,
         horizon_min=horizon,
-        round_dt=0.25
+        round_dt=0.25,
+        heatmap=True,
     )
-    sim = Simulator(grid, placement, orders, cfg)
-    res = sim.run()
-    # ⬇️ Adjunta analytics al resultado que usa la UI
-    if hasattr(sim, "analytics"):
-        setattr(res, "analytics", sim.analytics)
-
-    spec = grid.spec
-    meta = {
-        "width": int(spec["width"]),
-        "height": int(spec["height"]),
-        "station": {"x": int(spec["station"]["x"]), "y": int(spec["station"]["y"])},
-        "obstacles": [list(o) for o in (spec.get("obstacles", []) or [])],
-    }
-    return res, meta, sim.trace_frames
+    return SIM_CACHE.run(cfg, seed, horizon, lam=lam, popularity=popularity, n_skus=n_skus)
 
 # ====================== UI ======================
 POLICY_HELP = {
@@ -87,6 +76,10 @@ POLICY_HELP = {
     "Batching_Time": (
         "Agrupa por ventana temporal (time_threshold_min) y lanza el tour."
     ),
+    "Batching_Proximity": (
+        "En cada ventana (time_threshold_min) junta órdenes cercanas por ahorro de recorrido,\n"
+        "hasta batch_size órdenes por tour."
+    ),
 }
 
 class App(ctk.CTk):
@@ -133,7 +126,7 @@ class App(ctk.CTk):
         self._frame_policy, self.policy_cb = self._labeled_combobox(
             parent=self.sidebar,
             label="Modo de simulación",
-            values=["Secuencial_FCFS", "Batching_Size", "Batching_Time"],
+            values=["Secuencial_FCFS", "Batching_Size", "Batching_Time", "Batching_Proximity"],
             variable=self.policy_var,
             command=lambda _: self._on_policy_change()
         )
@@ -145,7 +138,7 @@ class App(ctk.CTk):
 
         self.frame_npick, self.npick_slider, self.npick_val = self._slider(self.sidebar, "# Pickers", 1, 3, 1, 1)
         self.cong_var = ctk.StringVar(value="off")
-        self._frame_cong, self.cong_cb = self._labeled_combobox(self.sidebar, "Congestión", ["off", "light"], self.cong_var)
+        self._frame_cong, self.cong_cb = self._labeled_combobox(self.sidebar, "Congestión", ["off", "light", "aisle"], self.cong_var)
         self.cong_cb.set("off")
         self.frame_speedm, self.speedm_slider, self.speedm_val = self._slider(self.sidebar, "Velocidad (m/min)", 20, 120, 60, 5)
         self.frame_horizon, self.horizon_slider, self.horizon_val = self._slider(self.sidebar, "Horizonte (min)", 30, 240, 120, 10)
@@ -248,12 +241,13 @@ class App(ctk.CTk):
              "Espera prom. (min)", "P95 espera (min)", "Utilización prom.", "Recorrido/prom (m/ped)"]
         )]
 
-        # Panel de gráficas (4)
+        # Panel de gráficas (4 + mapa de calor)
         charts = ctk.CTkFrame(self.tab_ana)
         charts.grid(row=1, column=0, sticky="nsew", padx=8, pady=8)
         for i in range(2):
             charts.columnconfigure(i, weight=1)
             charts.rowconfigure(i, weight=1)
+        charts.columnconfigure(2, weight=1)
 
         # 1) Cola
         self.fig_q = Figure(figsize=(3.2, 2.2), dpi=100)
@@ -279,6 +273,12 @@ class App(ctk.CTk):
         self.can_h = FigureCanvasTkAgg(self.fig_h, master=charts)
         self.can_h.get_tk_widget().grid(row=1, column=1, sticky="nsew", padx=6, pady=6)
 
+        # 5) Mapa de calor del piso (tránsito + picks)
+        self.fig_m = Figure(figsize=(3.2, 4.4), dpi=100)
+        self.ax_m = self.fig_m.add_subplot(111)
+        self.can_m = FigureCanvasTkAgg(self.fig_m, master=charts)
+        self.can_m.get_tk_widget().grid(row=0, column=2, rowspan=2, sticky="nsew", padx=6, pady=6)
+
     # ---- Helpers UI ----
     def _separator(self, parent, pady=10):
         sep = ctk.CTkFrame(parent, height=1)
@@ -347,9 +347,9 @@ class App(ctk.CTk):
         except Exception: pass
 
         pol = self.policy_var.get()
-        if pol == "Batching_Size":
+        if pol in ("Batching_Size", "Batching_Proximity"):
             self.frame_batchsize.pack(padx=14, pady=6, fill="x")
-        elif pol == "Batching_Time":
+        if pol in ("Batching_Time", "Batching_Proximity"):
             self.frame_timethr.pack(padx=14, pady=6, fill="x")
 
     def _set_help_text(self, text: str):
@@ -375,6 +375,9 @@ class App(ctk.CTk):
         elif policy == "Batching_Time":
             time_thr = float(self.timethr_slider.get())
             batch_size = 0
+        elif policy == "Batching_Proximity":
+            batch_size = int(round(self.batchsize_slider.get()))
+            time_thr = float(self.timethr_slider.get())
         else:
             batch_size, time_thr = 0, 0.0
 
@@ -526,116 +529,98 @@ class App(ctk.CTk):
         for sp in ax.spines.values():
             sp.set_alpha(0.4)
 
-    def _freedman_diaconis_bins(self, data):
-        # Regla FD: 2 * IQR / n^(1/3)
-        import numpy as np
-        data = np.asarray(list(data), dtype=float)
-        data = data[np.isfinite(data)]
-        if data.size < 2:
-            return 5
-        iqr = np.subtract(*np.percentile(data, [75, 25]))
-        if iqr <= 0:
-            return min(15, max(5, int(np.sqrt(len(data)))))
-        bw = 2.0 * iqr / (len(data) ** (1/3))
-        rng = data.max() - data.min()
-        if bw <= 0 or rng <= 0:
-            return min(15, max(5, int(np.sqrt(len(data)))))
-        return max(5, int(np.ceil(rng / bw)))
+    @staticmethod
+    def _px_width(fig) -> int:
+        return max(50, int(fig.get_figwidth() * fig.dpi))
 
     # ======= dibujar panel de análisis =======
     def _draw_analysis(self):
         """
-        Dibuja:
-        1) Cola (jobs) vs tiempo [step]
-        2) Órdenes acumuladas (curva S)
-        3) Gantt por picker (broken_barh)
-        4) Histograma de esperas (+ P95)
-        Espera que self.res tenga un dict 'analytics' con llaves típicas;
-        si alguna falta, el gráfico se omite con mensaje suave.
+        Dibuja, desde arrays pre-agregados (src/visual/series.py, una vez por corrida):
+        1) Cola (jobs) vs tiempo [step decimado min/max al ancho en píxeles]
+        2) Órdenes acumuladas (curva S, ídem)
+        3) Gantt por picker (una sola PolyCollection)
+        4) Histograma de esperas pre-binneado en el motor (+ P95)
+        5) Mapa de calor: tránsito por celda + celdas con más picks
+        El costo no crece con el largo de la corrida; si falta algún dato,
+        el gráfico se omite con mensaje suave.
         """
         import numpy as np
+        from matplotlib.collections import PolyCollection
 
-        an = getattr(self.res, "analytics", {}) or {}
+        arr = analysis_arrays(self.res)
 
         # ---------- 1) Cola (jobs) vs tiempo ----------
         self.ax_q.cla()
-        t_q = an.get("queue_t") or an.get("queue", {}).get("t", [])
-        q_q = an.get("queue_q") or an.get("queue", {}).get("q", [])
-        if t_q and q_q:
-            self.ax_q.step(t_q, q_q, where="post")
-            ymax = max(1, int(np.nanmax(q_q)))
-            self.ax_q.set_ylim(0, ymax + 0.5)
-            self._fmt_ax(self.ax_q, "Cola (jobs) vs tiempo", "min", "# en cola")
+        if arr.queue is not None:
+            x, y = arr.queue.decimate(self._px_width(self.fig_q))
+            self.ax_q.plot(x, y, linewidth=1.0)
+            self.ax_q.set_ylim(0, max(1, int(np.nanmax(y))) + 0.5)
         else:
             self.ax_q.text(0.5, 0.5, "Sin datos de cola", ha="center", va="center")
-            self._fmt_ax(self.ax_q, "Cola (jobs) vs tiempo", "min", "# en cola")
+        self._fmt_ax(self.ax_q, "Cola (jobs) vs tiempo", "min", "# en cola")
         self.can_q.draw_idle()
 
         # ---------- 2) Órdenes acumuladas ----------
         self.ax_c.cla()
-        t_c = an.get("completed_t") or an.get("completed", {}).get("t", [])
-        y_c = an.get("completed_y") or an.get("completed", {}).get("y", [])
-        if t_c and y_c:
-            self.ax_c.step(t_c, y_c, where="post")
-            self._fmt_ax(self.ax_c, "Órdenes acumuladas", "min", "completadas")
+        if arr.completed is not None:
+            x, y = arr.completed.decimate(self._px_width(self.fig_c))
+            self.ax_c.plot(x, y, linewidth=1.0)
         else:
             self.ax_c.text(0.5, 0.5, "Sin datos de completadas", ha="center", va="center")
-            self._fmt_ax(self.ax_c, "Órdenes acumuladas", "min", "completadas")
+        self._fmt_ax(self.ax_c, "Órdenes acumuladas", "min", "completadas")
         self.can_c.draw_idle()
 
         # ---------- 3) Gantt por picker ----------
         self.ax_g.cla()
-        # Acepta dos formatos:
-        # an["gantt"] = { pid: [(start, dur), ...], ... }
-        # o an["gantt"]["per_picker"] / an["gantt_bars"]
-        gantt = an.get("gantt", {})
-        if isinstance(gantt, dict) and ("per_picker" in gantt or any(isinstance(v, list) for v in gantt.values())):
-            # Normaliza a dict {pid: [(start, dur), ...]}
-            if "per_picker" in gantt:
-                per = gantt["per_picker"]
-                if isinstance(per, list):
-                    gantt_dict = {i: lst for i, lst in enumerate(per)}
-                else:
-                    gantt_dict = dict(per)
-            else:
-                gantt_dict = {int(pid): bars for pid, bars in gantt.items() if isinstance(bars, list)}
-            # broken_barh por fila
-            y0, h = 10, 8
-            yticks, ylabels = [], []
-            for row, pid in enumerate(sorted(gantt_dict.keys())):
-                bars = [(float(start), float(dur)) for (start, dur) in gantt_dict[pid] if float(dur) > 0]
-                if not bars:
-                    continue
-                ybase = y0 + row * (h + 6)
-                self.ax_g.broken_barh(bars, (ybase, h))
-                yticks.append(ybase + h/2)
-                ylabels.append(f"P{pid}")
+        if arr.gantt is not None and arr.gantt.n_bars():
+            verts, yticks, ylabels = arr.gantt.verts(self._px_width(self.fig_g))
+            self.ax_g.add_collection(PolyCollection(verts, facecolors="C0", edgecolors="none"))
+            self.ax_g.set_xlim(arr.gantt.t_min, max(arr.gantt.t_max, arr.gantt.t_min + 1e-9))
+            self.ax_g.set_ylim(0, max(yticks) + 10)
             self.ax_g.set_yticks(yticks)
             self.ax_g.set_yticklabels(ylabels)
-            self._fmt_ax(self.ax_g, "Gantt por picker", "min", "")
         else:
             self.ax_g.text(0.5, 0.5, "Sin datos de Gantt", ha="center", va="center")
-            self._fmt_ax(self.ax_g, "Gantt por picker", "min", "")
+        self._fmt_ax(self.ax_g, "Gantt por picker", "min", "")
         self.can_g.draw_idle()
 
         # ---------- 4) Histograma de esperas ----------
         self.ax_h.cla()
-        waits = an.get("waits") or an.get("wait_times") or []
-        waits = [w for w in waits if np.isfinite(w) and w >= 0]
-        if len(waits) >= 1:
-            nb = self._freedman_diaconis_bins(waits)
-            self.ax_h.hist(waits, bins=nb)
-            # Línea P95
-            p95 = float(np.percentile(waits, 95)) if len(waits) >= 2 else float(waits[0])
-            self.ax_h.axvline(p95, linestyle="--")
-            self.ax_h.legend([f"P95 = {p95:.2f}"], loc="best", framealpha=0.3)
-            self._fmt_ax(self.ax_h, "Histograma de esperas", "min", "# pedidos")
+        hist = arr.waits
+        if hist is not None:
+            counts, edges = hist.trimmed()
+            self.ax_h.stairs(counts, edges, fill=True)
+            # Línea P95 (exacta si la corrida la trae; si no, interpolada en el histograma)
+            p95 = getattr(self.res, "wait_p95_min", None)
+            p95 = float(p95) if p95 is not None else hist.quantile(0.95)
+            self.ax_h.axvline(p95, linestyle="--", label=f"P95 = {p95:.2f}")
+            self.ax_h.legend(loc="best", framealpha=0.3)
         else:
             self.ax_h.text(0.5, 0.5, "Sin datos de esperas", ha="center", va="center")
-            self._fmt_ax(self.ax_h, "Histograma de esperas", "min", "# pedidos")
+        self._fmt_ax(self.ax_h, "Histograma de esperas", "min", "# pedidos")
         self.can_h.draw_idle()
 
+        # ---------- 5) Mapa de calor ----------
+        self.ax_m.cla()
+        hm = getattr(self.res, "heatmap", None)
+        if hm is not None and hm.jobs:
+            trav = np.ma.masked_equal(hm.traversal.astype(float), 0.0)
+            self.ax_m.imshow(np.log1p(trav), cmap="inferno", interpolation="nearest")
+            top = hm.hottest("picks", 10)
+            if top:
+                self.ax_m.scatter([x for x, _, _ in top], [y for _, y, _ in top], marker="s", s=30,
+                                  facecolors="none", edgecolors="cyan", linewidths=1.0)
+            self.ax_m.set_xticks([])
+            self.ax_m.set_yticks([])
+            self.ax_m.set_title("Tránsito (log) · top 10 picks", fontsize=12, pad=8)
+        else:
+            self.ax_m.text(0.5, 0.5, "Sin mapa de calor", ha="center", va="center")
+            self._fmt_ax(self.ax_m, "Mapa de calor")
+        self.can_m.draw_idle()
+
 
 if __name__ == "__main__":
+    enable_disk_cache()   # distancias persistentes entre sesiones (WAREHOUSE_DIST_CACHE)
     app = App()
     app.mainloop()
@@ -0,0 +1,175 @@
+# src/ui/cache.py
+"""
+Caches de la UI (sin Tk: se puede usar y testear headless).
+
+  - entornos (grilla + placement + pedidos + JobCache) por (seed, horizonte, λ,
+    popularidad, n_skus): cambiar sólo la política o los pickers no regenera nada,
+    y los planes de batching / paths ya ruteados se reutilizan entre corridas;
+  - corridas completas (SimResult, meta, timeline) por hash de la config entera:
+    volver a una config ya simulada es instantáneo.
+Ambos son LRU acotados por memoria (bytes estimados), no por cantidad.
+"""
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import hashlib
+import json
+import sys
+import numpy as np
+
+_SAMPLE = 64          # listas/dicts largos: se estima con una muestra
+
+
+def nbytes_of(obj: Any, _depth: int = 0) -> int:
+    """Tamaño aproximado en bytes (arrays por nbytes; contenedores largos por muestreo)."""
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes) + 112
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return sys.getsizeof(obj)
+    if _depth > 8:
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        items = list(obj.items()) if len(obj) <= _SAMPLE else [kv for _, kv in zip(range(_SAMPLE), obj.items())]
+        per = sum(nbytes_of(k, _depth + 1) + nbytes_of(v, _depth + 1) for k, v in items)
+        return sys.getsizeof(obj) + (per * len(obj) // max(len(items), 1))
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        seq = list(obj) if len(obj) <= _SAMPLE else [obj[i] for i in np.linspace(0, len(obj) - 1, _SAMPLE).astype(int)] \
+            if isinstance(obj, (list, tuple)) else list(obj)[:_SAMPLE]
+        per = sum(nbytes_of(x, _depth + 1) for x in seq)
+        return sys.getsizeof(obj) + (per * len(obj) // max(len(seq), 1))
+    d = getattr(obj, "__dict__", None)
+    if d is not None:
+        return sys.getsizeof(obj) + nbytes_of(d, _depth + 1)
+    return sys.getsizeof(obj)
+
+
+class SizedLRU:
+    """LRU por memoria: al superar max_bytes se desalojan las entradas menos usadas."""
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = nbytes_of):
+        self.max_bytes = int(max_bytes)
+        self.sizeof = sizeof
+        self._d: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self._d
+
+    def __len__(self) -> int:
+        return len(self._d)
+
+    def get(self, key, default=None):
+        hit = self._d.get(key)
+        if hit is None:
+            self.misses += 1
+            return default
+        self._d.move_to_end(key)
+        self.hits += 1
+        return hit[0]
+
+    def put(self, key, value, nbytes: Optional[int] = None) -> None:
+        if key in self._d:
+            self.total_bytes -= self._d.pop(key)[1]
+        size = int(self.sizeof(value) if nbytes is None else nbytes)
+        if size > self.max_bytes:
+            return                               # no entra ni solo: no se cachea
+        self._d[key] = (value, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, (_, s) = self._d.popitem(last=False)
+            self.total_bytes -= s
+
+    def get_or_build(self, key, build: Callable[[], Any]):
+        hit = self._d.get(key)
+        if hit is not None:
+            self._d.move_to_end(key)
+            self.hits += 1
+            return hit[0]
+        self.misses += 1
+        value = build()
+        self.put(key, value)
+        return value
+
+    def refresh(self, key) -> None:
+        """Re-mide una entrada que creció en el lugar (p.ej. un JobCache que acumuló planes)."""
+        hit = self._d.get(key)
+        if hit is None:
+            return
+        self.put(key, hit[0])
+        if key in self._d:
+            self._d.move_to_end(key)
+
+    def clear(self) -> None:
+        self._d.clear()
+        self.total_bytes = 0
+
+
+# ------------------------------ entornos y corridas ------------------------------
+
+ENV_CACHE_BYTES = 256 * 1024 * 1024
+RUN_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def env_key(seed: int, horizon: float, lam: float, popularity: str, n_skus: int) -> Tuple:
+    return (int(seed), float(horizon), float(lam), str(popularity), int(n_skus))
+
+
+def config_hash(env: Tuple, cfg) -> str:
+    """Hash estable de (entorno, SimConfig completa)."""
+    payload = {"env": list(env), "cfg": asdict(cfg) if is_dataclass(cfg) else dict(cfg)}
+    blob = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha1(blob).hexdigest()
+
+
+def build_env(seed: int, horizon: float, lam: float = 1.0, popularity: str = "uniforme", n_skus: int = 120):
+    """(grid, placement, orders, JobCache) como los arma la UI."""
+    from src.warehouse.grid import WarehouseGrid
+    from src.warehouse.sku_map import SKUPlacement
+    from src.warehouse.dist_cache import attach_router
+    from src.demand.generator import make_orders
+    from src.sim.job_cache import JobCache
+
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    placement = SKUPlacement.random_sample(grid, n_skus=n_skus, seed=seed)
+    attach_router(grid, placement)   # con el cache en disco habilitado (app) re-abrir no re-calcula BFS
+    orders = make_orders(seed=seed, horizon=horizon, lam=lam, n_skus=n_skus, popularity=popularity)[2]
+    return grid, placement, orders, JobCache(orders, grid, placement)
+
+
+class SimCache:
+    """Entornos + corridas memorizadas para la UI."""
+
+    def __init__(self, env_bytes: int = ENV_CACHE_BYTES, run_bytes: int = RUN_CACHE_BYTES):
+        self.envs = SizedLRU(env_bytes)
+        self.runs = SizedLRU(run_bytes)
+
+    def env(self, seed: int, horizon: float, lam: float = 1.0, popularity: str = "uniforme", n_skus: int = 120):
+        key = env_key(seed, horizon, lam, popularity, n_skus)
+        return self.envs.get_or_build(key, lambda: build_env(*key))
+
+    def run(self, cfg, seed: int, horizon: float, lam: float = 1.0, popularity: str = "uniforme",
+            n_skus: int = 120) -> Tuple[Any, Dict[str, Any], list]:
+        """(SimResult con .analytics, meta, trace_frames); tratar como sólo lectura."""
+        key = env_key(seed, horizon, lam, popularity, n_skus)
+        h = config_hash(key, cfg)
+        return self.runs.get_or_build(h, lambda: self._simulate(cfg, *key))
+
+    def _simulate(self, cfg, seed, horizon, lam, popularity, n_skus):
+        from src.sim.engine import Simulator
+        from src.visual.export import meta_for_grid
+        key = env_key(seed, horizon, lam, popularity, n_skus)
+        grid, placement, orders, jobs_cache = self.env(*key)
+        jobs, paths = jobs_cache.for_config(cfg)
+        sim = Simulator(grid, placement, orders, cfg, jobs=jobs, path_cache=paths)
+        res = sim.run()
+        self.envs.refresh(key)           # el JobCache sumó plan/paths: puede desalojar otros entornos
+        # ⬇️ Adjunta analytics al resultado que usa la UI
+        if hasattr(sim, "analytics"):
+            setattr(res, "analytics", sim.analytics)
+        return res, meta_for_grid(grid), sim.trace_frames
+
+
+# una por proceso (la UI es una sola ventana)
+SIM_CACHE = SimCache()
@@ -0,0 +1,269 @@
+# src/visual/export.py
+"""
+Export headless de trazas a video / GIF / secuencia PNG (backend Agg, sin Tk).
+
+  1) la traza (trace_frames del motor, o {meta, timeline} de dump_trace, donde cada
+     frame puede traer sólo los pickers que cambiaron) se pasa a arrays y se re-muestrea
+     a paso fijo dt (minutos de simulación por frame);
+  2) los frames se reparten en rangos contiguos entre procesos; cada worker arma UNA
+     figura Agg, dibuja el fondo (grilla, racks, estaciones) una vez y por frame sólo
+     restaura el fondo y redibuja los pickers (blit); escribe PNGs numerados;
+  3) se codifica con ffmpeg (binario en PATH o el de imageio-ffmpeg), imageio, o
+     Pillow para GIF; si no hay encoder para el formato, queda la secuencia PNG.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import json
+import os
+import shutil
+import subprocess
+import numpy as np
+
+FRAME_PATTERN = "frame_%06d.png"
+
+
+@dataclass
+class FrameArrays:
+    """Traza re-muestreada: t (F,), xy (F, P, 2) float32 (NaN = sin dato), moving (F, P)."""
+    t: np.ndarray
+    xy: np.ndarray
+    moving: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def slice(self, lo: int, hi: int) -> "FrameArrays":
+        return FrameArrays(self.t[lo:hi], self.xy[lo:hi], self.moving[lo:hi])
+
+
+@dataclass
+class RenderStyle:
+    width_px: int = 800
+    dpi: int = 100
+    show_grid: bool = True
+    labels: bool = True
+    clock: bool = True
+
+
+# ------------------------------ trazas ------------------------------
+
+def meta_for_grid(grid) -> Dict[str, Any]:
+    """Meta con el formato que usa la UI (ancho, alto, estaciones y obstáculos)."""
+    spec = grid.spec
+    return {
+        "width": int(spec["width"]),
+        "height": int(spec["height"]),
+        "station": {"x": int(spec["station"]["x"]), "y": int(spec["station"]["y"])},
+        "stations": [{"x": x, "y": y} for (x, y) in grid.stations_xy],
+        "obstacles": [list(o) for o in (spec.get("obstacles", []) or [])],
+    }
+
+
+def load_trace(path) -> Tuple[Dict[str, Any], List[dict]]:
+    """Lee un JSON {meta, timeline} (dump_trace) → (meta, frames)."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data["meta"], data.get("timeline") or data.get("frames") or []
+
+
+def frames_to_arrays(frames: Sequence[dict], dt: Optional[float] = 0.25,
+                     max_frames: Optional[int] = None) -> FrameArrays:
+    """
+    Frames (completos o delta) → arrays. Cada picker mantiene su última posición
+    conocida. Con dt se re-muestrea a t = 0, dt, 2·dt, … (None = tiempos originales).
+    """
+    n_p = 1 + max((int(p["picker_id"]) for fr in frames for p in fr.get("pickers", [])), default=-1)
+    F = len(frames)
+    t = np.fromiter((float(fr["t"]) for fr in frames), dtype=np.float64, count=F)
+    xy = np.full((F, max(n_p, 0), 2), np.nan, dtype=np.float32)
+    moving = np.zeros((F, max(n_p, 0)), dtype=bool)
+    last_xy = np.full((max(n_p, 0), 2), np.nan, dtype=np.float32)
+    last_mv = np.zeros(max(n_p, 0), dtype=bool)
+    for i, fr in enumerate(frames):
+        for p in fr.get("pickers", []):
+            pid = int(p["picker_id"])
+            last_xy[pid] = (p["x"], p["y"])
+            last_mv[pid] = p.get("state", "moving") != "idle"
+        xy[i] = last_xy
+        moving[i] = last_mv
+    order = np.argsort(t, kind="stable")
+    t, xy, moving = t[order], xy[order], moving[order]
+    if dt is not None and dt > 0 and F:
+        grid_t = np.arange(0.0, float(t[-1]) + 1e-9, float(dt))
+        idx = np.searchsorted(t, grid_t, side="right") - 1
+        keep = idx >= 0
+        grid_t, idx = grid_t[keep], idx[keep]
+        t, xy, moving = grid_t, xy[idx], moving[idx]
+    if max_frames is not None and len(t) > max_frames:
+        sel = np.linspace(0, len(t) - 1, int(max_frames)).round().astype(np.int64)
+        t, xy, moving = t[sel], xy[sel], moving[sel]
+    return FrameArrays(t, xy, moving)
+
+
+# ------------------------------ render ------------------------------
+
+class FrameRenderer:
+    """Figura Agg reutilizable: fondo estático cacheado + pickers por blit."""
+
+    def __init__(self, meta: Dict[str, Any], n_pickers: int, style: RenderStyle = RenderStyle()):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        w, h = int(meta["width"]), int(meta["height"])
+        fig_w = style.width_px / style.dpi
+        fig_h = max(1.0, fig_w * h / max(w, 1))
+        self.fig = Figure(figsize=(fig_w, fig_h), dpi=style.dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        ax = self.ax = self.fig.add_axes([0.0, 0.0, 1.0, 1.0])
+        ax.set_xlim(-0.5, w - 0.5)
+        ax.set_ylim(h - 0.5, -0.5)
+        ax.set_aspect("equal")
+        ax.set_axis_off()
+        if style.show_grid and max(w, h) <= 120:
+            ax.vlines(np.arange(-0.5, w, 1), -0.5, h - 0.5, linewidth=0.4, color="0.85")
+            ax.hlines(np.arange(-0.5, h, 1), -0.5, w - 0.5, linewidth=0.4, color="0.85")
+        obstacles = np.asarray(meta.get("obstacles") or [], dtype=np.int64).reshape(-1, 2)
+        if len(obstacles):
+            blocked = np.zeros((h, w), dtype=np.float32)
+            blocked[obstacles[:, 1], obstacles[:, 0]] = 1.0
+            ax.imshow(np.ma.masked_equal(blocked, 0.0), cmap="Greys", vmin=0, vmax=2.5,
+                      interpolation="nearest", extent=(-0.5, w - 0.5, h - 0.5, -0.5))
+        st = [(s["x"], s["y"]) for s in meta.get("stations", [])] or [(meta["station"]["x"], meta["station"]["y"])]
+        ax.scatter([x for x, _ in st], [y for _, y in st], marker="o", s=120, edgecolors="k", linewidths=1.2,
+                   zorder=3)
+        size = max(8.0, min(80.0, 8000.0 / max(w, h)))
+        self.dots = ax.scatter(np.zeros(n_pickers), np.zeros(n_pickers), s=size, zorder=4,
+                               c=np.arange(n_pickers) % 10, cmap="tab10", vmin=0, vmax=9, animated=True)
+        self.labels = [ax.text(0, 0, f"P{i}", fontsize=7, animated=True, zorder=5)
+                       for i in range(n_pickers if style.labels and n_pickers <= 40 else 0)]
+        self.clock = ax.text(0.01, 0.99, "", transform=ax.transAxes, va="top", fontsize=9,
+                             animated=True, zorder=5) if style.clock else None
+        self.canvas.draw()
+        self._bg = self.canvas.copy_from_bbox(self.fig.bbox)
+
+    def render(self, t: float, xy: np.ndarray, moving: np.ndarray) -> np.ndarray:
+        """Frame RGB (alto, ancho, 3) uint8."""
+        self.canvas.restore_region(self._bg)
+        ok = ~np.isnan(xy[:, 0])
+        self.dots.set_offsets(np.where(ok[:, None], xy, -10.0))
+        self.ax.draw_artist(self.dots)
+        for i, lab in enumerate(self.labels):
+            if ok[i]:
+                lab.set_position((xy[i, 0] + 0.15, xy[i, 1] - 0.15))
+                self.ax.draw_artist(lab)
+        if self.clock is not None:
+            self.clock.set_text(f"t = {t:7.2f} min · moviendo {int(moving.sum())}/{len(moving)}")
+            self.ax.draw_artist(self.clock)
+        return np.asarray(self.canvas.buffer_rgba())[..., :3].copy()
+
+
+def _save_png(path: Path, rgb: np.ndarray) -> None:
+    from PIL import Image
+    Image.fromarray(rgb).save(path, compress_level=1)
+
+
+def _render_chunk(meta: Dict[str, Any], frames: FrameArrays, start: int, out_dir: str,
+                  style: RenderStyle) -> int:
+    """Worker: renderiza frames[start:start+len] en out_dir/frame_<i>.png."""
+    out = Path(out_dir)
+    r = FrameRenderer(meta, frames.xy.shape[1], style)
+    for k in range(len(frames)):
+        _save_png(out / (FRAME_PATTERN % (start + k)), r.render(float(frames.t[k]), frames.xy[k], frames.moving[k]))
+    return len(frames)
+
+
+def render_frames(meta: Dict[str, Any], frames: FrameArrays, out_dir, procs: int = 1,
+                  style: RenderStyle = RenderStyle()) -> List[Path]:
+    """PNGs numerados en out_dir, rangos contiguos repartidos en `procs` procesos."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n = len(frames)
+    procs = max(1, min(int(procs), n or 1))
+    bounds = np.linspace(0, n, procs + 1).round().astype(int).tolist()
+    if procs == 1:
+        _render_chunk(meta, frames, 0, str(out_dir), style)
+    else:
+        with ProcessPoolExecutor(max_workers=procs) as ex:
+            futs = [ex.submit(_render_chunk, meta, frames.slice(lo, hi), lo, str(out_dir), style)
+                    for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+            for f in futs:
+                f.result()
+    return [out_dir / (FRAME_PATTERN % i) for i in range(n)]
+
+
+# ------------------------------ encode ------------------------------
+
+def find_ffmpeg() -> Optional[str]:
+    exe = shutil.which("ffmpeg")
+    if exe:
+        return exe
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+def encode(png_dir, out_path, fps: float = 20.0) -> Optional[Path]:
+    """
+    Codifica la secuencia PNG a out_path (.mp4 / .gif / …). Devuelve la ruta escrita,
+    o None si no hay encoder para ese formato (queda la secuencia PNG).
+    """
+    png_dir, out_path = Path(png_dir), Path(out_path)
+    files = sorted(png_dir.glob("frame_*.png"))
+    if not files:
+        return None
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    ext = out_path.suffix.lower()
+    exe = find_ffmpeg()
+    if exe:
+        args = [exe, "-y", "-loglevel", "error", "-framerate", str(fps), "-i", str(png_dir / FRAME_PATTERN)]
+        if ext == ".gif":
+            args += ["-vf", "split[a][b];[a]palettegen[p];[b][p]paletteuse"]
+        else:
+            args += ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+        subprocess.run(args + [str(out_path)], check=True)
+        return out_path
+    try:
+        import imageio.v2 as imageio
+        with imageio.get_writer(out_path, fps=fps) as w:
+            for f in files:
+                w.append_data(imageio.imread(f))
+        return out_path
+    except ImportError:
+        pass
+    if ext == ".gif":
+        from PIL import Image
+        frames = (Image.open(f).convert("P", palette=Image.ADAPTIVE) for f in files)
+        first = next(frames)
+        first.save(out_path, save_all=True, append_images=list(frames), duration=int(1000 / fps), loop=0)
+        return out_path
+    return None
+
+
+def export_video(meta: Dict[str, Any], frames: Sequence[dict], out_path, fps: float = 20.0,
+                 dt: Optional[float] = 0.25, procs: Optional[int] = None, max_frames: Optional[int] = None,
+                 style: RenderStyle = RenderStyle(), keep_png: bool = False) -> Tuple[Path, int]:
+    """
+    Traza → video. out_path con extensión .mp4/.gif (o un directorio: sólo PNGs).
+    Devuelve (ruta final, frames). Sin encoder disponible, la ruta es el directorio PNG.
+    """
+    out_path = Path(out_path)
+    arrays = frames_to_arrays(frames, dt=dt, max_frames=max_frames)
+    if procs is None:
+        procs = os.cpu_count() or 1
+    png_only = out_path.suffix == ""
+    png_dir = out_path if png_only else out_path.with_name(out_path.stem + "_frames")
+    if png_dir.exists() and not png_only:
+        shutil.rmtree(png_dir)
+    render_frames(meta, arrays, png_dir, procs=procs, style=style)
+    if png_only:
+        return png_dir, len(arrays)
+    written = encode(png_dir, out_path, fps=fps)
+    if written is None:
+        return png_dir, len(arrays)
+    if not keep_png:
+        shutil.rmtree(png_dir, ignore_errors=True)
+    return written, len(arrays)
@@ -6,7 +6,9 @@ from collections import defaultdict
 # ---------- Helpers robustos para el layout ----------
 
 def _station(grid) -> Tuple[int, int]:
-    # grid.spec.packing_station → grid.packing_xy → (0,0)
+    # grid.station_xy → grid.spec.packing_station → grid.packing_xy → (0,0)
+    if hasattr(grid, "station_xy"):
+        return tuple(grid.station_xy)
     if hasattr(grid, "spec") and hasattr(grid.spec, "packing_station"):
         ps = grid.spec.packing_station
         if ps is not None:
@@ -16,6 +18,11 @@ def _station(grid) -> Tuple[int, int]:
         return (int(px[0]), int(px[1]))
     return (0, 0)
 
+def _stations(grid) -> List[Tuple[int, int]]:
+    if hasattr(grid, "stations_xy"):
+        return [tuple(s) for s in grid.stations_xy]
+    return [_station(grid)]
+
 def _size(grid) -> Tuple[int, int]:
     # grid.spec.width/height → grid.width/height → fallback 30x30
     w = None
@@ -101,6 +108,7 @@ def compose_trace(grid, placement, frames: List[dict], round_dt: float = 0.25):
             "width": width,
             "height": height,
             "station": {"x": station[0], "y": station[1]},
+            "stations": [{"x": x, "y": y} for (x, y) in _stations(grid)],
             "obstacles": obstacles
         },
         "timeline": timeline
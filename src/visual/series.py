@@ -0,0 +1,209 @@
+# src/visual/series.py
+"""
+Arrays pre-agregados para la pestaña de análisis.
+
+Se arman una vez por corrida (O(N)) y después cada redibujo cuesta O(píxeles),
+no O(largo de la corrida):
+  - StepSeries: serie escalonada (cola, completadas) con una pirámide min/max por
+    bloques de 2^L muestras; decimate() devuelve a lo sumo 4 puntos por columna
+    de píxeles conservando picos y valles;
+  - GanttBars: barras por picker como arrays, pre-fusionadas a BASE_RES columnas;
+    verts() da todos los rectángulos para una sola PolyCollection;
+  - el histograma de esperas viene ya binneado del motor (sim/histogram.py).
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import math
+import numpy as np
+
+from src.sim.histogram import WaitHistogram
+
+BASE_RES = 4096        # columnas de la pre-fusión del gantt (> cualquier ancho de pantalla)
+
+
+class StepSeries:
+    """Serie escalonada (where="post") con pirámide min/max para decimar."""
+
+    def __init__(self, t, y):
+        self.t = np.asarray(t, dtype=float).ravel()
+        self.y = np.asarray(y, dtype=float).ravel()
+        if len(self.t) != len(self.y):
+            raise ValueError("t e y deben tener el mismo largo")
+        # nivel L: (t de inicio de cada bloque de 2^L muestras, min, max)
+        self._levels: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = [(self.t, self.y, self.y)]
+        mn = mx = self.y
+        step = 1
+        while len(mn) > 1:
+            if len(mn) % 2:
+                mn = np.append(mn, mn[-1])
+                mx = np.append(mx, mx[-1])
+            mn = np.minimum(mn[0::2], mn[1::2])
+            mx = np.maximum(mx[0::2], mx[1::2])
+            step *= 2
+            self._levels.append((self.t[::step], mn, mx))
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def value_at(self, t) -> np.ndarray:
+        i = np.searchsorted(self.t, np.asarray(t, dtype=float), side="right") - 1
+        return self.y[np.clip(i, 0, None)]
+
+    def decimate(self, n_px: int, t0: Optional[float] = None, t1: Optional[float] = None):
+        """(x, y) para ax.plot: escalones exactos si entran, si no min/max por columna."""
+        if len(self.t) == 0:
+            return np.empty(0), np.empty(0)
+        n_px = max(1, int(n_px))
+        t0 = float(self.t[0]) if t0 is None else float(t0)
+        t1 = float(self.t[-1]) if t1 is None else float(t1)
+        t1 = max(t1, t0)
+        i0 = int(np.searchsorted(self.t, t0, side="right"))
+        i1 = int(np.searchsorted(self.t, t1, side="right"))
+        count = i1 - i0
+        v0 = self.value_at(t0)
+        if count <= 2 * n_px:
+            x = np.concatenate([[t0], self.t[i0:i1], [t1]])
+            yy = np.concatenate([[v0], self.y[i0:i1]])
+            return np.repeat(x, 2)[1:-1], np.repeat(yy, 2)
+
+        edges = np.linspace(t0, t1, n_px + 1)
+        ve = self.value_at(edges)
+        lo = ve[:-1].copy()
+        hi = ve[:-1].copy()
+        L = min(len(self._levels) - 1, max(0, math.ceil(math.log2(count / (2 * n_px)))))
+        ts, mn, mx = self._levels[L]
+        b0, b1 = i0 >> L, ((i1 - 1) >> L) + 1
+        cols = np.clip(np.searchsorted(edges, ts[b0:b1], side="right") - 1, 0, n_px - 1)
+        np.minimum.at(lo, cols, mn[b0:b1])
+        np.maximum.at(hi, cols, mx[b0:b1])
+        mid = 0.5 * (edges[:-1] + edges[1:])
+        x = np.stack([edges[:-1], mid, mid, edges[1:]], axis=1).ravel()
+        y = np.stack([ve[:-1], lo, hi, ve[1:]], axis=1).ravel()
+        return x, y
+
+
+def merge_bars(starts: np.ndarray, ends: np.ndarray, min_gap: float):
+    """Fusiona barras (ordenadas por inicio) separadas por menos de min_gap."""
+    if len(starts) == 0:
+        return starts, ends
+    reach = np.maximum.accumulate(ends)
+    cut = np.flatnonzero(starts[1:] - reach[:-1] > min_gap) + 1
+    first = np.concatenate([[0], cut])
+    return starts[first], np.maximum.reduceat(ends, first)
+
+
+@dataclass
+class GanttBars:
+    """
+    Barras del gantt por picker: pids y, por fila, arrays de inicio / fin.
+    Se guardan crudas (para zooms finos) y pre-fusionadas a BASE_RES columnas
+    (para vistas amplias, de tamaño acotado aunque la corrida sea larga).
+    """
+    pids: List[int]
+    starts: List[np.ndarray] = field(repr=False)
+    ends: List[np.ndarray] = field(repr=False)
+    t_min: float = 0.0
+    t_max: float = 0.0
+    base_gap: float = 0.0
+    merged: List[Tuple[np.ndarray, np.ndarray]] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        if not self.merged:
+            self.merged = [merge_bars(s, e, self.base_gap) for s, e in zip(self.starts, self.ends)]
+        self._reach = [np.maximum.accumulate(e) if len(e) else e for e in self.ends]
+
+    @classmethod
+    def from_analytics(cls, gantt) -> Optional["GanttBars"]:
+        # Acepta dos formatos:
+        # gantt = { pid: [(start, dur), ...], ... }  o  gantt["per_picker"] (lista o dict)
+        if not isinstance(gantt, dict):
+            return None
+        if "per_picker" in gantt:
+            per = gantt["per_picker"]
+            per = dict(enumerate(per)) if isinstance(per, list) else dict(per)
+        else:
+            per = {int(pid): bars for pid, bars in gantt.items() if isinstance(bars, list)}
+        if not per:
+            return None
+        pids, starts, ends = [], [], []
+        for pid in sorted(per):
+            a = np.asarray(per[pid], dtype=float).reshape(-1, 2)
+            a = a[a[:, 1] > 0]
+            a = a[np.argsort(a[:, 0], kind="stable")]
+            pids.append(pid)
+            starts.append(a[:, 0])
+            ends.append(a[:, 0] + a[:, 1])
+        lo = min((s[0] for s in starts if len(s)), default=0.0)
+        hi = max((e.max() for e in ends if len(e)), default=0.0)
+        return cls(pids, starts, ends, float(lo), float(hi), (hi - lo) / BASE_RES if hi > lo else 0.0)
+
+    def n_bars(self) -> int:
+        return sum(len(s) for s in self.starts)
+
+    def verts(self, n_px: int, t0: Optional[float] = None, t1: Optional[float] = None,
+              y0: float = 10.0, h: float = 8.0, sep: float = 6.0):
+        """(verts (N, 4, 2), yticks, labels): rectángulos de todas las filas para una PolyCollection."""
+        t0 = self.t_min if t0 is None else float(t0)
+        t1 = self.t_max if t1 is None else float(t1)
+        gap = (t1 - t0) / max(1, int(n_px)) if t1 > t0 else 0.0
+        boxes, yticks, labels = [], [], []
+        for row, pid in enumerate(self.pids):
+            if self.base_gap <= gap:
+                s, e = self.merged[row]
+                keep = (e > t0) & (s < t1)
+                s, e = s[keep], e[keep]
+            else:                       # zoom más fino que la pre-fusión: tramo crudo por bisección
+                s, e = self.starts[row], self.ends[row]
+                i0 = int(np.searchsorted(self._reach[row], t0, side="right"))
+                i1 = int(np.searchsorted(s, t1, side="left"))
+                s, e = s[i0:i1], e[i0:i1]
+            if not len(s):
+                continue
+            s, e = merge_bars(s, e, gap)
+            ybase = y0 + row * (h + sep)
+            b = np.empty((len(s), 4, 2))
+            b[:, 0, 0] = b[:, 1, 0] = s
+            b[:, 2, 0] = b[:, 3, 0] = e
+            b[:, 0, 1] = b[:, 3, 1] = ybase
+            b[:, 1, 1] = b[:, 2, 1] = ybase + h
+            boxes.append(b)
+            yticks.append(ybase + h / 2)
+            labels.append(f"P{pid}")
+        verts = np.concatenate(boxes) if boxes else np.empty((0, 4, 2))
+        return verts, yticks, labels
+
+
+@dataclass
+class AnalysisArrays:
+    queue: Optional[StepSeries] = None
+    completed: Optional[StepSeries] = None
+    gantt: Optional[GanttBars] = None
+    waits: Optional[WaitHistogram] = None
+
+    @classmethod
+    def from_analytics(cls, an: Dict[str, Any]) -> "AnalysisArrays":
+        an = an or {}
+        t_q = an.get("queue_t") or an.get("queue", {}).get("t", [])
+        q_q = an.get("queue_q") or an.get("queue", {}).get("q", [])
+        t_c = an.get("completed_t") or an.get("completed", {}).get("t", [])
+        y_c = an.get("completed_y") or an.get("completed", {}).get("y", [])
+        hist = an.get("wait_hist")
+        if hist is None:
+            waits = an.get("waits") or an.get("wait_times") or []
+            hist = WaitHistogram.from_values(waits) if len(waits) else None
+        return cls(
+            queue=StepSeries(t_q, q_q) if len(t_q) and len(q_q) else None,
+            completed=StepSeries(t_c, y_c) if len(t_c) and len(y_c) else None,
+            gantt=GanttBars.from_analytics(an.get("gantt", {})),
+            waits=hist if hist is not None and hist.n else None,
+        )
+
+
+def analysis_arrays(res) -> AnalysisArrays:
+    """AnalysisArrays de un SimResult (con .analytics), memorizado en el propio resultado."""
+    arr = getattr(res, "_analysis_arrays", None)
+    if arr is None:
+        arr = AnalysisArrays.from_analytics(getattr(res, "analytics", {}) or {})
+        setattr(res, "_analysis_arrays", arr)
+    return arr
@@ -0,0 +1,313 @@
+# src/warehouse/aisle_graph.py
+"""
+Grafo de pasillos contraído: la grilla transitable reducida a nodos + corridas.
+
+En layouts de racks casi todas las celdas son interiores de pasillo con exactamente
+dos vecinos; el BFS por neighbors() las expande una por una. Acá se contraen:
+  - nodos: cruces (grado != 2), estaciones y terminales pedidos (p.ej. slots);
+  - aristas: corridas de celdas de grado 2 entre dos nodos, con peso = pasos.
+Cualquier celda libre se ubica como nodo o como (arista, offset), así que las caras
+de picking de un pasillo de ancho 1 (todas sus celdas) no necesitan ser nodos.
+Consultas: Dijkstra sobre el grafo chico (steps, matrix) y re-expansión a celdas
+sólo cuando hace falta el camino (path). Distancias idénticas al BFS de la grilla.
+"""
+from heapq import heappush, heappop
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+from .grid import WarehouseGrid, Coord
+
+_INF = float("inf")
+
+
+def _degree(free: np.ndarray) -> np.ndarray:
+    p = np.pad(free, 1)
+    deg = (p[:-2, 1:-1].astype(np.int8) + p[2:, 1:-1] + p[1:-1, :-2] + p[1:-1, 2:])
+    return np.where(free, deg, 0)
+
+
+class AisleGraph:
+    """
+    Grafo de pasillos de una grilla. Sirve como grid.router (steps) y arma matrices
+    de pasos entre celdas (matrix) con un Dijkstra por fila sobre el grafo contraído.
+    """
+
+    def __init__(self, grid: WarehouseGrid, terminals: Iterable[Coord] = ()):
+        W, H = grid.width, grid.height
+        self.W, self.H = W, H
+        free2d = grid.free_mask()
+        free = free2d.ravel()
+        self._free = bytearray(free.astype(np.uint8).tobytes())
+        is_node = free & (_degree(free2d).ravel() != 2)
+        for (x, y) in list(grid.stations_xy) + list(terminals):
+            if 0 <= x < W and 0 <= y < H and free[y * W + x]:
+                is_node[y * W + x] = True
+
+        self.cell_edge = np.full(W * H, -1, dtype=np.int32)   # arista de cada celda interior
+        self.cell_off = np.zeros(W * H, dtype=np.int32)       # pasos desde edge_u
+        eu: List[int] = []
+        ev: List[int] = []
+        ew: List[int] = []
+        ecells: List[List[int]] = []
+        node_cells = list(np.flatnonzero(is_node).tolist())
+        node_id: Dict[int, int] = {c: i for i, c in enumerate(node_cells)}
+        free_l = self._free
+
+        def nbrs(c: int) -> List[int]:
+            x = c % W
+            out = []
+            if x > 0 and free_l[c - 1]:
+                out.append(c - 1)
+            if x < W - 1 and free_l[c + 1]:
+                out.append(c + 1)
+            if c >= W and free_l[c - W]:
+                out.append(c - W)
+            if c < (H - 1) * W and free_l[c + W]:
+                out.append(c + W)
+            return out
+
+        def walk(start: int, first: int) -> Tuple[List[int], int]:
+            prev, cur, cells = start, first, []
+            while cur not in node_id:
+                cells.append(cur)
+                a, b = nbrs(cur)
+                prev, cur = cur, (b if a == prev else a)
+            return cells, cur
+
+        def add_edge(u_cell: int, cells: List[int], v_cell: int) -> None:
+            e = len(eu)
+            eu.append(node_id[u_cell])
+            ev.append(node_id[v_cell])
+            ew.append(len(cells) + 1)
+            ecells.append(cells)
+            for k, c in enumerate(cells, start=1):
+                self.cell_edge[c] = e
+                self.cell_off[c] = k
+
+        for u in node_cells:
+            for n in nbrs(u):
+                if n in node_id:
+                    if u < n:
+                        add_edge(u, [], n)
+                    continue
+                if self.cell_edge[n] >= 0:
+                    continue                       # corrida ya registrada desde el otro extremo
+                cells, v = walk(u, n)
+                add_edge(u, cells, v)
+        # anillos de grado 2 sin ningún nodo: se promueve una celda y se recorren
+        rest = np.flatnonzero(free & ~is_node & (self.cell_edge < 0)).tolist()
+        for c in rest:
+            if self.cell_edge[c] >= 0:
+                continue
+            node_id[c] = len(node_cells)
+            node_cells.append(c)
+            for n in nbrs(c):
+                if self.cell_edge[n] < 0 and n not in node_id:
+                    cells, v = walk(c, n)
+                    add_edge(c, cells, v)
+
+        self.node_cells = np.asarray(node_cells, dtype=np.int64)
+        self.node_id = node_id
+        self.edge_u = np.asarray(eu, dtype=np.int32)
+        self.edge_v = np.asarray(ev, dtype=np.int32)
+        self.edge_w = np.asarray(ew, dtype=np.int32)
+        self._edge_cells = ecells
+        self.adj: List[List[Tuple[int, int, int]]] = [[] for _ in node_cells]   # (vecino, peso, arista)
+        for e, (u, v, w) in enumerate(zip(eu, ev, ew)):
+            if u == v:
+                continue                           # lazo: no acorta nada, sólo ubica celdas
+            self.adj[u].append((v, w, e))
+            self.adj[v].append((u, w, e))
+        self.settled = 0                           # nodos asentados por Dijkstra (acumulado)
+
+    # ------------------------------ info ------------------------------
+    @property
+    def n_nodes(self) -> int:
+        return len(self.node_cells)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.edge_w)
+
+    @property
+    def n_cells(self) -> int:
+        return int(sum(self._free))
+
+    # ------------------------------ API ------------------------------
+    def steps(self, a: Coord, b: Coord) -> Optional[int]:
+        s, t = self._index(a), self._index(b)
+        if s is None or t is None:
+            return -1
+        if s == t:
+            return 0
+        if not (self._free[s] and self._free[t]):
+            return -1
+        d, _, _ = self._search(s, t)
+        return -1 if d == _INF else int(d)
+
+    def path(self, a: Coord, b: Coord) -> List[Coord]:
+        """Camino celda a celda más corto (incluye extremos); [] si no hay ruta."""
+        s, t = self._index(a), self._index(b)
+        if s is None or t is None or not (self._free[s] and self._free[t]):
+            return [a] if a == b else []
+        if s == t:
+            return [a]
+        d, parent, last = self._search(s, t, want_path=True)
+        if d == _INF:
+            return []
+        cells = self._expand(s, t, parent, last)
+        W = self.W
+        return [(c % W, c // W) for c in cells]
+
+    def matrix(self, coords: Sequence[Coord]) -> np.ndarray:
+        """Pasos entre todas las celdas de coords → (k, k) int32; -1 = inalcanzable."""
+        arr = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+        k = len(arr)
+        out = np.full((k, k), -1, dtype=np.int32)
+        if k == 0:
+            return out
+        xs, ys = arr[:, 0], arr[:, 1]
+        ok = (xs >= 0) & (xs < self.W) & (ys >= 0) & (ys < self.H)
+        flat = np.where(ok, ys * self.W + xs, 0)
+        ok &= np.frombuffer(bytes(self._free), dtype=np.uint8)[flat] > 0
+        # cada celda: (nodo_a, costo_a, nodo_b, costo_b); nodos → ambos iguales
+        e = self.cell_edge[flat]
+        nid = np.array([self.node_id.get(int(c), -1) for c in flat], dtype=np.int64)
+        if self.n_edges == 0:
+            # sin aristas toda celda libre es un nodo aislado: sólo llega a sí misma
+            out[ok[:, None] & ok[None, :] & (nid[:, None] == nid[None, :])] = 0
+            np.fill_diagonal(out, 0)
+            return out
+        on_edge = ok & (nid < 0)
+        ee = np.where(on_edge, e, 0)
+        off = self.cell_off[flat].astype(np.float64)
+        na = np.where(on_edge, self.edge_u[ee], nid)
+        nb = np.where(on_edge, self.edge_v[ee], nid)
+        ca = np.where(on_edge, off, 0.0)
+        cb = np.where(on_edge, self.edge_w[ee] - off, 0.0)
+        for i in np.flatnonzero(ok).tolist():
+            dist = self._dijkstra_all(self._sources(int(flat[i])))
+            d = np.minimum(dist[na] + ca, dist[nb] + cb)
+            same = on_edge & (ee == ee[i]) if on_edge[i] else np.zeros(k, dtype=bool)
+            d = np.where(same, np.minimum(d, np.abs(off - off[i])), d)
+            d[~ok] = _INF
+            row = np.where(np.isfinite(d), d, -1).astype(np.int32)
+            out[i] = row
+        np.fill_diagonal(out, 0)
+        return out
+
+    # --------------------------- internos ---------------------------
+    def _index(self, xy: Coord) -> Optional[int]:
+        x, y = int(xy[0]), int(xy[1])
+        if 0 <= x < self.W and 0 <= y < self.H:
+            return y * self.W + x
+        return None
+
+    def _sources(self, c: int) -> List[Tuple[int, int]]:
+        """(nodo, costo) para salir de / llegar a la celda c."""
+        i = self.node_id.get(c)
+        if i is not None:
+            return [(i, 0)]
+        e = int(self.cell_edge[c])
+        off = int(self.cell_off[c])
+        return [(int(self.edge_u[e]), off), (int(self.edge_v[e]), int(self.edge_w[e]) - off)]
+
+    def _dijkstra_all(self, sources: List[Tuple[int, int]]) -> np.ndarray:
+        dist = [_INF] * self.n_nodes
+        heap = []
+        for n, c in sources:
+            if c < dist[n]:
+                dist[n] = c
+                heappush(heap, (c, n))
+        adj = self.adj
+        settled = 0
+        while heap:
+            d, u = heappop(heap)
+            if d > dist[u]:
+                continue
+            settled += 1
+            for v, w, _ in adj[u]:
+                nd = d + w
+                if nd < dist[v]:
+                    dist[v] = nd
+                    heappush(heap, (nd, v))
+        self.settled += settled
+        return np.asarray(dist + [_INF], dtype=np.float64)   # índice -1 → inf
+
+    def _search(self, s: int, t: int, want_path: bool = False):
+        """Dijkstra s→t con corte temprano. Devuelve (pasos, padres, nodo de llegada)."""
+        targets = dict()
+        for n, c in self._sources(t):
+            targets[n] = min(c, targets.get(n, _INF))
+        best, last = _INF, None
+        es, et = int(self.cell_edge[s]), int(self.cell_edge[t])
+        if es >= 0 and es == et:
+            best = abs(int(self.cell_off[s]) - int(self.cell_off[t]))   # misma corrida
+        dist: Dict[int, float] = {}
+        parent: Dict[int, Tuple[int, int]] = {}
+        heap = []
+        for n, c in self._sources(s):
+            if c < dist.get(n, _INF):
+                dist[n] = c
+                parent[n] = (-1, -1)
+                heappush(heap, (c, n))
+        adj = self.adj
+        settled = 0
+        while heap:
+            d, u = heappop(heap)
+            if d >= best:
+                break
+            if d > dist[u]:
+                continue
+            settled += 1
+            extra = targets.get(u)
+            if extra is not None and d + extra < best:
+                best, last = d + extra, u
+            for v, w, e in adj[u]:
+                nd = d + w
+                if nd < dist.get(v, _INF):
+                    dist[v] = nd
+                    if want_path:
+                        parent[v] = (u, e)
+                    heappush(heap, (nd, v))
+        self.settled += settled
+        return best, parent, last
+
+    def _edge_walk(self, e: int, from_node: int) -> List[int]:
+        """Celdas interiores de la arista e recorridas desde from_node."""
+        cells = self._edge_cells[e]
+        return cells if int(self.edge_u[e]) == from_node else cells[::-1]
+
+    def _toward_u(self, c: int, node: int) -> bool:
+        """La celda interior c se conecta con node por el extremo u de su arista (lazos: el más corto)."""
+        e = int(self.cell_edge[c])
+        u, v = int(self.edge_u[e]), int(self.edge_v[e])
+        if u != v:
+            return node == u
+        return int(self.cell_off[c]) <= int(self.edge_w[e]) - int(self.cell_off[c])
+
+    def _expand(self, s: int, t: int, parent, last: Optional[int]) -> List[int]:
+        if last is None:                            # misma corrida, sin pasar por nodos
+            cells = self._edge_cells[int(self.cell_edge[s])]
+            a, b = int(self.cell_off[s]), int(self.cell_off[t])
+            return cells[a - 1:b] if a <= b else cells[b - 1:a][::-1]
+        chain = []
+        u = last
+        while u != -1:
+            chain.append(u)
+            u = parent[u][0]
+        chain.reverse()
+        out: List[int] = []
+        if s not in self.node_id:                   # de s hasta el primer nodo (s incluida)
+            cells = self._edge_cells[int(self.cell_edge[s])]
+            off = int(self.cell_off[s])
+            out.extend(cells[:off][::-1] if self._toward_u(s, chain[0]) else cells[off - 1:])
+        for k, u in enumerate(chain):
+            if k:
+                out.extend(self._edge_walk(parent[u][1], chain[k - 1]))
+            out.append(int(self.node_cells[u]))
+        if t not in self.node_id:                   # del último nodo hasta t (t incluida)
+            cells = self._edge_cells[int(self.cell_edge[t])]
+            off = int(self.cell_off[t])
+            out.extend(cells[:off] if self._toward_u(t, last) else cells[off - 1:][::-1])
+        return out
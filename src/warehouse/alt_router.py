@@ -0,0 +1,174 @@
+# src/warehouse/alt_router.py
+"""
+Ruteo punto a punto ALT (A* + landmarks + desigualdad triangular) para grillas grandes.
+
+Una matriz densa entre todas las celdas (o all_pairs_shortest_path_length) es O(N²):
+inviable en pisos de 1000×1000. ALT guarda sólo L campos BFS (int32, L×N) desde
+landmarks elegidos por punto más lejano, y responde d(a, b) con A* usando
+    h(v) = max( Manhattan(v, b), max_l |d_l(b) − d_l(v)| )
+que es admisible y consistente: la búsqueda expande casi sólo el camino.
+Las consultas calientes quedan en un LRU acotado. Memoria: O(L·N + cache).
+"""
+from collections import OrderedDict
+from heapq import heappush, heappop
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from .grid import WarehouseGrid, Coord
+from .routing import distance_field
+
+_INF = np.iinfo(np.int32).max
+
+
+class ALTRouter:
+    """
+    Router para grid.router (steps(a, b) -> int; -1 = inalcanzable), más path(a, b).
+
+    n_landmarks: campos BFS a precalcular (16–32 alcanza en layouts de racks).
+    cache_size: pares (a, b) recordados (LRU, simétrico).
+    dist_cache: DistanceCache opcional: los campos de landmarks quedan en disco.
+    """
+
+    def __init__(self, grid: WarehouseGrid, n_landmarks: int = 16, cache_size: int = 100_000,
+                 dist_cache=None):
+        self.W, self.H = grid.width, grid.height
+        self.N = self.W * self.H
+        free = grid.free_mask().ravel()
+        self._free = bytearray(free.astype(np.uint8).tobytes())
+        self.cache_size = int(cache_size)
+        self._lru: "OrderedDict[Tuple[int, int], int]" = OrderedDict()
+        self.hits = 0
+        self.queries = 0
+        self.expanded = 0              # nodos expandidos por A* (acumulado)
+
+        field = (lambda xy: dist_cache.field(grid, xy)) if dist_cache is not None \
+            else (lambda xy: distance_field(grid, xy))
+        self.landmarks: List[Coord] = []
+        rows: List[np.ndarray] = []
+        if free.any():
+            # punto más lejano: el primero es la celda (alcanzable) más lejana a la estación;
+            # después, celdas sin landmark alcanzable (otra componente) cuentan como infinitas
+            st = distance_field(grid, grid.stations_xy).ravel()
+            mind = np.where(st >= 0, st.astype(np.int64), -1)       # primer pick: max distancia a estación
+            for _ in range(max(1, int(n_landmarks))):
+                cand = np.where(free, mind, -1)
+                i = int(np.argmax(cand))
+                if cand[i] <= 0 and rows:
+                    break                     # todas las celdas ya son landmarks
+                xy = (i % self.W, i // self.W)
+                f = np.asarray(field(xy), dtype=np.int32).ravel()
+                rows.append(f)
+                self.landmarks.append(xy)
+                d = np.where(f >= 0, f.astype(np.int64), _INF)
+                mind = d if len(rows) == 1 else np.minimum(mind, d)
+        self.F = np.stack(rows) if rows else np.zeros((0, self.N), dtype=np.int32)   # (L, N)
+
+    # ------------------------------ API ------------------------------
+    @property
+    def nbytes(self) -> int:
+        return int(self.F.nbytes) + len(self._free)
+
+    def steps(self, a: Coord, b: Coord) -> Optional[int]:
+        s, t = self._index(a), self._index(b)
+        if s is None or t is None:
+            return -1
+        if s == t:
+            return 0
+        if not (self._free[s] and self._free[t]):
+            return -1
+        self.queries += 1
+        key = (s, t) if s < t else (t, s)
+        d = self._lru.get(key)
+        if d is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return d
+        d = self._astar(s, t)[0]
+        self._lru[key] = d
+        if len(self._lru) > self.cache_size:
+            self._lru.popitem(last=False)
+        return d
+
+    def path(self, a: Coord, b: Coord) -> List[Coord]:
+        """Camino celda a celda más corto (incluye extremos); [] si no hay ruta."""
+        s, t = self._index(a), self._index(b)
+        if s is None or t is None or not (self._free[s] and self._free[t]):
+            return [a] if a == b else []
+        if s == t:
+            return [a]
+        d, parent = self._astar(s, t, want_path=True)
+        if d < 0:
+            return []
+        out = [t]
+        while out[-1] != s:
+            out.append(parent[out[-1]])
+        W = self.W
+        return [(v % W, v // W) for v in reversed(out)]
+
+    # --------------------------- internos ---------------------------
+    def _index(self, xy: Coord) -> Optional[int]:
+        x, y = int(xy[0]), int(xy[1])
+        if 0 <= x < self.W and 0 <= y < self.H:
+            return y * self.W + x
+        return None
+
+    def _astar(self, s: int, t: int, want_path: bool = False):
+        F = self.F
+        W, N = self.W, self.N
+        free = self._free
+        Ft = F[:, t].astype(np.int64)
+        Fs = F[:, s].astype(np.int64)
+        # componentes distintas: algún landmark alcanza a uno y no al otro
+        if F.shape[0] and bool(np.any((Fs < 0) != (Ft < 0))):
+            return -1, None
+        # landmarks que no alcanzan a t no acotan nada; F no se copia: cada h_many
+        # junta sólo sus columnas (L×k) y, si hace falta, descarta esas filas ahí
+        valid = Ft >= 0
+        rows = None if bool(valid.all()) else np.flatnonzero(valid)
+        Ftv = (Ft if rows is None else Ft[rows])[:, None]
+        use_lm = Ftv.shape[0] > 0
+        tx, ty = t % W, t // W
+
+        def h_many(idx: List[int]) -> List[int]:
+            arr = np.fromiter(idx, dtype=np.int64, count=len(idx))
+            man = np.abs(arr % W - tx) + np.abs(arr // W - ty)
+            if use_lm:
+                cols = F[:, arr] if rows is None else F[rows[:, None], arr]
+                lb = np.abs(cols - Ftv).max(axis=0)
+                man = np.maximum(man, lb)
+            return man.tolist()
+
+        g: Dict[int, int] = {s: 0}
+        parent: Dict[int, int] = {}
+        heap = [(h_many([s])[0], 0, s)]
+        expanded = 0
+        while heap:
+            _, ng, u = heappop(heap)
+            gu = -ng
+            if u == t:
+                self.expanded += expanded
+                return gu, parent
+            if gu > g[u]:
+                continue
+            expanded += 1
+            x = u % W
+            cand = []
+            if x > 0 and free[u - 1]:
+                cand.append(u - 1)
+            if x < W - 1 and free[u + 1]:
+                cand.append(u + 1)
+            if u >= W and free[u - W]:
+                cand.append(u - W)
+            if u < N - W and free[u + W]:
+                cand.append(u + W)
+            gv = gu + 1
+            nbrs = [v for v in cand if g.get(v, _INF) > gv]
+            if not nbrs:
+                continue
+            for v, hv in zip(nbrs, h_many(nbrs)):
+                g[v] = gv
+                if want_path:
+                    parent[v] = u
+                heappush(heap, (gv + hv, -gv, v))   # empate: más profundo primero
+        self.expanded += expanded
+        return -1, None
@@ -0,0 +1,285 @@
+# src/warehouse/dist_cache.py
+"""
+Cache persistente de distancias en disco, por hash del layout.
+
+Guarda como .npy (y se leen mmapeados en sólo lectura):
+  - station_field: campo BFS (alto, ancho) desde las estaciones (slotting / hotspot);
+  - field_<x>_<y>: campo BFS desde una celda;
+  - slots_<hash>: submatriz de pasos entre celdas de SKUs + estaciones (tours).
+
+Estructura: <root>/v<CACHE_VERSION>/<layout_hash>/<nombre>.npy. El hash cubre
+ancho, alto, obstáculos (máscara) y estaciones; subir CACHE_VERSION invalida todo
+(las versiones viejas se borran al desalojar). Desalojo LRU por mtime cuando el
+total supera max_bytes. Escrituras atómicas (tmp + os.replace): varios procesos
+pueden compartir el directorio.
+
+El disco es opt-in: las llamadas de librería (hotspot, slotting, run_grid, ...) usan
+sólo memoria salvo que WAREHOUSE_DIST_CACHE apunte a un directorio. Los CLI y la UI
+llaman a enable_disk_cache(), que fija la variable (la heredan los workers) en
+~/.cache/warehouse_sim/dist si no estaba definida. Con WAREHOUSE_DIST_CACHE=off
+no se toca el disco aunque se haya pedido.
+"""
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import hashlib
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from .grid import WarehouseGrid, Coord
+from .routing import distance_field, shortest_path_steps
+from .aisle_graph import AisleGraph
+
+CACHE_VERSION = 1
+ENV_VAR = "WAREHOUSE_DIST_CACHE"            # ruta del cache, o "off"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def user_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "warehouse_sim" / "dist"
+
+
+def default_cache_dir() -> Optional[Path]:
+    """Directorio según WAREHOUSE_DIST_CACHE; None (sólo memoria) si no está o es "off"."""
+    env = os.environ.get(ENV_VAR)
+    if env is None or env.strip().lower() in ("off", "0", "none", ""):
+        return None
+    return Path(env)
+
+
+def enable_disk_cache(root=None) -> Optional[Path]:
+    """Opt-in al cache en disco para este proceso y sus hijos (CLI / UI)."""
+    if ENV_VAR not in os.environ:
+        os.environ[ENV_VAR] = str(root if root is not None else user_cache_dir())
+    return default_cache_dir()
+
+
+def layout_hash(grid: WarehouseGrid) -> str:
+    """Hash estable del layout (dimensiones, obstáculos y estaciones)."""
+    h = hashlib.sha1()
+    h.update(f"v{CACHE_VERSION}|{grid.width}x{grid.height}|".encode())
+    h.update(np.asarray(grid.stations_xy, dtype=np.int32).tobytes())
+    h.update(b"|")
+    h.update(np.packbits(grid.blocked_mask()).tobytes())
+    return h.hexdigest()[:20]
+
+
+def _coords_hash(coords: np.ndarray) -> str:
+    return hashlib.sha1(np.ascontiguousarray(coords, dtype=np.int32).tobytes()).hexdigest()[:16]
+
+
+def slot_matrix_array(grid: WarehouseGrid, coords: np.ndarray) -> np.ndarray:
+    """
+    Pasos BFS entre todas las celdas de coords (k, 2) → (k, k) int32; -1 = inalcanzable.
+    Diagonal 0 (como shortest_path_steps con start == goal). Un BFS vectorizado por fila,
+    o un Dijkstra por fila sobre el grafo de pasillos si contrae la grilla al menos 4×.
+    """
+    k = len(coords)
+    out = np.full((k, k), -1, dtype=np.int32)
+    if k == 0:
+        return out
+    graph = AisleGraph(grid)
+    if graph.n_nodes * 4 <= graph.n_cells:
+        return graph.matrix(coords)
+    xs, ys = coords[:, 0], coords[:, 1]
+    for i in range(k):
+        f = distance_field(grid, (int(xs[i]), int(ys[i])))
+        out[i] = f[ys, xs]
+    np.fill_diagonal(out, 0)
+    return out
+
+
+class DistanceCache:
+    """Distancias de un layout en disco (mmap sólo lectura); root=None → sólo memoria."""
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.base = Path(root) if root is not None else None
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def root(self) -> Optional[Path]:
+        return self.base / f"v{CACHE_VERSION}" if self.base is not None else None
+
+    # ---- API ----
+    def station_field(self, grid: WarehouseGrid) -> np.ndarray:
+        return self._get(grid, "station_field", lambda: distance_field(grid, grid.stations_xy))
+
+    def field(self, grid: WarehouseGrid, xy: Coord) -> np.ndarray:
+        x, y = int(xy[0]), int(xy[1])
+        return self._get(grid, f"field_{x}_{y}", lambda: distance_field(grid, (x, y)))
+
+    def slot_matrix(self, grid: WarehouseGrid, coords: Sequence[Coord]) -> np.ndarray:
+        """Submatriz (k, k) de pasos entre coords (en ese orden)."""
+        arr = np.asarray(coords, dtype=np.int32).reshape(-1, 2)
+        return self._get(grid, f"slots_{_coords_hash(arr)}", lambda: slot_matrix_array(grid, arr))
+
+    # ---- disco ----
+    def _get(self, grid: WarehouseGrid, name: str, build: Callable[[], np.ndarray]) -> np.ndarray:
+        if self.root is None:
+            self.misses += 1
+            return _readonly(build())
+        path = self.root / layout_hash(grid) / f"{name}.npy"
+        if path.exists():
+            try:
+                arr = np.load(path, mmap_mode="r")
+                os.utime(path)             # marca de uso para el LRU
+                self.hits += 1
+                return arr
+            except (OSError, ValueError):
+                pass                       # archivo corrupto/truncado: se reconstruye
+        self.misses += 1
+        arr = build()
+        try:
+            _atomic_save(path, arr)
+        except OSError:
+            return _readonly(arr)          # disco de sólo lectura / lleno: sigue en memoria
+        self.evict()
+        return np.load(path, mmap_mode="r") if path.exists() else _readonly(arr)
+
+    def size_bytes(self) -> int:
+        if self.base is None or not self.base.exists():
+            return 0
+        return sum(p.stat().st_size for p in self.base.rglob("*.npy"))
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Borra versiones viejas y luego los .npy menos usados hasta quedar bajo max_bytes."""
+        if self.base is None or not self.base.exists():
+            return 0
+        limit = self.max_bytes if max_bytes is None else int(max_bytes)
+        removed = 0
+        for d in self.base.glob("v*"):
+            if d.is_dir() and d.name != f"v{CACHE_VERSION}":
+                shutil.rmtree(d, ignore_errors=True)
+                removed += 1
+        files: List[Tuple[float, int, Path]] = []
+        for p in self.base.rglob("*.npy"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        total = sum(s for _, s, _ in files)
+        for _, size, p in sorted(files):
+            if total <= limit:
+                break
+            try:
+                p.unlink()
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def clear(self) -> None:
+        if self.base is not None:
+            shutil.rmtree(self.base, ignore_errors=True)
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.setflags(write=False)
+    return arr
+
+
+def _atomic_save(path: Path, arr: np.ndarray) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.stem, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, arr)
+        os.chmod(tmp, 0o644)               # mkstemp crea 0600; el cache se comparte entre usuarios/workers
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+_DEFAULT: Dict[str, DistanceCache] = {}
+
+def default_cache() -> DistanceCache:
+    """Cache compartido del proceso (directorio según WAREHOUSE_DIST_CACHE)."""
+    root = default_cache_dir()
+    key = str(root)
+    if key not in _DEFAULT:
+        _DEFAULT[key] = DistanceCache(root)
+    return _DEFAULT[key]
+
+
+# ------------------------- router por tabla -------------------------
+
+class SlotRouter:
+    """
+    Router para grid.router: pasos entre celdas conocidas (slots + estaciones) por
+    lookup en la submatriz; None para celdas fuera de la tabla (→ BFS normal).
+    """
+
+    def __init__(self, coords: Sequence[Coord], matrix: np.ndarray):
+        self.index: Dict[Coord, int] = {(int(x), int(y)): i for i, (x, y) in enumerate(coords)}
+        self.matrix = matrix
+        self._rows: Dict[int, list] = {}
+
+    def steps(self, a: Coord, b: Coord) -> Optional[int]:
+        i = self.index.get(a)
+        j = self.index.get(b)
+        if i is None or j is None:
+            return None
+        row = self._rows.get(i)
+        if row is None:
+            row = self._rows[i] = self.matrix[i].tolist()   # filas a lista: lookup O(1) sin escalares NumPy
+        return row[j]
+
+
+MAX_MATRIX_SLOTS = 4000               # k² int32 ≈ 64 MB y k BFS completos; más allá, ALT
+
+
+def attach_router(grid: WarehouseGrid, placement, cache: Optional[DistanceCache] = None,
+                  extra: Iterable[Coord] = (), max_slots: int = MAX_MATRIX_SLOTS):
+    """
+    Arma (o lee del cache) la submatriz slots+estaciones y la cuelga en grid.router.
+    Con más de max_slots celdas la matriz densa no escala: cuelga un ALTRouter
+    (landmarks + A*, memoria O(L·N)) con los campos de landmarks en el cache.
+    """
+    cache = cache if cache is not None else default_cache()
+    cells = set()
+    for xy in list(placement.sku_to_coord.values()) + list(grid.stations_xy) + list(extra):
+        xy = (int(xy[0]), int(xy[1]))
+        if grid.in_bounds(xy):
+            cells.add(xy)
+    coords = sorted(cells)
+    if len(coords) > max_slots:
+        from .alt_router import ALTRouter
+        router = ALTRouter(grid, dist_cache=cache)
+        grid.router = router
+        return router
+    router = SlotRouter(coords, cache.slot_matrix(grid, coords))
+    grid.router = router
+    return router
+
+
+def router_matrix(grid: WarehouseGrid, coords: Sequence[Coord]) -> Optional[np.ndarray]:
+    """
+    Pasos (k, k) int32 entre coords usando grid.router; None si la grilla no tiene router.
+    Con un SlotRouter que conoce todas las celdas es un gather de su submatriz; si no,
+    par a par con shortest_path_steps (ALT o BFS para celdas fuera de la tabla).
+    """
+    router = getattr(grid, "router", None)
+    if router is None:
+        return None
+    cells = [(int(x), int(y)) for x, y in coords]
+    k = len(cells)
+    if isinstance(router, SlotRouter):
+        idx = [router.index.get(c) for c in cells]
+        if None not in idx:
+            ix = np.asarray(idx, dtype=np.int64)
+            return np.asarray(router.matrix[np.ix_(ix, ix)], dtype=np.int32)
+    out = np.zeros((k, k), dtype=np.int32)
+    for i in range(k):
+        for j in range(i + 1, k):
+            out[i, j] = out[j, i] = shortest_path_steps(grid, cells[i], cells[j])
+    return out
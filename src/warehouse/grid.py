@@ -1,8 +1,9 @@
 # src/warehouse/grid.py
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
 from collections import deque, defaultdict
+import numpy as np
 
 Coord = Tuple[int, int]  # (x, y) en la grilla
 
@@ -16,12 +17,19 @@ class WarehouseGrid:
         "height": int,
         "station": {"x": int, "y": int},
         "obstacles": List[List[int] | Tuple[int,int]],   # opcional
-        "cell_size_m": float                             # opcional, default 1.0
+        "cell_size_m": float,                            # opcional, default 1.0
+        "stations": List[{"x": int, "y": int}],          # opcional: estaciones extra de empaque
+        "zones": {nombre: {"x0","y0","x1","y1"}},        # opcional: rectángulos inclusivos
     }
 
     Esta forma coincide con lo que esperan la UI (compose_trace) y SKUPlacement.random_sample.
+    'station' sigue siendo la estación principal; 'stations' agrega puntos de entrega.
+
+    router (opcional): objeto con steps(a, b) -> int | None que shortest_path_steps
+    consulta antes del BFS (p.ej. dist_cache.SlotRouter); None = BFS siempre.
     """
     spec: Dict[str, Any]
+    router: Optional[Any] = field(default=None, repr=False, compare=False)
 
     # --------- constructores ---------
     @staticmethod
@@ -59,14 +67,88 @@ class WarehouseGrid:
         return (0, 0)
 
     @property
-    def obstacles_set(self) -> Set[Coord]:
-        raw = self.spec.get("obstacles", []) or []
-        out: Set[Coord] = set()
-        for p in raw:
-            if isinstance(p, (list, tuple)) and len(p) == 2:
-                out.add((int(p[0]), int(p[1])))
+    def stations_xy(self) -> List[Coord]:
+        """Estación principal primero, luego las extra de spec['stations'] (sin duplicados)."""
+        out: List[Coord] = [self.station_xy]
+        for st in self.spec.get("stations", []) or []:
+            if isinstance(st, dict):
+                xy = (int(st["x"]), int(st["y"]))
+            else:
+                xy = (int(st[0]), int(st[1]))
+            if xy not in out:
+                out.append(xy)
         return out
 
+    @property
+    def zones(self) -> Dict[str, Tuple[int, int, int, int]]:
+        """Zonas de picking como {nombre: (x0, y0, x1, y1)} inclusivos (cacheado mientras spec['zones'] no cambie)."""
+        raw = self.spec.get("zones", {}) or {}
+        key = (id(raw), len(raw))
+        cache = self.__dict__.get("_zones_cache")
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        out: Dict[str, Tuple[int, int, int, int]] = {}
+        for name, z in raw.items():
+            if isinstance(z, dict):
+                x0, y0, x1, y1 = z["x0"], z["y0"], z["x1"], z["y1"]
+            else:
+                x0, y0, x1, y1 = z
+            out[str(name)] = (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+        self.__dict__["_zones_cache"] = (key, out)
+        return out
+
+    def zone_of(self, xy: Coord) -> Optional[str]:
+        """Primera zona que contiene xy (None si no hay zonas o cae fuera de todas)."""
+        x, y = xy
+        for name, (x0, y0, x1, y1) in self.zones.items():
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                return name
+        return None
+
+    def _obstacles_array(self) -> np.ndarray:
+        """Obstáculos como array (N,2) de (x,y), cacheado mientras spec['obstacles'] no cambie."""
+        raw = self.spec.get("obstacles", []) or []
+        key = (id(raw), len(raw), self.width, self.height)
+        cache = self.__dict__.get("_obs_cache")
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        arr = np.asarray(raw, dtype=np.int64).reshape(-1, 2) if len(raw) else np.empty((0, 2), dtype=np.int64)
+        self.__dict__["_obs_cache"] = (key, arr)
+        self.__dict__.pop("_mask_cache", None)
+        self.__dict__.pop("_set_cache", None)
+        return arr
+
+    @property
+    def obstacles_set(self) -> Set[Coord]:
+        arr = self._obstacles_array()
+        cached = self.__dict__.get("_set_cache")
+        if cached is None:
+            cached = set(map(tuple, arr.tolist()))
+            self.__dict__["_set_cache"] = cached
+        return cached
+
+    # --------- índice de celdas libres (arrays) ---------
+    def blocked_mask(self) -> np.ndarray:
+        """Máscara (alto, ancho) indexada [y, x]: True = obstáculo."""
+        arr = self._obstacles_array()
+        mask = self.__dict__.get("_mask_cache")
+        if mask is None:
+            mask = np.zeros((self.height, self.width), dtype=bool)
+            if arr.size:
+                ok = (arr[:, 0] >= 0) & (arr[:, 0] < self.width) & (arr[:, 1] >= 0) & (arr[:, 1] < self.height)
+                mask[arr[ok, 1], arr[ok, 0]] = True
+            mask.setflags(write=False)
+            self.__dict__["_mask_cache"] = mask
+        return mask
+
+    def free_mask(self) -> np.ndarray:
+        return ~self.blocked_mask()
+
+    def free_cells(self) -> np.ndarray:
+        """Celdas transitables como array (N,2) de (x,y), en orden x-mayor (como nodes())."""
+        xs, ys = np.nonzero(self.free_mask().T)  # recorrido [x][y] → x-mayor
+        return np.stack([xs, ys], axis=1)
+
     # --------- API de grafo sobre la grilla ---------
     def in_bounds(self, xy: Coord) -> bool:
         x, y = xy
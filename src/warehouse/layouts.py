@@ -0,0 +1,92 @@
+# src/warehouse/layouts.py
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+Coord = Tuple[int, int]
+
+
+def rack_mask(
+    width: int,
+    height: int,
+    rack_depth: int = 2,
+    aisle_width: int = 1,
+    block_length: int = 20,
+    cross_aisle_width: int = 2,
+    margin: int = 2,
+) -> np.ndarray:
+    """
+    Máscara (alto, ancho) [y, x] con True en celdas de estantería.
+
+    Estanterías verticales de `rack_depth` celdas de fondo separadas por pasillos de
+    `aisle_width`; cada `block_length` filas se corta con un pasillo transversal de
+    `cross_aisle_width`. `margin` deja pasillos perimetrales (frente y fondo).
+    """
+    assert rack_depth >= 1 and aisle_width >= 1 and block_length >= 1 and cross_aisle_width >= 0
+    xs = np.arange(width)
+    ys = np.arange(height)
+    col = (xs >= margin) & (xs < width - margin) & (((xs - margin) % (rack_depth + aisle_width)) < rack_depth)
+    row = (ys >= margin) & (ys < height - margin) & (((ys - margin) % (block_length + cross_aisle_width)) < block_length)
+    return row[:, None] & col[None, :]
+
+
+def rack_layout_spec(
+    width: int = 500,
+    height: int = 500,
+    rack_depth: int = 2,
+    aisle_width: int = 1,
+    block_length: int = 20,
+    cross_aisle_width: int = 2,
+    margin: int = 2,
+    station: Coord = (0, 0),
+    stations: Optional[List[Coord]] = None,
+    zones: Optional[Dict[str, Dict[str, int]]] = None,
+    cell_size_m: float = 1.0,
+) -> Dict[str, Any]:
+    """
+    Spec de WarehouseGrid para un piso con estanterías (pasillos + transversales).
+    Las estaciones siempre quedan libres. Los SKUs se ubican en las caras de picking
+    (celdas de pasillo contiguas a estantería), ver pick_face_mask().
+    """
+    mask = rack_mask(width, height, rack_depth, aisle_width, block_length, cross_aisle_width, margin)
+    extra = list(stations or [])
+    for (x, y) in [tuple(station)] + [tuple(s) for s in extra]:
+        if 0 <= x < width and 0 <= y < height:
+            mask[y, x] = False
+    ys, xs = np.nonzero(mask)
+    spec: Dict[str, Any] = {
+        "width": int(width),
+        "height": int(height),
+        "station": {"x": int(station[0]), "y": int(station[1])},
+        "obstacles": np.stack([xs, ys], axis=1).tolist(),
+        "cell_size_m": float(cell_size_m),
+        "layout": {
+            "kind": "racks",
+            "rack_depth": rack_depth,
+            "aisle_width": aisle_width,
+            "block_length": block_length,
+            "cross_aisle_width": cross_aisle_width,
+            "margin": margin,
+        },
+    }
+    if extra:
+        spec["stations"] = [{"x": int(x), "y": int(y)} for (x, y) in extra]
+    if zones:
+        spec["zones"] = zones
+    return spec
+
+
+def pick_face_mask(grid) -> np.ndarray:
+    """
+    Celdas libres donde se puede ubicar un SKU: contiguas (4-vecindad) a una estantería.
+    En grillas sin obstáculos toda celda libre es candidata.
+    """
+    blocked = grid.blocked_mask()
+    free = ~blocked
+    if not blocked.any():
+        return free
+    adj = np.zeros_like(blocked)
+    adj[1:, :] |= blocked[:-1, :]
+    adj[:-1, :] |= blocked[1:, :]
+    adj[:, 1:] |= blocked[:, :-1]
+    adj[:, :-1] |= blocked[:, 1:]
+    return free & adj
@@ -1,11 +1,17 @@
 from typing import List, Tuple
 from .grid import WarehouseGrid, Coord
 from collections import deque
+import numpy as np
 
 def shortest_path_steps(grid: WarehouseGrid, start: Coord, goal: Coord) -> int:
     """Número de pasos (4-conectado) entre start y goal. Retorna -1 si no hay ruta."""
     if start == goal:
         return 0
+    router = getattr(grid, "router", None)
+    if router is not None:
+        d = router.steps(start, goal)
+        if d is not None:
+            return d
     if not grid.in_bounds(start) or not grid.in_bounds(goal):
         return -1
     if not grid.passable(start) or not grid.passable(goal):
@@ -46,3 +52,66 @@ def multi_stop_tour_steps(grid: WarehouseGrid, start: Coord, stops: List[Coord])
         total += best_steps
         current = remaining.pop(best_idx)
     return total
+
+def nearest_target_steps(grid: WarehouseGrid, start: Coord, targets: List[Coord]) -> Tuple[Coord, int]:
+    """
+    BFS único desde start que corta en el primer target alcanzado.
+    Retorna (target, pasos) o (targets[0], -1) si ninguno es alcanzable.
+    """
+    if not targets:
+        raise ValueError("targets vacío")
+    if len(targets) == 1:
+        return targets[0], shortest_path_steps(grid, start, targets[0])
+    goals = set(targets)
+    if start in goals:
+        return start, 0
+    if not grid.in_bounds(start) or not grid.passable(start):
+        return targets[0], -1
+    q = deque([start])
+    dist = {start: 0}
+    while q:
+        u = q.popleft()
+        for v in grid.neighbors(u):
+            if v not in dist:
+                dist[v] = dist[u] + 1
+                if v in goals:
+                    return v, dist[v]
+                q.append(v)
+    return targets[0], -1
+
+def nearest_station(grid: WarehouseGrid, xy: Coord) -> Tuple[Coord, int]:
+    """Punto de entrega (estación) más cercano a xy en pasos."""
+    return nearest_target_steps(grid, xy, grid.stations_xy)
+
+def distance_field(grid: WarehouseGrid, sources) -> np.ndarray:
+    """
+    Campo de distancias BFS (pasos, int32) desde una o varias fuentes, indexado [y, x].
+    -1 = inalcanzable. BFS por frentes sobre índices planos: O(N) en NumPy, sin dicts.
+    """
+    if isinstance(sources, tuple) and len(sources) == 2 and not isinstance(sources[0], (tuple, list)):
+        sources = [sources]
+    W, H = grid.width, grid.height
+    free = grid.free_mask().ravel()
+    dist = np.full(W * H, -1, dtype=np.int32)
+    src = np.array([int(y) * W + int(x) for (x, y) in sources
+                    if 0 <= x < W and 0 <= y < H], dtype=np.int64)
+    src = src[free[src]] if src.size else src
+    if src.size == 0:
+        return dist.reshape(H, W)
+    dist[src] = 0
+    frontier = np.unique(src)
+    d = 0
+    while frontier.size:
+        d += 1
+        x = frontier % W
+        nb = np.concatenate((
+            frontier[x > 0] - 1,
+            frontier[x < W - 1] + 1,
+            frontier[frontier >= W] - W,
+            frontier[frontier < (H - 1) * W] + W,
+        ))
+        nb = nb[free[nb] & (dist[nb] < 0)]
+        nb = np.unique(nb)
+        dist[nb] = d
+        frontier = nb
+    return dist.reshape(H, W)
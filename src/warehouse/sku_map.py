@@ -1,13 +1,18 @@
 # src/warehouse/sku_map.py
-from typing import Dict, Tuple, List, Optional
+from typing import Dict, Tuple, List, Optional, Sequence
 import numpy as np
 from .grid import WarehouseGrid
+from .layouts import pick_face_mask
 
 Coord = Tuple[int, int]
 
 class SKUPlacement:
-    def __init__(self, mapping: Dict[str, Coord]):
-        self._map = dict(mapping)
+    def __init__(self, mapping: Optional[Dict[str, Coord]] = None, sku_to_coord: Optional[Dict[str, Coord]] = None):
+        self._map = dict(mapping if mapping is not None else (sku_to_coord or {}))
+
+    @property
+    def sku_to_coord(self) -> Dict[str, Coord]:
+        return self._map
 
     def coord_of(self, sku: str) -> Coord:
         return self._map[sku]
@@ -26,6 +31,21 @@ class SKUPlacement:
         """
         rng = np.random.default_rng(seed)
 
+        # WarehouseGrid: índice de celdas libres en arrays (O(n), respeta obstáculos y estaciones)
+        if isinstance(grid, WarehouseGrid):
+            mask = grid.free_mask().copy()
+            for (sx, sy) in grid.stations_xy:
+                if grid.in_bounds((sx, sy)):
+                    mask[sy, sx] = False
+            xs, ys = np.nonzero(mask.T)
+            free_arr = np.stack([xs, ys], axis=1)
+            if n_skus > len(free_arr):
+                raise ValueError(f"No hay suficientes celdas libres para {n_skus} SKUs (libres={len(free_arr)}).")
+            rng.shuffle(free_arr)
+            coords = [(int(x), int(y)) for (x, y) in free_arr[:n_skus].tolist()]
+            skus = [f"S{idx:04d}" for idx in range(1, n_skus + 1)]
+            return SKUPlacement(dict(zip(skus, coords)))
+
         # --- Inferir dimensiones ---
         def _infer_dims(g) -> Tuple[int, int]:
             w: Optional[int] = None
@@ -129,3 +149,47 @@ class SKUPlacement:
         skus = [f"S{idx:04d}" for idx in range(1, n_skus + 1)]
         mapping = {sku: coords[i] for i, sku in enumerate(skus)}
         return SKUPlacement(mapping)
+
+
+def generate_hotspot_map(
+    grid: WarehouseGrid,
+    popular: Sequence[str],
+    others: Sequence[str],
+    seed: Optional[int] = None,
+) -> SKUPlacement:
+    """
+    Slotting ABC por distancia a estación: los SKUs `popular` (clase A) ocupan las caras de
+    picking más cercanas (BFS a la estación más cercana) y `others` las siguientes, en orden.
+
+    Vectorizado: campo de distancias por frentes + argpartition sobre las candidatas,
+    O(n) en celdas y O(k log k) en SKUs. Con `seed` se barajan los SKUs dentro de cada clase.
+    """
+    from .dist_cache import default_cache
+
+    popular = list(popular)
+    others = list(others)
+    k = len(popular) + len(others)
+    if k == 0:
+        return SKUPlacement({})
+
+    dist = default_cache().station_field(grid).ravel()
+    cand = pick_face_mask(grid).ravel() & (dist > 0)   # alcanzable y no es estación
+    idx = np.flatnonzero(cand)
+    if k > idx.size:
+        raise ValueError(f"No hay suficientes caras de picking para {k} SKUs (libres={idx.size}).")
+
+    # clave única (distancia, índice plano) → orden determinista ante empates
+    key = dist[idx].astype(np.int64) * (grid.width * grid.height) + idx
+    if k < idx.size:
+        part = np.argpartition(key, k - 1)[:k]
+        idx, key = idx[part], key[part]
+    idx = idx[np.argsort(key, kind="stable")]
+
+    if seed is not None:
+        rng = np.random.default_rng(seed)
+        rng.shuffle(popular)
+        rng.shuffle(others)
+
+    ys, xs = np.divmod(idx, grid.width)
+    coords = list(zip(xs.tolist(), ys.tolist()))
+    return SKUPlacement(dict(zip(popular + others, coords)))
@@ -0,0 +1,237 @@
+# src/warehouse/slotting.py
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from .grid import WarehouseGrid, Coord
+from .layouts import pick_face_mask
+from .dist_cache import default_cache
+from .sku_map import SKUPlacement
+
+
+@dataclass
+class SlottingReport:
+    """
+    Resumen de la optimización. m_per_order_* es el recorrido medio por pedido:
+    - con `orders`: tour NN real (order_tour ida y vuelta), el mismo que usa el simulador;
+    - sin `orders`: ida y vuelta esperada por línea, 2·Σ p_i·d(estación, celda_i).
+    """
+    m_per_order_before: float
+    m_per_order_after: float
+    improvement_m_per_order: float
+    improvement_pct: float
+    objective_before: float
+    objective_after: float
+    swaps: int
+    passes: int
+
+    def to_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+
+# -------------------- Entradas: frecuencias y co-picks --------------------
+
+def _order_skus(order) -> List[str]:
+    counts = getattr(order, "item_counts", None)
+    return list(counts.keys()) if isinstance(counts, dict) else list(dict.fromkeys(order.items))
+
+def pick_frequencies(orders, skus: Sequence[str]) -> np.ndarray:
+    """Visitas por SKU (una por pedido que lo contiene)."""
+    pos = {s: i for i, s in enumerate(skus)}
+    f = np.zeros(len(skus), dtype=float)
+    for o in orders:
+        for s in _order_skus(o):
+            if s in pos:
+                f[pos[s]] += 1.0
+    return f
+
+def co_pick_matrix(orders, skus: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Afinidad simétrica en CSR (indptr, indices, pesos): nº de pedidos donde i y j coinciden."""
+    pos = {s: i for i, s in enumerate(skus)}
+    pairs: Dict[Tuple[int, int], float] = {}
+    for o in orders:
+        ids = sorted({pos[s] for s in _order_skus(o) if s in pos})
+        for a in range(len(ids)):
+            for b in range(a + 1, len(ids)):
+                key = (ids[a], ids[b])
+                pairs[key] = pairs.get(key, 0.0) + 1.0
+    n = len(skus)
+    if not pairs:
+        return np.zeros(n + 1, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+    ij = np.array(list(pairs.keys()), dtype=np.int64)
+    w = np.array(list(pairs.values()))
+    rows = np.concatenate([ij[:, 0], ij[:, 1]])
+    cols = np.concatenate([ij[:, 1], ij[:, 0]])
+    ww = np.concatenate([w, w])
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(indptr, rows + 1, 1)
+    return np.cumsum(indptr), cols[order], ww[order]
+
+
+# -------------------- Objetivo --------------------
+
+class _Objective:
+    """
+    J = Σ_i f_i·d0(c_i) + λ·Σ_{i<j} w_ij·|c_i − c_j|₁
+    (salida desde estación por visita + cercanía entre SKUs que se piden juntos).
+    El delta de un swap se evalúa sólo sobre los vecinos de los dos SKUs.
+    """
+
+    def __init__(self, f, d0, xy, csr, lam):
+        self.f, self.d0, self.xy, self.lam = f, d0, xy, lam
+        self.indptr, self.indices, self.w = csr
+
+    def total(self, cell_of: np.ndarray) -> float:
+        j = float(np.dot(self.f, self.d0[cell_of]))
+        if self.lam and self.indices.size:
+            rows = np.repeat(np.arange(len(cell_of)), np.diff(self.indptr))
+            diff = np.abs(self.xy[cell_of[rows]] - self.xy[cell_of[self.indices]]).sum(axis=1)
+            j += self.lam * 0.5 * float(np.dot(self.w, diff))
+        return j
+
+    def _pull(self, i: int, cell_from: int, cell_to: int, cell_of: np.ndarray, skip: int) -> float:
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        if lo == hi:
+            return 0.0
+        nb = self.indices[lo:hi]
+        w = self.w[lo:hi]
+        keep = nb != skip
+        if not keep.any():
+            return 0.0
+        cj = self.xy[cell_of[nb[keep]]]
+        d_to = np.abs(cj - self.xy[cell_to]).sum(axis=1)
+        d_from = np.abs(cj - self.xy[cell_from]).sum(axis=1)
+        return float(np.dot(w[keep], d_to - d_from))
+
+    def swap_delta(self, a: int, b: int, cell_of: np.ndarray) -> float:
+        ca, cb = cell_of[a], cell_of[b]
+        delta = (self.f[a] - self.f[b]) * (self.d0[cb] - self.d0[ca])
+        if self.lam and self.indices.size:
+            delta += self.lam * (self._pull(a, ca, cb, cell_of, b) + self._pull(b, cb, ca, cell_of, a))
+        return float(delta)
+
+
+# -------------------- Optimizador --------------------
+
+def _candidate_cells(grid: WarehouseGrid, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Las n caras de picking más cercanas a una estación: (índices planos, d0)."""
+    dist = default_cache().station_field(grid).ravel()
+    idx = np.flatnonzero(pick_face_mask(grid).ravel() & (dist > 0))
+    if n > idx.size:
+        raise ValueError(f"No hay suficientes caras de picking para {n} SKUs (libres={idx.size}).")
+    key = dist[idx].astype(np.int64) * (grid.width * grid.height) + idx
+    if n < idx.size:
+        part = np.argpartition(key, n - 1)[:n]
+        idx, key = idx[part], key[part]
+    idx = idx[np.argsort(key, kind="stable")]
+    return idx, dist[idx].astype(float)
+
+def _mean_tour_m(grid, placement, orders) -> float:
+    from src.picking.tours import order_tour
+    if not orders:
+        return 0.0
+    return float(np.mean([order_tour(grid, placement, o, return_to_station=True).meters for o in orders]))
+
+def _line_round_trip_m(grid, placement: SKUPlacement, skus, p: np.ndarray) -> float:
+    dist = default_cache().station_field(grid)
+    d = np.array([dist[placement.coord_of(s)[1], placement.coord_of(s)[0]] for s in skus], dtype=float)
+    return float(2.0 * np.dot(p, d) * grid.cell_size_m)
+
+def optimize_slotting(
+    grid: WarehouseGrid,
+    skus: Sequence[str],
+    weights: Optional[Sequence[float]] = None,
+    orders: Optional[Sequence] = None,
+    baseline: Optional[SKUPlacement] = None,
+    affinity_weight: float = 0.5,
+    window: int = 24,
+    max_passes: int = 4,
+    eval_orders: int = 300,
+) -> Tuple[SKUPlacement, SlottingReport]:
+    """
+    Re-ubica SKUs para minimizar el recorrido esperado.
+
+    1) Greedy: SKUs por frecuencia descendente → caras de picking por distancia a estación.
+    2) Búsqueda local por swaps entre SKUs cuya celda está a ≤ `window` posiciones en el ranking
+       de distancia, aceptando el primer swap que mejora; el delta se evalúa incrementalmente.
+
+    Frecuencias: `weights` (p.ej. Popularity.probs() o FloorHeatmap.sku_weights() de una
+    corrida) o, si hay `orders`, las observadas.
+    Con `orders` también se usa la afinidad de co-picking (peso `affinity_weight`).
+    `baseline` (por defecto hotspot por orden de `skus`) es la referencia del reporte.
+    """
+    skus = list(skus)
+    n = len(skus)
+    if orders is not None and len(orders):
+        f = pick_frequencies(orders, skus)
+        csr = co_pick_matrix(orders, skus)
+    elif weights is not None:
+        f = np.asarray(weights, dtype=float)
+        csr = co_pick_matrix([], skus)
+    else:
+        raise ValueError("Se requiere weights (popularidad) u orders (frecuencias observadas)")
+    if f.shape[0] != n:
+        raise ValueError("weights debe tener una entrada por SKU")
+
+    cells, d0 = _candidate_cells(grid, n)
+    xs = (cells % grid.width).astype(np.int64)
+    ys = (cells // grid.width).astype(np.int64)
+    xy = np.stack([xs, ys], axis=1)
+    obj = _Objective(f, d0, xy, csr, affinity_weight)
+
+    # 1) greedy: rango de popularidad ↔ rango de distancia
+    by_pop = np.argsort(-f, kind="stable")
+    cell_of = np.empty(n, dtype=np.int64)
+    cell_of[by_pop] = np.arange(n)
+    sku_at = np.empty(n, dtype=np.int64)
+    sku_at[cell_of] = np.arange(n)
+
+    if baseline is None:
+        from .sku_map import generate_hotspot_map
+        baseline = generate_hotspot_map(grid, skus, [])
+    base_pos = {(int(x), int(y)): k for k, (x, y) in enumerate(xy.tolist())}
+    base_cells = np.array([base_pos.get(tuple(baseline.coord_of(s)), -1) for s in skus])
+    objective_before = obj.total(base_cells) if np.all(base_cells >= 0) else float("nan")
+
+    # 2) búsqueda local por swaps (vecindario en ranking de distancia)
+    swaps = 0
+    passes = 0
+    for passes in range(1, max_passes + 1):
+        improved = 0
+        for ka in range(n):
+            a = sku_at[ka]
+            for kb in range(ka + 1, min(n, ka + 1 + window)):
+                b = sku_at[kb]
+                if obj.swap_delta(a, b, cell_of) < -1e-12:
+                    cell_of[a], cell_of[b] = kb, ka
+                    sku_at[ka], sku_at[kb] = b, a
+                    a = b
+                    improved += 1
+        swaps += improved
+        if improved == 0:
+            break
+
+    mapping = {skus[i]: (int(xy[cell_of[i], 0]), int(xy[cell_of[i], 1])) for i in range(n)}
+    placement = SKUPlacement(mapping)
+
+    if orders is not None and len(orders):
+        sample = list(orders)[:eval_orders]
+        before = _mean_tour_m(grid, baseline, sample)
+        after = _mean_tour_m(grid, placement, sample)
+    else:
+        p = f / f.sum() if f.sum() > 0 else f
+        before = _line_round_trip_m(grid, baseline, skus, p)
+        after = _line_round_trip_m(grid, placement, skus, p)
+
+    report = SlottingReport(
+        m_per_order_before=before,
+        m_per_order_after=after,
+        improvement_m_per_order=before - after,
+        improvement_pct=(100.0 * (before - after) / before) if before > 0 else 0.0,
+        objective_before=objective_before,
+        objective_after=obj.total(cell_of),
+        swaps=swaps,
+        passes=passes,
+    )
+    return placement, report
@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _dist_cache_in_tmp(tmp_path_factory):
+    """El cache de distancias en disco de los tests va a un tmp, nunca a ~/.cache."""
+    mp = pytest.MonkeyPatch()
+    mp.setenv("WAREHOUSE_DIST_CACHE", str(tmp_path_factory.mktemp("dist_cache")))
+    yield
+    mp.undo()
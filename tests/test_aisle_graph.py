@@ -0,0 +1,86 @@
+import random
+import numpy as np
+
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.layouts import rack_layout_spec
+from src.warehouse.routing import shortest_path_steps, distance_field
+from src.warehouse.aisle_graph import AisleGraph
+from src.warehouse.dist_cache import slot_matrix_array
+
+def _grid(cross=1):
+    return WarehouseGrid(rack_layout_spec(45, 40, block_length=16, cross_aisle_width=cross, margin=1,
+                                          station=(0, 0)))
+
+def _free_cells(grid):
+    ys, xs = np.nonzero(grid.free_mask())
+    return list(zip(xs.tolist(), ys.tolist()))
+
+def test_contraction_covers_every_cell():
+    grid = _grid()
+    g = AisleGraph(grid)
+    assert g.n_nodes * 4 <= g.n_cells                      # pasillos de ancho 1: contrae fuerte
+    free = grid.free_mask().ravel()
+    on_node = np.zeros_like(free)
+    on_node[g.node_cells] = True
+    assert np.array_equal(free, on_node | (g.cell_edge >= 0))
+    assert not (on_node & (g.cell_edge >= 0)).any()
+    assert int(g.edge_w.sum()) >= g.n_cells - g.n_nodes    # cada celda interior en una sola corrida
+
+def test_steps_and_paths_match_bfs():
+    grid = _grid(cross=2)
+    g = AisleGraph(grid, terminals=[(4, 5)])
+    cells = _free_cells(grid)
+    rng = random.Random(5)
+    for _ in range(150):
+        a, b = rng.choice(cells), rng.choice(cells)
+        ref = shortest_path_steps(grid, a, b)
+        assert g.steps(a, b) == ref
+        path = g.path(a, b)
+        assert path[0] == a and path[-1] == b and len(path) - 1 == ref
+        assert all(abs(x0 - x1) + abs(y0 - y1) == 1 for (x0, y0), (x1, y1) in zip(path, path[1:]))
+        assert all(grid.passable(c) for c in path)
+    blocked = tuple(grid.spec["obstacles"][0])
+    assert g.steps(blocked, cells[0]) == -1 and g.path(blocked, cells[0]) == []
+
+def test_search_settles_far_fewer_nodes_than_cells():
+    grid = _grid()
+    g = AisleGraph(grid)
+    g.steps((0, 0), (44, 39))
+    assert 0 < g.settled <= g.n_nodes < g.n_cells // 4
+
+def test_matrix_matches_distance_fields():
+    grid = _grid()
+    cells = _free_cells(grid)
+    sel = np.array(random.Random(1).sample(cells, 25) + [(99, 0)])
+    m = AisleGraph(grid).matrix(sel)
+    ref = np.full_like(m, -1)
+    for i, (x, y) in enumerate(sel[:-1].tolist()):
+        ref[i, :-1] = distance_field(grid, (x, y))[sel[:-1, 1], sel[:-1, 0]]
+    np.fill_diagonal(ref, 0)
+    assert np.array_equal(m, ref)
+    assert np.array_equal(slot_matrix_array(grid, sel[:-1]), m[:-1, :-1])
+
+def test_ring_without_junctions_and_disconnected_parts():
+    # anillo de grado 2 (sin cruces) + celda aislada
+    spec = {"width": 5, "height": 5, "station": {"x": 4, "y": 4}, "cell_size_m": 1.0,
+            "obstacles": [[1, 1], [2, 1], [1, 2], [2, 2], [3, 3], [4, 3], [3, 4], [4, 0], [3, 0],
+                          [4, 1], [4, 2], [0, 4], [1, 4], [2, 4], [0, 3]]}
+    grid = WarehouseGrid(spec)
+    g = AisleGraph(grid)
+    cells = _free_cells(grid)
+    for a in cells:
+        for b in cells:
+            assert g.steps(a, b) == shortest_path_steps(grid, a, b)
+
+def test_matrix_without_edges():
+    # tablero de ajedrez: toda celda libre queda aislada → grafo sin aristas
+    obst = [[x, y] for y in range(4) for x in range(4) if (x + y) % 2]
+    grid = WarehouseGrid({"width": 4, "height": 4, "station": {"x": 0, "y": 0}, "cell_size_m": 1.0,
+                          "obstacles": obst})
+    g = AisleGraph(grid)
+    assert g.n_edges == 0
+    sel = np.array(_free_cells(grid) + [(0, 0), (1, 0), (9, 9)])
+    m = g.matrix(sel)
+    ref = np.array([[shortest_path_steps(grid, tuple(a), tuple(b)) if i != j else 0
+                     for j, b in enumerate(sel.tolist())] for i, a in enumerate(sel.tolist())])
+    assert np.array_equal(m, ref)
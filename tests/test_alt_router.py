@@ -0,0 +1,96 @@
+import random
+import tracemalloc
+import numpy as np
+
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.layouts import rack_layout_spec
+from src.warehouse.routing import shortest_path_steps
+from src.warehouse.sku_map import generate_hotspot_map
+from src.warehouse.alt_router import ALTRouter
+from src.warehouse.dist_cache import DistanceCache, attach_router
+
+def _grid():
+    return WarehouseGrid(rack_layout_spec(40, 32, block_length=8, station=(0, 0)))
+
+def _free_cells(grid):
+    ys, xs = np.nonzero(grid.free_mask())
+    return list(zip(xs.tolist(), ys.tolist()))
+
+def test_alt_matches_bfs_on_random_pairs():
+    grid = _grid()
+    router = ALTRouter(grid, n_landmarks=8, cache_size=50)
+    assert router.F.shape == (8, 40 * 32) and router.F.dtype == np.int32
+    st = router.F[0][grid.stations_xy[0][1] * 40 + grid.stations_xy[0][0]]
+    assert st == max(shortest_path_steps(grid, grid.stations_xy[0], c) for c in _free_cells(grid))   # el más lejano
+    cells = _free_cells(grid)
+    rng = random.Random(3)
+    for _ in range(60):
+        a, b = rng.choice(cells), rng.choice(cells)
+        assert router.steps(a, b) == shortest_path_steps(grid, a, b)
+    # obstáculos y fuera de grilla como el BFS
+    blocked = tuple(grid.spec["obstacles"][0])
+    assert router.steps(blocked, cells[0]) == -1 == shortest_path_steps(grid, blocked, cells[0])
+    assert router.steps((99, 99), cells[0]) == -1
+
+def test_path_is_shortest_and_connected():
+    grid = _grid()
+    router = ALTRouter(grid, n_landmarks=6)
+    a, b = (0, 0), (39, 31)
+    path = router.path(a, b)
+    assert path[0] == a and path[-1] == b
+    assert len(path) - 1 == shortest_path_steps(grid, a, b)
+    assert all(abs(x0 - x1) + abs(y0 - y1) == 1 for (x0, y0), (x1, y1) in zip(path, path[1:]))
+    assert all(grid.passable(c) for c in path)
+
+def test_landmarks_prune_search_and_lru_is_bounded():
+    grid = _grid()
+    router = ALTRouter(grid, n_landmarks=12, cache_size=3)
+    cells = _free_cells(grid)
+    router.steps((0, 0), (39, 31))
+    # A* con landmarks expande poco más que el camino (un BFS recorre todo el piso)
+    assert router.expanded < len(cells) // 4
+    rng = random.Random(0)
+    for _ in range(10):
+        router.steps(rng.choice(cells), rng.choice(cells))
+    assert len(router._lru) == 3
+    before = router.hits
+    a, b = list(router._lru)[-1]
+    W = router.W
+    router.steps((b % W, b // W), (a % W, a // W))   # simétrico
+    assert router.hits == before + 1
+
+def test_query_cost_does_not_grow_with_floor():
+    grid = WarehouseGrid(rack_layout_spec(400, 400, station=(0, 0)))
+    router = ALTRouter(grid, n_landmarks=8, cache_size=0)
+    tracemalloc.start()
+    try:
+        assert router.steps((0, 0), (1, 0)) == 1
+        assert len(router.path((0, 0), (0, 2))) == 3
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # salto corto: nada del tamaño de la tabla de landmarks (L×N) por consulta
+    assert peak < router.F.nbytes // 100
+
+def test_unreachable_component():
+    spec = {"width": 9, "height": 5, "station": {"x": 0, "y": 0}, "cell_size_m": 1.0,
+            "obstacles": [[4, y] for y in range(5)]}
+    grid = WarehouseGrid(spec)
+    router = ALTRouter(grid, n_landmarks=4)
+    assert any(x > 4 for x, _ in router.landmarks)     # cubre la componente aislada
+    assert router.steps((0, 0), (8, 4)) == -1
+    assert router.path((0, 0), (8, 4)) == []
+    assert router.steps((5, 0), (8, 4)) == 7
+
+def test_attach_router_switches_to_alt_for_many_slots(tmp_path):
+    grid = _grid()
+    skus = [f"S{i:04d}" for i in range(1, 61)]
+    placement = generate_hotspot_map(grid, skus[:10], skus[10:])
+    router = attach_router(grid, placement, DistanceCache(tmp_path), max_slots=10)
+    assert isinstance(router, ALTRouter) and grid.router is router
+    assert list((tmp_path).rglob("field_*.npy"))          # landmarks en el cache
+    coords = list(placement.sku_to_coord.values())
+    grid.router = None
+    ref = shortest_path_steps(grid, coords[0], coords[-1])
+    grid.router = router
+    assert shortest_path_steps(grid, coords[0], coords[-1]) == ref
@@ -0,0 +1,62 @@
+import numpy as np
+
+from src.sim.engine import Simulator, SimConfig
+from src.sim.checkpoint import take_checkpoint
+from src.sim.histogram import WaitHistogram
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.layouts import rack_layout_spec
+from src.warehouse.sku_map import SKUPlacement
+from src.demand.generator import make_orders
+from src.visual.series import StepSeries, GanttBars, analysis_arrays
+
+def test_step_decimation_keeps_envelope_and_is_bounded():
+    rng = np.random.default_rng(0)
+    t = np.cumsum(rng.exponential(0.1, 200_000))
+    y = rng.integers(0, 50, len(t)).astype(float)
+    y[123_456] = 500.0                                  # pico de una sola muestra
+    s = StepSeries(t, y)
+    x, yy = s.decimate(400)
+    assert len(x) == len(yy) == 4 * 400
+    assert yy.max() == 500.0 and yy.min() == y.min()
+    assert np.all(np.diff(x) >= 0)
+    # ventana: el pico queda afuera
+    x2, y2 = s.decimate(400, t0=t[0], t1=t[100_000])
+    assert y2.max() < 500.0 and x2[-1] == t[100_000]
+    # serie corta: escalones exactos
+    x3, y3 = StepSeries([0.0, 1.0, 3.0], [0, 2, 1]).decimate(100)
+    assert x3.tolist() == [0.0, 1.0, 1.0, 3.0, 3.0, 3.0] and y3.tolist() == [0, 0, 2, 2, 1, 1]
+
+def test_gantt_bars_merge_to_pixel_resolution():
+    bars = {0: [(i * 1.0, 0.9) for i in range(10_000)], 1: [(5.0, 2.0)], 2: []}
+    g = GanttBars.from_analytics(bars)
+    verts, yticks, labels = g.verts(200)
+    assert verts.shape[1:] == (4, 2) and len(verts) <= 200 + 1
+    assert labels == ["P0", "P1"] and len(yticks) == 2
+    assert verts[:, :, 0].min() == 0.0 and np.isclose(verts[:, :, 0].max(), 9999.9)
+    fine, _, _ = g.verts(200, t0=0.0, t1=10.0)            # zoom: barras separadas
+    assert len(fine) == 10 + 1
+
+def test_wait_histogram_streams_and_feeds_analysis():
+    h = WaitHistogram(n_bins=8, width=1.0)
+    for x in [0.5, 1.5, 1.7, 30.0]:
+        h.add(x)
+    assert h.width == 4.0 and h.counts.sum() == 4 and h.counts[0] == 3
+    assert np.array_equal(WaitHistogram.from_values([0.5, 1.5, 1.7, 30.0], n_bins=8, width=1.0).counts, h.counts)
+    assert 0 < h.quantile(0.5) <= 4.0 and h.quantile(1.0) == 30.0
+
+    grid = WarehouseGrid(rack_layout_spec(20, 16, block_length=6, station=(0, 0)))
+    placement = SKUPlacement.random_sample(grid, n_skus=30, seed=2)
+    orders = make_orders(seed=2, horizon=60, lam=1.5, n_skus=30)[2]
+    sim = Simulator(grid, placement, orders, SimConfig(policy="Secuencial_FCFS", n_pickers=2,
+                                                       speed_m_per_min=30.0, trace=False))
+    sim.run_until(30.0)
+    ck = take_checkpoint(sim)
+    res = sim.run()
+    res.analytics = sim.analytics
+    hist = sim.analytics["wait_hist"]
+    assert hist.n == len(sim.analytics["waits"]) == len(res.waits_raw)
+    assert ck.state["analytics"]["wait_hist"].n < hist.n
+    assert abs(hist.quantile(0.95) - res.wait_p95_min) <= hist.width
+    arr = analysis_arrays(res)
+    assert analysis_arrays(res) is arr and arr.waits is hist
+    assert len(arr.queue) == len(sim.analytics["queue_t"]) and arr.gantt.n_bars() > 0
@@ -0,0 +1,87 @@
+import os
+import numpy as np
+
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.layouts import rack_layout_spec
+from src.warehouse.routing import distance_field, shortest_path_steps
+from src.warehouse.sku_map import generate_hotspot_map
+from src.warehouse.dist_cache import DistanceCache, layout_hash, attach_router, CACHE_VERSION
+from src.demand.generator import make_orders
+from src.picking.tours import order_tour, batch_tour
+
+def _grid():
+    return WarehouseGrid(rack_layout_spec(24, 24, block_length=8, station=(0, 0)))
+
+def _placement(grid):
+    skus = [f"S{i:04d}" for i in range(1, 41)]
+    return generate_hotspot_map(grid, skus[:8], skus[8:])
+
+def test_fields_are_persisted_and_mmapped_read_only(tmp_path):
+    grid = _grid()
+    a = DistanceCache(tmp_path)
+    f = a.station_field(grid)
+    assert np.array_equal(f, distance_field(grid, grid.stations_xy))
+    assert a.misses == 1 and a.hits == 0
+    b = DistanceCache(tmp_path)              # otro proceso: lee del disco
+    g = b.field(grid, (5, 0)), b.station_field(grid)
+    assert b.hits == 1 and isinstance(g[1], np.memmap) and not g[1].flags.writeable
+    assert (tmp_path / f"v{CACHE_VERSION}" / layout_hash(grid) / "station_field.npy").exists()
+
+def test_layout_hash_tracks_obstacles_and_stations():
+    base = _grid()
+    spec = dict(base.spec, obstacles=list(base.spec["obstacles"])[:-1])
+    moved = dict(base.spec, station={"x": 1, "y": 0})
+    hashes = {layout_hash(base), layout_hash(WarehouseGrid(spec)), layout_hash(WarehouseGrid(moved))}
+    assert len(hashes) == 3
+    assert layout_hash(_grid()) == layout_hash(base)
+
+def test_router_matches_bfs_tours(tmp_path):
+    grid = _grid()
+    placement = _placement(grid)
+    orders = make_orders(seed=2, horizon=20, lam=1.0, n_skus=40)[2]
+    ref = [order_tour(grid, placement, o, return_to_station=True).meters for o in orders]
+    ref_b = batch_tour(grid, placement, orders[:6], return_to_station=True).meters
+
+    router = attach_router(grid, placement, DistanceCache(tmp_path))
+    assert grid.router is router
+    coords = list(router.index)
+    for a, b in [(coords[0], coords[-1]), (coords[3], coords[7])]:
+        grid.router = None
+        d = shortest_path_steps(grid, a, b)
+        grid.router = router
+        assert router.steps(a, b) == d
+    assert [order_tour(grid, placement, o, return_to_station=True).meters for o in orders] == ref
+    assert batch_tour(grid, placement, orders[:6], return_to_station=True).meters == ref_b
+    assert router.steps((99, 99), coords[0]) is None
+
+def test_eviction_by_size_and_old_versions(tmp_path):
+    grid = _grid()
+    old = tmp_path / "v0" / "x"
+    old.mkdir(parents=True)
+    (old / "stale.npy").write_bytes(b"0" * 10)
+    cache = DistanceCache(tmp_path, max_bytes=10 ** 9)
+    first = cache.field(grid, (0, 0))
+    assert not (tmp_path / "v0").exists()
+    path0 = tmp_path / f"v{CACHE_VERSION}" / layout_hash(grid) / "field_0_0.npy"
+    os.utime(path0, (1, 1))                   # el menos usado
+    cache.field(grid, (1, 0))
+    cache.evict(max_bytes=cache.size_bytes() - 1)
+    assert not path0.exists() and cache.size_bytes() > 0
+    assert np.array_equal(cache.field(grid, (0, 0)), first)   # se reconstruye igual
+
+def test_memory_only_when_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("WAREHOUSE_DIST_CACHE", "off")
+    from src.warehouse.dist_cache import default_cache
+    cache = default_cache()
+    assert cache.root is None
+    f = cache.station_field(_grid())
+    assert not f.flags.writeable and cache.size_bytes() == 0
+
+def test_disk_cache_is_opt_in(tmp_path, monkeypatch):
+    from src.warehouse.dist_cache import default_cache_dir, enable_disk_cache, ENV_VAR
+    monkeypatch.delenv(ENV_VAR, raising=False)
+    assert default_cache_dir() is None                       # librería: sólo memoria
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert enable_disk_cache() == tmp_path / "warehouse_sim" / "dist"
+    monkeypatch.setenv(ENV_VAR, "off")
+    assert enable_disk_cache() is None                       # "off" gana
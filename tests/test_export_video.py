@@ -0,0 +1,61 @@
+import numpy as np
+from PIL import Image
+
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.layouts import rack_layout_spec
+from src.warehouse.sku_map import SKUPlacement
+from src.demand.generator import make_orders
+from src.sim.engine import Simulator, SimConfig
+from src.visual.export import (
+    frames_to_arrays, render_frames, export_video, meta_for_grid, RenderStyle, find_ffmpeg
+)
+
+def _run():
+    grid = WarehouseGrid(rack_layout_spec(20, 16, block_length=6, station=(0, 0)))
+    placement = SKUPlacement.random_sample(grid, n_skus=30, seed=1)
+    orders = make_orders(seed=1, horizon=20, lam=1.0, n_skus=30)[2]
+    sim = Simulator(grid, placement, orders, SimConfig(policy="Batching_Size", n_pickers=2, batch_size=3,
+                                                       speed_m_per_min=30.0, horizon_min=20))
+    sim.run()
+    return meta_for_grid(grid), sim.trace_frames
+
+def test_delta_timeline_is_forward_filled_and_resampled():
+    frames = [
+        {"t": 0.0, "pickers": [{"picker_id": 0, "x": 0, "y": 0, "state": "idle"},
+                               {"picker_id": 1, "x": 5, "y": 5, "state": "idle"}]},
+        {"t": 0.6, "pickers": [{"picker_id": 1, "x": 6, "y": 5, "state": "moving"}]},
+        {"t": 1.0, "pickers": [{"picker_id": 0, "x": 1, "y": 0, "state": "moving"}]},
+    ]
+    a = frames_to_arrays(frames, dt=0.25)
+    assert np.allclose(a.t, [0.0, 0.25, 0.5, 0.75, 1.0])
+    assert a.xy.shape == (5, 2, 2)
+    assert a.xy[3].tolist() == [[0, 0], [6, 5]] and a.moving[3].tolist() == [False, True]
+    assert a.xy[4].tolist() == [[1, 0], [6, 5]]
+    assert len(frames_to_arrays(frames, dt=None)) == 3
+    assert len(frames_to_arrays(frames, dt=0.25, max_frames=2)) == 2
+
+def test_parallel_render_matches_serial(tmp_path):
+    meta, frames = _run()
+    arrays = frames_to_arrays(frames, dt=0.5, max_frames=12)
+    style = RenderStyle(width_px=200)
+    serial = render_frames(meta, arrays, tmp_path / "a", procs=1, style=style)
+    parallel = render_frames(meta, arrays, tmp_path / "b", procs=3, style=style)
+    assert len(serial) == len(parallel) == 12
+    for p, q in zip(serial, parallel):
+        assert np.array_equal(np.asarray(Image.open(p)), np.asarray(Image.open(q)))
+    assert np.asarray(Image.open(serial[0])).shape == (160, 200, 3)
+
+def test_export_gif_and_png_fallback(tmp_path):
+    meta, frames = _run()
+    out, n = export_video(meta, frames, tmp_path / "run.gif", dt=1.0, procs=2, style=RenderStyle(width_px=160))
+    assert out == tmp_path / "run.gif" and Image.open(out).n_frames == n
+    assert not (tmp_path / "run_frames").exists()
+    out, n = export_video(meta, frames, tmp_path / "pngs", dt=2.0, procs=1, style=RenderStyle(width_px=160))
+    assert out.is_dir() and len(list(out.glob("frame_*.png"))) == n
+    if find_ffmpeg() is None:
+        try:
+            import imageio  # noqa: F401
+        except ImportError:
+            out, n = export_video(meta, frames, tmp_path / "run.mp4", dt=2.0, procs=1,
+                                  style=RenderStyle(width_px=160))
+            assert out == tmp_path / "run_frames" and len(list(out.glob("*.png"))) == n
@@ -0,0 +1,60 @@
+import numpy as np
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+from src.demand.generator import make_orders
+from src.sim.engine import Simulator, SimConfig
+from src.sim.events import Job
+from src.sim.fastpath import fast_path_supported, fifo_schedule, run_fast, simulate
+from src.sim.job_cache import JobCache
+
+KPIS = ["makespan_min", "orders_completed", "throughput_per_hour", "avg_wait_min", "picker_utilization",
+        "wait_p90_min", "wait_p95_min", "distance_total_m", "distance_per_order_avg_m",
+        "picker_idle_min", "picker_tours", "waits_raw", "gantt", "ts_completed"]
+
+def test_fifo_schedule_single_server_is_lindley():
+    start, end, server = fifo_schedule(np.array([0.0, 1.0, 1.5, 10.0]), np.array([2.0, 2.0, 1.0, 1.0]), 1)
+    assert start.tolist() == [0.0, 2.0, 4.0, 10.0]
+    assert end.tolist() == [2.0, 4.0, 5.0, 11.0]
+    assert server.tolist() == [0, 0, 0, 0]
+
+def test_fifo_schedule_ties_go_to_lowest_pid_and_horizon_cuts():
+    start, _, server = fifo_schedule(np.array([0.0, 0.0, 0.0, 0.5]), np.array([1.0, 1.0, 1.0, 1.0]), 2, horizon=0.9)
+    assert server.tolist() == [0, 1]
+    assert start.tolist() == [0.0, 0.0]
+
+def test_supported_only_without_congestion_zones_or_trace():
+    base = dict(policy="Secuencial_FCFS", n_pickers=2, speed_m_per_min=60.0)
+    assert fast_path_supported(SimConfig(trace=False, **base))
+    assert not fast_path_supported(SimConfig(**base))                       # traza visual
+    assert not fast_path_supported(SimConfig(trace=False, congestion="light", **base))
+    assert not fast_path_supported(SimConfig(trace=False, profile=True, **base))
+
+def test_fast_path_matches_simulator_on_real_jobs():
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    placement = SKUPlacement.random_sample(grid, n_skus=40, seed=9)
+    orders = make_orders(seed=9, horizon=20, lam=0.8, n_skus=40)[2]
+    cache = JobCache(orders, grid, placement)
+    for policy in ["Secuencial_FCFS", "Batching_Size", "Batching_Time"]:
+        for n_pickers, horizon in [(1, 20), (3, 20), (3, None)]:
+            cfg = SimConfig(policy=policy, n_pickers=n_pickers, speed_m_per_min=50.0, horizon_min=horizon,
+                            batch_size=3, time_threshold_min=2.0, trace=False)
+            jobs, paths = cache.for_config(cfg)
+            ref = Simulator(grid, placement, orders, cfg, jobs=jobs, path_cache=paths).run()
+            res = simulate(grid, placement, orders, cfg, jobs=jobs, path_cache=paths)
+            for k in KPIS:
+                assert getattr(res, k) == getattr(ref, k), (policy, n_pickers, horizon, k)
+
+def test_fast_path_matches_simulator_on_synthetic_load():
+    rng = np.random.default_rng(1)
+    arr = np.sort(rng.uniform(0, 300, 2000))
+    svc = rng.exponential(1.4, 2000)
+    jobs = [Job(job_id=i, arrival_min=float(a), service_min=float(s), n_orders=1, meters=float(s) * 60)
+            for i, (a, s) in enumerate(zip(arr, svc))]
+    cfg = SimConfig(policy="Secuencial_FCFS", n_pickers=9, speed_m_per_min=60.0, horizon_min=280, trace=False)
+    paths = {j.job_id: [(0, 0), (0, 1)] for j in jobs}
+    ref = Simulator(WarehouseGrid(WarehouseGrid.default_spec()), None, [], cfg, jobs=jobs, path_cache=paths).run()
+    res = run_fast(jobs, cfg, path_len=lambda j: 1.0)
+    for k in KPIS:
+        assert getattr(res, k) == getattr(ref, k), k
+    lite = run_fast(jobs, cfg, path_len=lambda j: 1.0, series=False)
+    assert lite.avg_wait_min == ref.avg_wait_min and lite.gantt == [[] for _ in range(9)]
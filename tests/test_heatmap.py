@@ -0,0 +1,68 @@
+import numpy as np
+
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.layouts import rack_layout_spec
+from src.warehouse.sku_map import generate_hotspot_map
+from src.demand.generator import make_orders
+from src.sim.engine import Simulator, SimConfig
+from src.sim.checkpoint import take_checkpoint
+from src.sim.heatmap import FloorHeatmap
+from src.sim.fastpath import fast_path_supported
+
+def _env():
+    grid = WarehouseGrid(rack_layout_spec(24, 20, block_length=6, station=(0, 0)))
+    skus = [f"S{i:04d}" for i in range(1, 41)]
+    placement = generate_hotspot_map(grid, skus[:8], skus[8:])
+    orders = make_orders(seed=3, horizon=60, lam=1.0, n_skus=40)[2]
+    return grid, placement, orders
+
+def test_add_path_counts_entries_dwell_and_pick_stops():
+    hm = FloorHeatmap(5, 4)
+    path = [(0, 0), (1, 0), (2, 0), (2, 0), (2, 1), (1, 1)]      # parada en (2, 0)
+    hm.add_path(path, duration_min=5.0)
+    assert hm.traversal[0, 1] == 1 and hm.traversal[0, 2] == 1 and hm.traversal[1, 2] == 1
+    assert hm.traversal.sum() == 4                                 # el paso nulo no es una entrada
+    assert np.isclose(hm.dwell_min[0, 2], 2.0) and np.isclose(hm.dwell_min.sum(), 5.0)
+    hm.add_picks([(2, 0), (2, 0), (9, 9)])                         # fuera de grilla: se ignora
+    assert hm.picks[0, 2] == 2 and hm.picks.sum() == 2
+    assert hm.hottest("picks", 3) == [(2, 0, 2)]
+
+def test_streaming_heatmap_without_trace_matches_run():
+    grid, placement, orders = _env()
+    cfg = SimConfig(policy="Batching_Size", n_pickers=2, speed_m_per_min=40.0, batch_size=4,
+                    trace=False, heatmap=True)
+    assert not fast_path_supported(cfg)
+    res = Simulator(grid, placement, orders, cfg).run()
+    hm = res.heatmap
+    busy = sum(t1 - t0 for row in res.gantt for (t0, t1, _) in row)
+    assert np.isclose(hm.dwell_min.sum(), busy)
+    assert hm.jobs == sum(res.picker_tours)
+    assert not hm.traversal[grid.blocked_mask()].any()             # no cruza racks
+    lines = sum(len(o.items) for o in orders)
+    assert 0 < hm.picks.sum() <= lines
+    picked = hm.picks > 0
+    assert set(zip(*np.nonzero(picked)[::-1])) <= set(placement.sku_to_coord.values())
+
+    off = Simulator(grid, placement, orders, SimConfig(policy="Batching_Size", n_pickers=2,
+                                                       speed_m_per_min=40.0, batch_size=4, trace=False)).run()
+    assert off.heatmap is None and off.distance_total_m == res.distance_total_m
+
+def test_checkpoint_copies_heatmap_and_weights_feed_slotting():
+    grid, placement, orders = _env()
+    cfg = SimConfig(policy="Secuencial_FCFS", n_pickers=2, speed_m_per_min=40.0, trace=False, heatmap=True)
+    sim = Simulator(grid, placement, orders, cfg)
+    sim.run_until(30.0)
+    ck = take_checkpoint(sim)
+    before = ck.state["heatmap"].traversal.copy()
+    sim.run_until(1e9)
+    full = sim.finalize()
+    assert np.array_equal(ck.state["heatmap"].traversal, before)
+    resumed = ck.restore()
+    resumed.run_until(1e9)
+    assert np.array_equal(resumed.finalize().heatmap.traversal, full.heatmap.traversal)
+
+    skus = list(placement.sku_to_coord)
+    w = full.heatmap.sku_weights(placement, skus)
+    assert w.shape == (len(skus),) and w.sum() == full.heatmap.picks.sum()
+    merged = full.heatmap.copy().merge(full.heatmap)
+    assert merged.jobs == 2 * full.heatmap.jobs and merged.picks.sum() == 2 * full.heatmap.picks.sum()
@@ -0,0 +1,56 @@
+import numpy as np
+
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.layouts import rack_layout_spec
+from src.warehouse.routing import shortest_path_steps
+from src.warehouse.sku_map import generate_hotspot_map
+from src.warehouse.dist_cache import DistanceCache
+from src.picking.paths import HopPathCache, manhattan_path, hop_cache
+from src.picking.tours import order_tour_path, batch_tour_path
+from src.demand.generator import make_orders
+
+def _racks():
+    return WarehouseGrid(rack_layout_spec(30, 24, block_length=8, station=(0, 0)))
+
+def _contiguous(path):
+    d = np.abs(np.diff(path.astype(np.int32), axis=0)).sum(axis=1)
+    return bool(np.all(d <= 1))
+
+def test_open_grid_keeps_manhattan_shape():
+    grid = WarehouseGrid({"width": 12, "height": 9, "station": {"x": 0, "y": 0}, "obstacles": []})
+    cache = HopPathCache(grid, dist_cache=DistanceCache(None))
+    for a, b in [((0, 0), (7, 5)), ((9, 8), (2, 1)), ((3, 3), (3, 8)), ((4, 4), (4, 4))]:
+        p = cache.get(a, b)
+        assert p.dtype == np.int16 and not p.flags.writeable
+        assert np.array_equal(p, manhattan_path(a, b))
+
+def test_hops_go_around_racks():
+    grid = _racks()
+    cache = HopPathCache(grid, dist_cache=DistanceCache(None))
+    a, b = (4, 5), (13, 15)                            # dos pasillos, la L cruza racks
+    assert any(not grid.passable(tuple(c)) for c in manhattan_path(a, b).tolist())
+    p = cache.get(a, b)
+    assert tuple(p[0]) == a and tuple(p[-1]) == b
+    assert len(p) - 1 == shortest_path_steps(grid, a, b)
+    assert _contiguous(p) and all(grid.passable(tuple(c)) for c in p.tolist())
+
+def test_cache_is_bounded_and_keyed_by_direction():
+    grid = _racks()
+    cache = HopPathCache(grid, max_items=2, dist_cache=DistanceCache(None))
+    p = cache.get((4, 5), (13, 15))
+    assert cache.get((4, 5), (13, 15)) is p and cache.hits == 1
+    back = cache.get((13, 15), (4, 5))
+    assert len(back) == len(p) and tuple(back[0]) == (13, 15)
+    cache.get((0, 0), (5, 1))
+    assert len(cache) == 2 and cache.get((4, 5), (13, 15)) is not p      # desalojado (LRU)
+
+def test_job_paths_respect_obstacles():
+    grid = _racks()
+    skus = [f"S{i:04d}" for i in range(1, 31)]
+    placement = generate_hotspot_map(grid, skus[:5], skus[5:])
+    orders = make_orders(seed=4, horizon=15, lam=1.0, n_skus=30)[2]
+    for path in [order_tour_path(grid, placement, o) for o in orders[:5]] + [batch_tour_path(grid, placement, orders[:6])]:
+        assert path.dtype == np.int16 and path.shape[1] == 2
+        assert tuple(path[0]) == (0, 0) and tuple(path[-1]) == (0, 0)
+        assert _contiguous(path) and all(grid.passable(tuple(c)) for c in path.tolist())
+    assert hop_cache(grid).hits > 0                    # tramos estación → slot compartidos
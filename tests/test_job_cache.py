@@ -0,0 +1,41 @@
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+from src.demand.generator import make_orders
+from src.sim.engine import Simulator, SimConfig
+from src.sim.job_cache import JobCache
+
+def _env():
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    placement = SKUPlacement.random_sample(grid, n_skus=40, seed=5)
+    orders = make_orders(seed=5, horizon=30, lam=0.6, n_skus=40)[2]
+    return grid, placement, orders
+
+def test_plan_routed_once_per_policy_param():
+    grid, placement, orders = _env()
+    cache = JobCache(orders, grid, placement)
+    a = cache.jobs("Batching_Size", 60.0, batch_size=4)
+    assert cache.jobs("Batching_Size", 60.0, batch_size=4) is a
+    b = cache.jobs("Batching_Size", 30.0, batch_size=4)
+    assert cache.plan_builds == 1
+    assert [j.meters for j in a] == [j.meters for j in b]
+    assert all(abs(jb.service_min - 2 * ja.service_min) < 1e-9 for ja, jb in zip(a, b))
+    cache.jobs("Batching_Size", 60.0, batch_size=6)
+    cache.jobs("Secuencial_FCFS", 60.0, batch_size=6)   # el parámetro no aplica a FCFS
+    cache.jobs("Secuencial_FCFS", 60.0, batch_size=9)
+    assert cache.plan_builds == 3
+
+def test_cached_jobs_reproduce_uncached_run():
+    grid, placement, orders = _env()
+    cache = JobCache(orders, grid, placement)
+    for n_pickers, congestion in [(1, "off"), (2, "light"), (2, "aisle")]:
+        cfg = SimConfig(policy="Batching_Time", n_pickers=n_pickers, speed_m_per_min=60.0, congestion=congestion,
+                        time_threshold_min=3.0, horizon_min=30, trace=False)
+        ref = Simulator(grid, placement, orders, cfg).run()
+        jobs, paths = cache.for_config(cfg)
+        res = Simulator(grid, placement, orders, cfg, jobs=jobs, path_cache=paths).run()
+        assert res.orders_completed == ref.orders_completed
+        assert res.avg_wait_min == ref.avg_wait_min
+        assert res.distance_total_m == ref.distance_total_m
+        assert res.congestion_blocks == ref.congestion_blocks
+    assert cache.plan_builds == 1
+    assert len(paths) > 0
@@ -0,0 +1,39 @@
+import numpy as np
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.layouts import rack_layout_spec, pick_face_mask
+from src.warehouse.routing import distance_field, shortest_path_steps
+from src.warehouse.sku_map import generate_hotspot_map, SKUPlacement
+
+def test_rack_layout_has_aisles_and_free_station():
+    spec = rack_layout_spec(width=40, height=30, rack_depth=2, aisle_width=1, block_length=8, margin=2)
+    grid = WarehouseGrid(spec)
+    blocked = grid.blocked_mask()
+    assert blocked.shape == (30, 40)
+    assert not blocked[0, 0]                       # estación libre
+    assert not blocked[:2, :].any()                # pasillo perimetral frontal
+    assert blocked[2, 2] and blocked[2, 3] and not blocked[2, 4]  # rack de 2 + pasillo
+    assert len(grid.free_cells()) == int((~blocked).sum())
+
+def test_distance_field_matches_bfs():
+    grid = WarehouseGrid(rack_layout_spec(width=30, height=24, block_length=6))
+    field = distance_field(grid, grid.station_xy)
+    for goal in [(4, 10), (19, 3), (28, 22)]:
+        if grid.passable(goal):
+            assert field[goal[1], goal[0]] == shortest_path_steps(grid, grid.station_xy, goal)
+
+def test_hotspot_popular_nearer_and_on_pick_faces():
+    grid = WarehouseGrid(rack_layout_spec(width=60, height=50))
+    popular = [f"P{i}" for i in range(20)]
+    others = [f"O{i}" for i in range(200)]
+    placement = generate_hotspot_map(grid, popular, others)
+    field = distance_field(grid, grid.stations_xy)
+    faces = pick_face_mask(grid)
+    d = lambda s: field[placement.coord_of(s)[1], placement.coord_of(s)[0]]
+    assert max(d(s) for s in popular) <= min(d(s) for s in others)
+    assert all(faces[y, x] for (x, y) in (placement.coord_of(s) for s in popular + others))
+
+def test_random_sample_skips_racks():
+    grid = WarehouseGrid(rack_layout_spec(width=30, height=30))
+    placement = SKUPlacement.random_sample(grid, n_skus=100, seed=1)
+    assert all(grid.passable(placement.coord_of(s)) for s in placement.skus())
+    assert np.unique([placement.coord_of(s) for s in placement.skus()], axis=0).shape[0] == 100
@@ -0,0 +1,49 @@
+import numpy as np
+from src.demand.rng import RNG
+from src.demand.arrivals import NonHomogeneousPoissonArrivals, make_arrivals, PoissonArrivals
+from src.demand.generator import make_orders
+
+PEAK = [(0.0, 0.5), (60.0, 3.0), (120.0, 0.5)]  # pico de 60 a 120 min
+
+def test_piecewise_counts_follow_profile():
+    pa = NonHomogeneousPoissonArrivals(rate=PEAK, horizon_min=180, rng=RNG(seed=1))
+    t = np.array(pa.sample_times())
+    assert np.all(np.diff(t) >= 0) and t.min() >= 0.0 and t.max() <= 180.0
+    in_peak = np.sum((t >= 60) & (t < 120))
+    assert in_peak > 3 * np.sum(t < 60)
+    assert abs(len(t) - pa.expected_count()) < 4 * np.sqrt(pa.expected_count())
+
+def test_callable_rate_uses_thinning_and_is_reproducible():
+    rate = lambda t: 1.0 + np.sin(np.asarray(t) / 30.0) ** 2
+    t1 = NonHomogeneousPoissonArrivals(rate=rate, horizon_min=240, rng=RNG(seed=5)).sample_times()
+    t2 = NonHomogeneousPoissonArrivals(rate=rate, horizon_min=240, rng=RNG(seed=5)).sample_times()
+    assert t1 == t2 and len(t1) > 0
+    assert all(0.0 <= x <= 240.0 for x in t1)
+
+def test_compound_arrivals_repeat_epochs():
+    pa = NonHomogeneousPoissonArrivals(rate=[(0.0, 0.5)], horizon_min=200, rng=RNG(seed=3), batch_mean=3.0)
+    t = pa.sample_times()
+    assert len(t) > len(set(t))  # hay épocas con varios pedidos simultáneos
+
+def test_default_path_stays_homogeneous_poisson():
+    assert isinstance(make_arrivals(0.4, 60, RNG(seed=1)), PoissonArrivals)
+    orders_a = make_orders(seed=9, horizon=180, lam=0.5)[2]
+    orders_b = make_orders(seed=9, horizon=180, lam=0.5, rate_profile=PEAK)[2]
+    assert orders_a and orders_b
+    assert len(orders_b) > len(orders_a)  # el pico agrega demanda
+
+def test_thinning_bound_is_checked_on_proposed_points():
+    # λ = 0.5 justo en los puntos de la malla de estimación y 5.0 entre ellos:
+    # la cota estimada (0.55) queda corta y hay que re-muestrear con una mayor
+    def tricky(t):
+        u = np.asarray(t) * 4096 / 200
+        return np.where(np.isclose(u, np.round(u)), 0.5, 5.0)
+    t = NonHomogeneousPoissonArrivals(rate=tricky, horizon_min=200, rng=RNG(seed=4)).sample_times()
+    assert abs(len(t) - 1000) < 4 * np.sqrt(1000)
+    try:
+        NonHomogeneousPoissonArrivals(rate=lambda t: np.full(np.shape(t), 2.0), horizon_min=50,
+                                      rng=RNG(seed=1), lam_max=1.0).sample_times()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("lam_max explícito menor que λ(t) debería fallar")
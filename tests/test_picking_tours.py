@@ -48,3 +48,19 @@ def test_order_tour_return_to_station_adds_distance():
     tr1 = order_tour(grid, placement, o, return_to_station=False)
     tr2 = order_tour(grid, placement, o, return_to_station=True)
     assert tr2.steps > tr1.steps
+
+def test_tours_do_not_depend_on_hash_seed():
+    import os, subprocess, sys
+    code = (
+        "from src.experiments.runner import _env\n"
+        "from src.picking.tours import order_tour, batch_tour\n"
+        "g, p, o = _env(7, 120, 0.8, 60, 'uniforme')\n"
+        "print(sum(order_tour(g, p, x, return_to_station=True).steps for x in o),\n"
+        "      [batch_tour(g, p, o[i:i + 5], return_to_station=True).steps for i in range(0, len(o), 5)])\n"
+    )
+    outs = set()
+    for seed in ("0", "1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=os.getcwd())
+        outs.add(subprocess.run([sys.executable, "-c", code], env=env, capture_output=True,
+                                text=True, check=True).stdout)
+    assert len(outs) == 1
@@ -0,0 +1,86 @@
+import numpy as np
+from src.demand.orders import Order
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.layouts import rack_layout_spec
+from src.warehouse.sku_map import SKUPlacement
+from src.warehouse.dist_cache import DistanceCache, attach_router, router_matrix
+from src.picking.batching import ProximityBatching
+from src.picking.tours import batch_tour
+from src.sim.engine import Simulator, SimConfig
+
+def _order(t, skus):
+    return Order(arrival_min=t, items=list(skus), item_counts={s: 1 for s in skus})
+
+def _env():
+    # dos “barrios” en esquinas opuestas; pedidos alternados entre ambos
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    mapping = {"A1": (2, 18), "A2": (3, 19), "A3": (2, 17), "B1": (18, 2), "B2": (19, 3), "B3": (17, 2)}
+    placement = SKUPlacement(mapping)
+    orders = [_order(0.1 * k, [("A" if k % 2 == 0 else "B") + str(1 + k % 3)]) for k in range(8)]
+    return grid, placement, orders
+
+def test_savings_matrix_matches_bruteforce():
+    rng = np.random.default_rng(0)
+    lo = rng.integers(0, 10, size=(6, 2))
+    box = np.stack([lo[:, 0], lo[:, 0] + rng.integers(0, 5, 6), lo[:, 1], lo[:, 1] + rng.integers(0, 5, 6)], axis=1)
+    s = ProximityBatching.savings_matrix(box)
+    L = lambda b: 2 * ((b[1] - b[0]) + (b[3] - b[2]))
+    for i in range(6):
+        for j in range(6):
+            if i == j:
+                continue
+            u = (min(box[i, 0], box[j, 0]), max(box[i, 1], box[j, 1]), min(box[i, 2], box[j, 2]), max(box[i, 3], box[j, 3]))
+            assert s[i, j] == L(box[i]) + L(box[j]) - L(u)
+
+def test_groups_neighbours_and_respects_capacity_and_windows():
+    grid, placement, orders = _env()
+    pb = ProximityBatching(window_min=5.0, capacity=4, coords_fn=lambda o: [placement.coord_of(s) for s in o.item_counts],
+                           depot=grid.station_xy)
+    batches = pb.make_batches(orders)
+    assert sorted(id(o) for b in batches for o in b.orders) == sorted(id(o) for o in orders)
+    assert [len(b.orders) for b in batches] == [4, 4]
+    for b in batches:
+        zones = {next(iter(o.item_counts))[0] for o in b.orders}
+        assert len(zones) == 1                               # nunca mezcla esquinas opuestas
+        assert b.release_min == 5.0
+    # ventana corta: cada ventana se libera por separado
+    short = ProximityBatching(0.25, 3, lambda o: [placement.coord_of(s) for s in o.item_counts], grid.station_xy)
+    releases = sorted({round(b.release_min, 6) for b in short.make_batches(orders)})
+    assert releases == [0.25, 0.55, 0.85]                   # ventanas [0, .2], [.3, .5], [.6, .7]
+
+def test_fewer_meters_than_arrival_order_batches():
+    grid, placement, orders = _env()
+    coords = lambda o: [placement.coord_of(s) for s in o.item_counts]
+    prox = [b.orders for b in ProximityBatching(5.0, 4, coords, grid.station_xy).make_batches(orders)]
+    fifo = [orders[i:i + 4] for i in range(0, len(orders), 4)]
+    m = lambda bs: sum(batch_tour(grid, placement, b, return_to_station=True).meters for b in bs)
+    assert len(prox) == len(fifo)
+    assert m(prox) < m(fifo)
+
+def test_savings_use_step_matrix_across_racks():
+    # A* en el pasillo x=4, B* en x=7: la caja los ve vecinos, el rack del medio no
+    grid = WarehouseGrid(rack_layout_spec(24, 40, block_length=30, station=(0, 0)))
+    placement = SKUPlacement({"A1": (4, 14), "A2": (4, 24), "B1": (7, 14), "B2": (7, 24)})
+    orders = [_order(0.1 * k, [s]) for k, s in enumerate(["A1", "B1", "A2", "B2"])]
+    coords = lambda o: [placement.coord_of(s) for s in o.item_counts]
+    pb = ProximityBatching(5.0, 2, coords, grid.station_xy, dist_fn=lambda cells: router_matrix(grid, cells))
+    names = lambda bs: [[next(iter(o.item_counts)) for o in b.orders] for b in bs]
+    m = lambda bs: sum(batch_tour(grid, placement, b.orders, return_to_station=True).meters for b in bs)
+    boxed = pb.make_batches(orders)                          # sin router: caja envolvente
+    assert names(boxed) == [["A1", "B1"], ["A2", "B2"]]
+    attach_router(grid, placement, DistanceCache(None))
+    stepped = pb.make_batches(orders)
+    assert names(stepped) == [["A1", "A2"], ["B1", "B2"]]
+    assert m(stepped) < m(boxed)
+
+    D = np.array([[0, 3, 4, -1], [3, 0, 5, -1], [4, 5, 0, -1], [-1, -1, -1, 0]])
+    s = ProximityBatching.savings_from_matrix(D, np.array([1, 2, 3]))
+    assert s[0, 1] == 3 + 4 - 5 and np.isneginf(s[0, 2]) and np.isneginf(s[1, 1])
+
+def test_simulator_runs_proximity_policy():
+    grid, placement, orders = _env()
+    cfg = SimConfig(policy="Batching_Proximity", n_pickers=2, speed_m_per_min=60.0,
+                    batch_size=4, time_threshold_min=5.0, trace=False)
+    res = Simulator(grid, placement, orders, cfg).run()
+    assert res.orders_completed == len(orders)
+    assert res.distance_per_order_avg_m > 0
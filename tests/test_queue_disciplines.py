@@ -0,0 +1,108 @@
+import random
+import pytest
+
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+from src.demand.generator import make_orders
+from src.demand.due_dates import DueDateSpec, due_for
+from src.sim.engine import Simulator, SimConfig
+from src.sim.events import Job
+from src.sim.fastpath import simulate
+from src.sim.job_cache import JobCache
+from src.sim.queues import IndexedPriorityQueue, PriorityWaiting, ZoneQueues, waiting_factory, job_due_min
+
+def _env(due=DueDateSpec(sla_min=20.0, express_share=0.2, express_sla_min=8.0)):
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    placement = SKUPlacement.random_sample(grid, n_skus=40, seed=5)
+    orders = make_orders(seed=5, horizon=40, lam=1.2, n_skus=40, due_dates=due)[2]
+    return grid, placement, orders
+
+def test_indexed_heap_matches_sorted_reference():
+    rnd = random.Random(3)
+    pq, ref = IndexedPriorityQueue(), {}
+    for step in range(3000):
+        op = rnd.random()
+        if op < 0.5 or not ref:
+            h = step
+            ref[h] = (rnd.random(), h)
+            pq.push(h, ref[h], item=str(h))
+        elif op < 0.7:
+            h = rnd.choice(list(ref))
+            ref[h] = (rnd.random(), h)
+            pq.update(h, ref[h])
+        elif op < 0.8:
+            h = rnd.choice(list(ref))
+            assert pq.remove(h) == str(h)
+            del ref[h]
+        else:
+            h, item = pq.pop()
+            assert h == min(ref, key=ref.get) and item == str(h)
+            del ref[h]
+        assert len(pq) == len(ref)
+    with pytest.raises(KeyError):
+        h = next(iter(ref))
+        pq.push(h, (0.0, h))
+
+def test_priority_waiting_ties_fifo_and_reprioritize():
+    q = waiting_factory("SPT")()
+    jobs = [Job(job_id=i, arrival_min=float(i), service_min=s, n_orders=1) for i, s in enumerate([3.0, 1.0, 3.0, 2.0])]
+    for j in jobs:
+        q.append(j)
+    assert q[0].job_id == 1
+    q.reprioritize(jobs[2], 0.5)
+    assert [q.popleft().job_id for _ in range(4)] == [2, 1, 3, 0]
+    assert not q
+    with pytest.raises(ValueError):
+        waiting_factory("LIFO")
+
+def test_zone_queues_accept_priority_factory():
+    zq = ZoneQueues(["A", None], factory=waiting_factory("SPT"))
+    for i, (z, s) in enumerate([("A", 5.0), ("A", 1.0), ("B", 2.0)]):
+        zq.append(Job(job_id=i, arrival_min=0.0, service_min=s, n_orders=1, zone=z))
+    assert zq.pop_for("A").job_id == 1
+    assert zq.pop_for(None).job_id == 2      # "B" no es zona de picker → compartida
+    assert len(zq) == 1
+
+def test_due_dates_rules_and_same_demand():
+    spec = DueDateSpec(sla_min=30.0, cutoffs=[60.0, 120.0], express_sla_min=10.0)
+    assert due_for(10.0, spec) == 60.0
+    assert due_for(40.0, spec) == 120.0
+    assert due_for(100.0, spec) == 130.0     # sin corte posterior → llegada + SLA
+    assert due_for(100.0, spec, express=True) == 110.0
+
+    plain = make_orders(seed=5, horizon=40, lam=1.2, n_skus=40)[2]
+    grid, placement, orders = _env()
+    assert [o.arrival_min for o in orders] == [o.arrival_min for o in plain]
+    assert [o.items for o in orders] == [o.items for o in plain]
+    assert all(o.due_min is None for o in plain)
+    assert 0 < sum(o.express for o in orders) < len(orders)
+    for o in orders:
+        assert o.due_min == pytest.approx(o.arrival_min + (8.0 if o.express else 20.0))
+
+def test_edd_cuts_tardiness_and_fast_path_matches_engine():
+    grid, placement, orders = _env()
+    cache = JobCache(orders, grid, placement)
+    res = {}
+    for disc in ("FCFS", "EDD", "SPT"):
+        cfg = SimConfig(policy="Secuencial_FCFS", n_pickers=1, speed_m_per_min=60.0, horizon_min=40,
+                        trace=False, queue_discipline=disc)
+        jobs, paths = cache.for_config(cfg)
+        res[disc] = Simulator(grid, placement, orders, cfg, jobs=jobs, path_cache=paths).run()
+        assert res[disc].orders_with_due == res[disc].orders_completed > 0
+    assert res["EDD"].tardy_pct < res["FCFS"].tardy_pct
+    assert res["SPT"].avg_wait_min < res["FCFS"].avg_wait_min
+    assert res["FCFS"].tardiness_max_min >= res["FCFS"].tardiness_avg_min >= 0.0
+
+    cfg = SimConfig(policy="Secuencial_FCFS", n_pickers=2, speed_m_per_min=60.0, horizon_min=40, trace=False)
+    jobs, paths = cache.for_config(cfg)
+    ref = Simulator(grid, placement, orders, cfg, jobs=jobs, path_cache=paths).run()
+    fast = simulate(grid, placement, orders, cfg, jobs=jobs, path_cache=paths)
+    assert fast.tardy_pct < res["FCFS"].tardy_pct
+    for k in ("orders_with_due", "lateness_avg_min", "tardiness_avg_min", "tardiness_max_min", "tardy_pct"):
+        assert getattr(fast, k) == getattr(ref, k)
+
+def test_job_due_is_earliest_order_due():
+    grid, placement, orders = _env()
+    j = Job(job_id=0, arrival_min=0.0, service_min=1.0, n_orders=3, orders=orders[:3])
+    assert job_due_min(j) == min(o.due_min for o in orders[:3])
+    assert job_due_min(Job(job_id=1, arrival_min=0.0, service_min=1.0, n_orders=1)) == float("inf")
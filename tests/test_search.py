@@ -0,0 +1,48 @@
+import numpy as np
+from src.experiments.search import (
+    Evaluation, SimEvaluator, grid_candidates, successive_halving, pareto_front, best_under_sla,
+    es_optimize, search,
+)
+
+SEEDS = [1, 2, 3, 4, 5, 6]
+
+def _ev(thr, p95, **params):
+    return Evaluation(params, (0,), thr, p95, p95 / 2, 0.5)
+
+def test_pareto_front_keeps_non_dominated():
+    a, b, c, d = _ev(100, 5.0, n=1), _ev(120, 8.0, n=2), _ev(90, 6.0, n=3), _ev(120, 9.0, n=4)
+    front = pareto_front([a, b, c, d])
+    assert front == [b, a]
+
+def test_best_under_sla_prefers_throughput_then_fewer_pickers():
+    evs = [_ev(120, 9.0, n_pickers=2), _ev(110, 3.0, n_pickers=3), _ev(110, 2.0, n_pickers=4)]
+    assert best_under_sla(evs, None).params["n_pickers"] == 2
+    assert best_under_sla(evs, 4.0).params["n_pickers"] == 3
+    assert best_under_sla(evs, 1.0) is None
+
+def test_es_optimize_finds_quadratic_minimum():
+    x, fx, hist = es_optimize(lambda v: float((v[0] - 3.2) ** 2 + (v[1] + 1.0) ** 2), [0.0, 0.0], 0.3,
+                              [(-5.0, 5.0), (-5.0, 5.0)], iters=40, popsize=8, seed=1)
+    assert abs(x[0] - 3.2) < 0.2 and abs(x[1] + 1.0) < 0.2
+    assert fx <= min(v for _, v in hist[:8])
+
+def test_halving_matches_full_grid_with_fewer_sims():
+    kw = dict(horizon_min=20, lam_per_min=3.0, n_skus=20)
+    cands = grid_candidates(["Secuencial_FCFS", "Batching_Size", "Batching_Time"], [1, 2, 3], [2, 6], [1.0, 3.0])
+    full_ev = SimEvaluator(**kw)
+    full = [full_ev(p, SEEDS) for p in cands]
+    for sla in (None, 1.0, 3.0):
+        ev = SimEvaluator(**kw)
+        ev._envs = full_ev._envs                  # reutiliza el ruteo, no los resultados
+        res = successive_halving(ev, cands, SEEDS, eta=3, sla_p95_min=sla)
+        g = best_under_sla(full, sla)
+        assert (res.best and res.best.params) == (g and g.params)
+        assert res.n_sims < full_ev.n_sims / 2
+
+def test_search_tunes_continuous_threshold():
+    ev = SimEvaluator(horizon_min=20, lam_per_min=2.0, n_skus=20)
+    cands = grid_candidates(["Batching_Time"], [1], time_thresholds=[1.0, 4.0])
+    res = search(ev, cands, SEEDS[:2], continuous={"time_threshold_min": (0.5, 6.0)}, es_iters=2)
+    assert res.history[-1]["es_tuned"] >= 1
+    assert all(0.5 <= e.params["time_threshold_min"] <= 6.0 for e in res.evaluations)
+    assert res.best is not None and res.front
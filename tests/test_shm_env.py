@@ -0,0 +1,39 @@
+import csv
+from multiprocessing import shared_memory
+import pytest
+
+from src.experiments.runner import _env, run_grid
+from src.experiments.shm_env import SharedEnv, AttachedEnv
+from src.demand.due_dates import DueDateSpec, assign_due_dates
+from src.demand.rng import RNG
+
+def test_publish_and_attach_round_trip():
+    grid, placement, orders = _env(7, 60, 0.8, 30, "uniforme")
+    assign_due_dates(orders, DueDateSpec(sla_min=10.0, express_share=0.3), RNG(1))
+    with SharedEnv(grid, placement, orders) as shenv:
+        h = shenv.handle
+        assert {"arrival", "item_ptr", "item_sku", "slot_xy", "router_d"} <= set(h.arrays)
+        att = AttachedEnv(h)
+        g2, p2, o2 = att.env()
+        assert g2.spec == grid.spec and p2.sku_to_coord == placement.sku_to_coord
+        assert [(o.arrival_min, o.items, o.item_counts, o.due_min, o.express) for o in o2] == \
+               [(o.arrival_min, o.items, o.item_counts, o.due_min, o.express) for o in orders]
+        a, b = list(grid.router.index)[:2]
+        assert g2.router.steps(a, b) == grid.router.steps(a, b)
+        assert not att.arrays["router_d"].flags.writeable       # vista de sólo lectura, sin copia
+        names = [s.name for s in h.arrays.values()]
+        del g2, p2, o2
+        att.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=names[0])
+
+def test_parallel_grid_matches_serial(tmp_path):
+    kw = dict(policies=["Secuencial_FCFS", "Batching_Size"], n_pickers_list=[1, 2], congestion_modes=["off", "light"],
+              batch_sizes=[4], popularity_modes=["uniforme"], seeds=[7, 11], horizon_min=30, lam_per_min=0.8,
+              n_skus=60, prescreen="flag")
+    serial = run_grid(tmp_path / "s.csv", **kw)
+    par = run_grid(tmp_path / "p.csv", workers=2, **kw)
+    rows_s = list(csv.DictReader(serial.open()))
+    rows_p = list(csv.DictReader(par.open()))
+    assert len(rows_s) == 2 * 2 * 2 * 2 and rows_p == rows_s
+    assert (tmp_path / "p.surrogate.json").read_text() == (tmp_path / "s.surrogate.json").read_text()
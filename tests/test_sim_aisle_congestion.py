@@ -0,0 +1,66 @@
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+from src.demand.generator import make_orders
+from src.sim.congestion import AisleOccupancy, path_segments
+from src.sim.engine import Simulator, SimConfig
+
+def test_path_segments_split_straight_runs():
+    path = [(0,0), (1,0), (2,0), (2,1), (2,2)]
+    segs = path_segments(path)
+    assert [s[0] for s in segs] == [("h", 0), ("v", 2)]
+    # celdas que se ENTRAN en cada tramo
+    assert segs[0][1:3] == (1, 2)
+    assert segs[1][1:3] == (1, 2)
+
+def test_second_picker_waits_for_occupied_aisle():
+    occ = AisleOccupancy()
+    path = [(0,0), (1,0), (2,0), (3,0), (4,0)]
+    d0 = occ.reserve(pid=0, path=path, start_t=0.0, service_min=4.0)
+    d1 = occ.reserve(pid=1, path=path, start_t=1.0, service_min=4.0)
+    assert d0 == 0.0
+    assert d1 > 0.0
+    assert occ.blocks == 1 and abs(occ.block_min - d1) < 1e-9
+
+def test_disjoint_aisles_do_not_block():
+    occ = AisleOccupancy()
+    occ.reserve(0, [(0,0), (1,0), (2,0)], 0.0, 2.0)
+    d = occ.reserve(1, [(0,5), (1,5), (2,5)], 0.5, 2.0)
+    assert d == 0.0 and occ.blocks == 0
+
+def test_aisle_mode_records_blocks_and_never_helps():
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    placement = SKUPlacement.random_sample(grid, n_skus=60, seed=3)
+    orders = make_orders(seed=3, horizon=60, lam=1.5, n_skus=60)[2]
+    base = dict(policy="Secuencial_FCFS", n_pickers=3, speed_m_per_min=40.0, horizon_min=60, trace=False)
+    res_off = Simulator(grid, placement, orders, SimConfig(congestion="off", **base)).run()
+    res_aisle = Simulator(grid, placement, orders, SimConfig(congestion="aisle", **base)).run()
+    assert res_off.congestion_blocks == 0
+    assert res_aisle.congestion_blocks > 0
+    assert res_aisle.congestion_block_min > 0.0
+    assert res_aisle.avg_wait_min >= res_off.avg_wait_min - 1e-9
+
+def test_expired_reservations_are_pruned_lazily():
+    occ = AisleOccupancy()
+    path = [(0,0), (1,0), (2,0)]
+    occ.reserve(0, path, 0.0, 1.0)
+    occ.reserve(1, [(5,0), (6,0), (7,0)], 0.5, 1.0)     # mismo pasillo, otras celdas
+    key = ("h", 0)
+    assert len(occ._idx[key]) == 2 and occ._exp[key][0] == 1.0
+    occ.reserve(2, path, 20.0, 1.0)                    # las dos anteriores ya vencieron
+    assert len(occ._idx[key]) == 1 and occ._exp[key] == [21.0]
+    clone = occ.copy()
+    clone.reserve(3, path, 30.0, 1.0)
+    assert occ._exp[key] == [21.0]
+
+def test_long_queue_of_conflicts_never_overlaps():
+    occ = AisleOccupancy(max_retries=8)
+    path = [(0,0), (1,0), (2,0), (3,0), (4,0)]
+    for k in reversed(range(12)):                  # 12 reservas pegadas: [k, k+1)
+        assert occ.reserve(pid=k, path=path, start_t=float(k), service_min=1.0) == 0.0
+    assert occ.blocks == 0
+    d = occ.reserve(pid=99, path=path, start_t=0.0, service_min=1.0)
+    assert d == 12.0                               # espera a que salgan las 12
+    assert occ.blocks == 1 and occ.block_min == 12.0
+    # el siguiente espera también al 99: su reserva no se superpuso con nadie
+    assert occ.reserve(pid=100, path=path, start_t=0.0, service_min=1.0) == 13.0
+    assert occ.blocks == 2 and occ.block_min == 25.0
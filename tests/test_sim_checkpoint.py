@@ -0,0 +1,87 @@
+import pytest
+
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+from src.demand.generator import make_orders
+from src.sim.engine import Simulator, SimConfig
+from src.sim.job_cache import JobCache
+from src.sim.checkpoint import take_checkpoint, fork, what_if, checkpoints_every
+
+KPIS = ("makespan_min", "orders_completed", "avg_wait_min", "picker_utilization", "distance_total_m",
+        "gantt", "ts_queue", "ts_completed", "waits_raw", "congestion_blocks", "congestion_block_min")
+
+@pytest.fixture(scope="module")
+def env():
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    placement = SKUPlacement.random_sample(grid, n_skus=40, seed=3)
+    orders = make_orders(seed=3, horizon=30, lam=0.9, n_skus=40)[2]
+    cfg = SimConfig(policy="Secuencial_FCFS", n_pickers=2, speed_m_per_min=60.0, congestion="aisle",
+                    horizon_min=None, trace=False)
+    cache = JobCache(orders, grid, placement)
+    return grid, placement, orders, cfg, cache
+
+def _sim(env, **kw):
+    grid, placement, orders, cfg, cache = env
+    cfg = SimConfig(**{**cfg.__dict__, **kw})
+    return Simulator(grid, placement, orders, cfg, *cache.for_config(cfg))
+
+def test_fork_without_changes_is_exact_and_independent(env):
+    ref = _sim(env).run()
+    sim = _sim(env)
+    sim.run_until(12.0)
+    ckpt = take_checkpoint(sim)
+    a = fork(ckpt).run()
+    b = fork(ckpt).run()
+    parent = sim.run()
+    for res in (a, b, parent):
+        for k in KPIS:
+            assert getattr(res, k) == getattr(ref, k), k
+    with pytest.raises(ValueError):
+        take_checkpoint(sim)
+
+def test_what_if_extra_picker_shares_prefix(env):
+    sim = _sim(env, n_pickers=1)
+    sim.run_until(10.0)
+    ckpt = take_checkpoint(sim)
+    out = what_if(ckpt, {"base": {}, "plus1": {"n_pickers": 2}, "fast": {"speed_m_per_min": 120.0}})
+    base, plus1, fast = out["base"], out["plus1"], out["fast"]
+    n = len(env[2])
+    assert base.orders_completed == plus1.orders_completed == fast.orders_completed == n
+    assert plus1.avg_wait_min < base.avg_wait_min
+    assert fast.makespan_min < base.makespan_min
+    # el prefijo [0, 10] es común: mismos tours arrancados antes del checkpoint
+    pre = [s for s in base.gantt[0] if s[0] <= 10.0]
+    assert plus1.gantt[0][:len(pre)] == pre
+    assert ckpt.t == 10.0
+    assert plus1.gantt[1] and all(s[0] >= 10.0 for s in plus1.gantt[1])
+    # tours que arrancan después del fork con velocidad doble duran la mitad (sin bloqueos no cambia la escala)
+    dur_base = {jid: t1 - t0 for t0, t1, jid in base.gantt[0] if t0 > 10.0}
+    dur_fast = {jid: t1 - t0 for t0, t1, jid in fast.gantt[0] if t0 > 10.0}
+    assert sum(dur_fast.values()) < sum(dur_base.values())
+
+def test_fork_changes_policy_and_retires_pickers(env):
+    sim = _sim(env, n_pickers=3)
+    sim.run_until(8.0)
+    ckpt = take_checkpoint(sim)
+    res = fork(ckpt, policy="Batching_Size", batch_size=3, n_pickers=1).run()
+    assert res.orders_completed == len(env[2])
+    assert res.batches_count == 0 or res.batch_avg_size >= 1
+    for pid in (1, 2):
+        late = [s for s in res.gantt[pid] if s[0] > 8.0]
+        assert not late
+    assert max(n for _, n in res.ts_completed) == len(env[2])
+
+def test_checkpoints_every_and_horizon_extension(env):
+    sim = _sim(env, horizon_min=20)
+    cks = list(checkpoints_every(sim, 5.0))
+    assert [c.t for c in cks] == [5.0, 10.0, 15.0]
+    assert sim.done
+    short = sim.finalize()
+    longer = fork(take_checkpoint(_run_to_end(env)), horizon_min=None).run()
+    assert longer.orders_completed == len(env[2]) > short.orders_completed
+
+def _run_to_end(env):
+    sim = _sim(env, horizon_min=20)
+    while sim.step() is not None:
+        pass
+    return sim
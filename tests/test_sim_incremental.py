@@ -0,0 +1,63 @@
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+from src.demand.generator import make_orders
+from src.sim.engine import Simulator, SimConfig
+from src.sim.job_cache import JobCache
+
+def _setup(horizon=30):
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    placement = SKUPlacement.random_sample(grid, n_skus=40, seed=9)
+    orders = make_orders(seed=9, horizon=horizon, lam=0.8, n_skus=40)[2]
+    cfg = SimConfig(policy="Batching_Time", n_pickers=2, speed_m_per_min=60.0, time_threshold_min=3.0,
+                    congestion="light", horizon_min=horizon, trace=True)
+    cache = JobCache(orders, grid, placement)
+    make = lambda: Simulator(grid, placement, orders, cfg, *cache.for_config(cfg))
+    return make
+
+def _same(a, b):
+    for k in ("makespan_min", "orders_completed", "avg_wait_min", "picker_utilization",
+              "distance_total_m", "gantt", "ts_queue", "ts_completed", "waits_raw"):
+        assert getattr(a, k) == getattr(b, k), k
+
+def test_step_and_run_until_reproduce_run():
+    make = _setup()
+    ref_sim = make()
+    ref = ref_sim.run()
+
+    sim = make()
+    assert sim.snapshot()["orders_completed"] == 0
+    n = sum(1 for _ in sim.events())
+    assert n == ref_sim.events_processed and sim.done
+    _same(sim.finalize(), ref)
+    assert sim.finalize() is sim.finalize()
+
+    sim = make()
+    snaps = [sim.run_until(t) for t in (5.0, 12.5, 20.0, 1e9)]
+    assert [s["t"] for s in snaps] == [5.0, 12.5, 20.0, 30.0]
+    assert [s["orders_completed"] for s in snaps] == sorted(s["orders_completed"] for s in snaps)
+    assert snaps[-1]["done"] and snaps[-1]["orders_completed"] == ref.orders_completed
+    res = sim.finalize()
+    _same(res, ref)
+    assert len(res.frames if hasattr(res, "frames") else sim.trace_frames) == len(ref_sim.trace_frames)
+
+def test_snapshot_kpis_and_early_stop():
+    make = _setup()
+    sim = make()
+    snaps = list(sim.snapshots(10.0))
+    assert [s["t"] for s in snaps] == [10.0, 20.0, 30.0]
+    for s in snaps:
+        assert all(0.0 <= u <= 1.0 + 1e-9 for u in s["picker_utilization"])
+        assert 0 <= s["busy_pickers"] <= 2
+    ref = sim.finalize()
+    assert snaps[-1]["orders_completed"] == ref.orders_completed
+    assert abs(snaps[-1]["avg_wait_min"] - ref.avg_wait_min) < 1e-9
+
+    early = make()
+    for snap in early.snapshots(10.0):
+        if snap["t"] >= 20.0:
+            break
+    res = early.finalize()
+    assert not early.done
+    assert res.makespan_min == early.now <= 20.0
+    assert res.orders_completed == snap["orders_completed"] <= ref.orders_completed
+    assert all(t0 <= early.now for segs in res.gantt for (t0, _, _) in segs)
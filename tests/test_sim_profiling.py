@@ -0,0 +1,53 @@
+import json
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+from src.demand.generator import make_orders
+from src.sim.engine import Simulator, SimConfig
+from src.sim.profiling import SimProfiler, merge_reports
+from src.experiments.runner import run_grid
+
+def _run(**kw):
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    placement = SKUPlacement.random_sample(grid, n_skus=40, seed=2)
+    orders = make_orders(seed=2, horizon=20, lam=0.5, n_skus=40)[2]
+    cfg = SimConfig(policy="Batching_Size", n_pickers=2, speed_m_per_min=60.0, horizon_min=20, batch_size=3, **kw)
+    return Simulator(grid, placement, orders, cfg).run()
+
+def test_profile_off_by_default():
+    assert _run().profile is None
+
+def test_profile_reports_phases_events_and_watermarks():
+    res = _run(profile=True)
+    rep = res.profile
+    for ph in ("build_jobs", "dispatch", "path", "keyframes", "timeline", "metrics"):
+        assert rep["phases_s"][ph] >= 0.0
+    assert rep["phase_calls"]["build_jobs"] == 1
+    assert rep["events"]["ARRIVAL"] > 0 and rep["events"]["PICKER_FREE"] > 0
+    assert rep["high_water"]["event_heap"] >= 1
+
+def test_profile_does_not_change_kpis():
+    a = _run(trace=False)
+    b = _run(trace=False, profile=True, profile_tracemalloc=True)
+    assert a.orders_completed == b.orders_completed
+    assert a.avg_wait_min == b.avg_wait_min
+    assert a.distance_total_m == b.distance_total_m
+    assert b.profile["tracemalloc_peak_mb"] > 0.0
+
+def test_merge_reports_sums_and_maxes():
+    p = SimProfiler()
+    with p.phase("x"):
+        pass
+    p.count("ARRIVAL", 3)
+    p.watermark("waiting", 5)
+    q = {"phases_s": {"x": 1.0}, "phase_calls": {"x": 2}, "events": {"ARRIVAL": 1}, "high_water": {"waiting": 2}}
+    m = merge_reports([p.report(), q, None])
+    assert m["runs"] == 2
+    assert m["phase_calls"]["x"] == 3 and m["events"]["ARRIVAL"] == 4
+    assert m["high_water"]["waiting"] == 5
+
+def test_run_grid_writes_profile_json(tmp_path):
+    out = run_grid(tmp_path / "g.csv", policies=["Secuencial_FCFS"], n_pickers_list=[1], congestion_modes=["off"],
+                   popularity_modes=["uniforme"], seeds=[1], horizon_min=20, lam_per_min=0.3, n_skus=30, profile=True)
+    summary = json.loads(out.with_suffix(".profile.json").read_text(encoding="utf-8"))
+    assert summary["runs"] == 1
+    assert {"env", "simulate"} <= set(summary["grid_phases_s"])
@@ -0,0 +1,39 @@
+import numpy as np
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+from src.warehouse.slotting import optimize_slotting, pick_frequencies, _Objective, _candidate_cells, co_pick_matrix
+from src.demand.orders import Catalog, Popularity
+from src.demand.generator import make_orders
+
+def test_greedy_puts_most_popular_nearest():
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    catalog = Catalog(n_skus=50)
+    pop = Popularity.make(catalog, mode="concentrada", alpha=1.2)
+    skus = catalog.ids()[::-1]                  # orden "malo": menos popular primero
+    weights = pop.probs()[::-1]
+    placement, rep = optimize_slotting(grid, skus, weights=weights)
+    d = lambda s: sum(placement.coord_of(s))    # estación en (0,0), grilla abierta
+    assert d("S0001") <= d("S0010") <= d("S0050")
+    assert rep.m_per_order_after < rep.m_per_order_before
+    assert rep.improvement_m_per_order > 0
+
+def test_swap_delta_matches_full_recompute():
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    orders = make_orders(seed=4, horizon=60, lam=1.0, n_skus=30)[2]
+    skus = Catalog(n_skus=30).ids()
+    cells, d0 = _candidate_cells(grid, 30)
+    xy = np.stack([cells % grid.width, cells // grid.width], axis=1)
+    obj = _Objective(pick_frequencies(orders, skus), d0, xy, co_pick_matrix(orders, skus), 0.5)
+    cell_of = np.random.default_rng(0).permutation(30)
+    for a, b in [(0, 1), (3, 17), (29, 5)]:
+        swapped = cell_of.copy()
+        swapped[a], swapped[b] = cell_of[b], cell_of[a]
+        assert abs(obj.swap_delta(a, b, cell_of) - (obj.total(swapped) - obj.total(cell_of))) < 1e-9
+
+def test_observed_orders_improve_real_tours_vs_random():
+    grid = WarehouseGrid(WarehouseGrid.default_spec())
+    orders = make_orders(seed=8, horizon=90, lam=1.0, popularity="concentrada", n_skus=60)[2]
+    skus = Catalog(n_skus=60).ids()
+    rnd = SKUPlacement.random_sample(grid, 60, seed=8)
+    _, rep = optimize_slotting(grid, skus, orders=orders, baseline=rnd, eval_orders=40)
+    assert rep.m_per_order_after < rep.m_per_order_before
@@ -0,0 +1,52 @@
+import json
+import math
+import numpy as np
+from src.sim.events import Job
+from src.sim.engine import SimConfig
+from src.sim.fastpath import run_fast
+from src.experiments.surrogate import erlang_c, estimate, surrogate_error
+from src.experiments.runner import run_grid
+
+def _poisson_jobs(lam, mean_svc, horizon, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.cumsum(rng.exponential(1.0 / lam, int(lam * horizon * 1.5)))
+    t = t[t < horizon]
+    s = rng.exponential(mean_svc, t.size)
+    return [Job(job_id=i, arrival_min=float(a), service_min=float(b), n_orders=1, meters=float(b) * 60)
+            for i, (a, b) in enumerate(zip(t, s))]
+
+def test_erlang_c_known_values():
+    assert abs(erlang_c(1, 0.5) - 0.5) < 1e-12           # M/M/1: P(esperar) = ρ
+    assert abs(erlang_c(2, 1.0) - 1.0 / 3.0) < 1e-12
+    assert erlang_c(3, 3.5) == 1.0
+
+def test_mm1_wait_close_to_simulation():
+    jobs = _poisson_jobs(lam=1.0, mean_svc=0.7, horizon=4000)
+    est = estimate(jobs, n_pickers=1, horizon_min=4000)
+    res = run_fast(jobs, SimConfig(policy="Secuencial_FCFS", n_pickers=1, speed_m_per_min=60.0,
+                                   horizon_min=4000, trace=False))
+    assert est.status == "ok" and abs(est.rho - 0.7) < 0.05
+    assert abs(est.avg_wait_min - res.avg_wait_min) / res.avg_wait_min < 0.2
+    err = surrogate_error([(est, res)])
+    assert err["n"] == 1 and err["utilization"]["mape_pct"] < 5.0
+
+def test_status_flags_saturated_and_idle():
+    jobs = _poisson_jobs(lam=2.0, mean_svc=1.5, horizon=200)
+    sat = estimate(jobs, n_pickers=2, horizon_min=200)
+    assert sat.status == "saturated" and sat.utilization == 1.0
+    assert math.isfinite(sat.wq_min) and sat.wq_min > 0            # aproximación fluida
+    assert math.isinf(estimate(jobs, n_pickers=2).wq_min)          # sin horizonte
+    assert estimate(jobs, n_pickers=60, horizon_min=200).status == "idle"
+
+def test_run_grid_prune_skips_saturated_and_reports_error(tmp_path):
+    out = run_grid(tmp_path / "g.csv", policies=["Secuencial_FCFS"], n_pickers_list=[1, 12], congestion_modes=["off"],
+                   popularity_modes=["uniforme"], seeds=[3], horizon_min=20, lam_per_min=6.0, n_skus=30,
+                   prescreen="prune", rho_saturated=1.05, rho_idle=0.0)
+    rows = out.read_text(encoding="utf-8").splitlines()
+    header = rows[0].split(",")
+    recs = [dict(zip(header, r.split(","))) for r in rows[1:]]
+    by_p = {r["n_pickers"]: r for r in recs}
+    assert by_p["1"]["screen"] == "saturated" and by_p["1"]["source"] == "surrogate"
+    assert by_p["12"]["source"] == "sim"
+    rep = json.loads(out.with_suffix(".surrogate.json").read_text(encoding="utf-8"))
+    assert rep["pruned"] == 1 and rep["simulated"] == 1
@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.sim.engine import SimConfig
+from src.ui.cache import SizedLRU, SimCache, config_hash, env_key, nbytes_of
+
+def test_sized_lru_evicts_least_recent_by_bytes():
+    lru = SizedLRU(max_bytes=3000)
+    lru.put("a", np.zeros(100))          # ~900 B c/u
+    lru.put("b", np.zeros(100))
+    lru.put("c", np.zeros(100))
+    assert lru.get("a") is not None      # "a" pasa a ser la más reciente
+    lru.put("d", np.zeros(100))
+    assert "b" not in lru and {"a", "c", "d"} <= set(lru._d)
+    assert lru.total_bytes <= 3000
+    lru.put("big", np.zeros(10_000))     # no entra sola: no se cachea ni desaloja
+    assert "big" not in lru and len(lru) == 3
+    assert nbytes_of([np.zeros(1000)] * 500) > 500 * 8000
+
+def test_sim_cache_reuses_env_and_runs():
+    sc = SimCache()
+    cfg = SimConfig(policy="Batching_Size", n_pickers=2, speed_m_per_min=60.0, batch_size=5,
+                    horizon_min=20, round_dt=0.25, heatmap=True)
+    res, meta, frames = sc.run(cfg, seed=7, horizon=20)
+    assert sc.runs.misses == 1 and sc.envs.misses == 1
+    again = sc.run(cfg, seed=7, horizon=20)
+    assert again[0] is res and sc.runs.hits == 1
+
+    # otra política / más pickers: misma grilla y pedidos, corrida nueva
+    cfg2 = SimConfig(policy="Batching_Size", n_pickers=3, speed_m_per_min=60.0, batch_size=5,
+                     horizon_min=20, round_dt=0.25, heatmap=True)
+    res2, meta2, _ = sc.run(cfg2, seed=7, horizon=20)
+    assert sc.envs.misses == 1 and sc.envs.hits >= 1 and len(sc.runs) == 2
+    assert meta2 == meta and sum(res2.picker_tours) == sum(res.picker_tours)
+    env = sc.env(7, 20)
+    assert env[3].plan_builds == 1          # el plan de batching se ruteó una sola vez
+
+    assert config_hash(env_key(7, 20, 1.0, "uniforme", 120), cfg) != \
+        config_hash(env_key(8, 20, 1.0, "uniforme", 120), cfg)
+    sc.run(cfg, seed=8, horizon=20)
+    assert len(sc.envs) == 2
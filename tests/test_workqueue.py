@@ -0,0 +1,76 @@
+import csv
+import multiprocessing as mp
+import time
+
+import pytest
+
+from src.experiments.runner import run_grid
+from src.experiments.workqueue import (
+    SQLiteWorkQueue, WorkQueue, publish_grid, run_worker, export_csv, task_id, _LeaseKeeper
+)
+
+GRID = dict(policies=["Secuencial_FCFS", "Batching_Size"], n_pickers_list=[1, 2], congestion_modes=["off"],
+            batch_sizes=[4], popularity_modes=["uniforme"], seeds=[7, 11], horizon_min=30, lam_per_min=0.8, n_skus=60)
+
+def _work(db):
+    run_worker(SQLiteWorkQueue(db))
+
+def test_publish_is_idempotent_and_ids_follow_config(tmp_path):
+    q = SQLiteWorkQueue(tmp_path / "q.sqlite")
+    ids = publish_grid(q, **GRID)
+    assert len(ids) == len(set(ids)) == 8
+    assert publish_grid(q, **GRID) == ids
+    assert q.progress() == {"pending": 8, "running": 0, "done": 0, "failed": 0, "total": 8}
+    assert task_id({"a": 1, "b": [2]}) == task_id({"b": [2], "a": 1}) != task_id({"a": 2, "b": [2]})
+
+def test_expired_leases_are_retried_then_failed(tmp_path):
+    q = SQLiteWorkQueue(tmp_path / "q.sqlite", max_attempts=2)
+    q.publish([{"x": 1}])
+    tid, payload = q.claim("w1", lease_s=-1.0)      # muere sin terminar: lease ya vencido
+    assert payload == {"x": 1}
+    assert q.claim("w2", lease_s=-1.0)[0] == tid    # re-asignada
+    assert not q.heartbeat(tid, "w1")               # w1 perdió la tarea
+    assert q.claim("w3") is None                    # agotó los intentos
+    assert q.progress()["failed"] == 1
+
+    q2 = SQLiteWorkQueue(tmp_path / "q2.sqlite", max_attempts=1)
+    q2.publish([{"env": {}, "ctx": {}, "task": []}])  # payload inválido → falla registrada
+    assert run_worker(q2) == 0
+    assert q2.progress()["failed"] == 1 and "KeyError" in q2.errors()[0][1]
+
+def test_workers_reproduce_run_grid(tmp_path):
+    db = tmp_path / "q.sqlite"
+    publish_grid(SQLiteWorkQueue(db), **GRID)
+    procs = [mp.Process(target=_work, args=(db,)) for _ in range(2)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    q = SQLiteWorkQueue(db)
+    assert q.progress()["done"] == 8
+    ref = run_grid(tmp_path / "ref.csv", **GRID)
+    out = export_csv(q, tmp_path / "queue.csv")
+    assert out.read_text() == ref.read_text()
+    assert len(list(csv.DictReader(out.open()))) == 8
+
+def test_heartbeat_keeps_long_tasks_and_lost_leases_cannot_complete(tmp_path):
+    with pytest.raises(TypeError):
+        WorkQueue()                                          # interfaz abstracta
+
+    q = SQLiteWorkQueue(tmp_path / "q.sqlite", max_attempts=1)
+    q.publish([{"x": 1}])
+    tid, _ = q.claim("w1", lease_s=0.3)
+    with _LeaseKeeper(q, tid, "w1", 0.3) as keeper:
+        time.sleep(1.0)                                      # más largo que el lease
+        assert q.claim("w2", lease_s=0.3) is None            # sigue siendo de w1
+    assert not keeper.lost
+    assert q.complete(tid, "w1", {"ok": 1}) and q.results() == [{"ok": 1}]
+
+    q.publish([{"x": 2}])
+    q2 = SQLiteWorkQueue(tmp_path / "q.sqlite", max_attempts=3)
+    tid2, _ = q2.claim("w1", lease_s=-1.0)                   # w1 se cuelga: lease vencido
+    assert q2.claim("w2")[0] == tid2
+    assert not q2.complete(tid2, "w1", {"ok": "viejo"})      # no pisa a w2
+    q2.fail(tid2, "w1", "tarde")                             # tampoco la puede fallar
+    assert q2.progress()["running"] == 1 and len(q2.results()) == 1
+    assert q2.complete(tid2, "w2", {"ok": 2}) and q2.results() == [{"ok": 1}, {"ok": 2}]
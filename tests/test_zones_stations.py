@@ -0,0 +1,72 @@
+from src.warehouse.grid import WarehouseGrid
+from src.warehouse.sku_map import SKUPlacement
+from src.warehouse.routing import nearest_station
+from src.picking.tours import order_tour, order_tour_path
+from src.demand.orders import Order
+from src.demand.generator import make_orders
+from src.sim.engine import Simulator, SimConfig
+
+def two_zone_grid():
+    spec = WarehouseGrid.default_spec()
+    spec["stations"] = [{"x": 29, "y": 0}]
+    spec["zones"] = {"oeste": {"x0": 0, "y0": 0, "x1": 14, "y1": 29},
+                     "este": {"x0": 15, "y0": 0, "x1": 29, "y1": 29}}
+    return WarehouseGrid(spec)
+
+def test_stations_and_zones_from_spec():
+    grid = two_zone_grid()
+    assert grid.stations_xy == [(0, 0), (29, 0)]
+    assert grid.zone_of((3, 7)) == "oeste" and grid.zone_of((20, 7)) == "este"
+    assert nearest_station(grid, (27, 4)) == ((29, 0), 6)
+
+def test_tour_returns_to_nearest_drop_off():
+    grid = two_zone_grid()
+    placement = SKUPlacement({"A": (26, 2)})
+    o = Order(0.0, ["A"], {"A": 1})
+    # sale y vuelve por la estación este (29,0): 3 + 2 de ida, igual de vuelta
+    assert order_tour(grid, placement, o, return_to_station=True).steps == 10
+    path = order_tour_path(grid, placement, o, return_to_station=True)
+    assert tuple(path[0]) == (29, 0) and tuple(path[-1]) == (29, 0)
+
+def test_zone_pickers_only_serve_their_zone():
+    grid = two_zone_grid()
+    placement = SKUPlacement.random_sample(grid, n_skus=40, seed=2)
+    orders = make_orders(seed=2, horizon=60, lam=0.8, n_skus=40, max_items=1)[2]
+    cfg = SimConfig(policy="Secuencial_FCFS", n_pickers=2, speed_m_per_min=60.0,
+                    picker_zones=["oeste", "este"], trace=False)
+    sim = Simulator(grid, placement, orders, cfg)
+    res = sim.run()
+    assert res.orders_completed == len(orders)
+    zone_by_job = {j.job_id: j.zone for j in sim.jobs}
+    for pid, zone in enumerate(cfg.picker_zones):
+        assert all(zone_by_job[jid] in (zone, None) for (_, _, jid) in res.gantt[pid])
+
+def test_zone_assignment_does_not_touch_shared_jobs():
+    from src.sim.job_cache import JobCache
+    grid = two_zone_grid()
+    assert grid.zones is grid.zones                      # parseado una sola vez
+    placement = SKUPlacement.random_sample(grid, n_skus=40, seed=2)
+    orders = make_orders(seed=2, horizon=60, lam=0.8, n_skus=40, max_items=1)[2]
+    cfg = SimConfig(policy="Secuencial_FCFS", n_pickers=2, speed_m_per_min=60.0,
+                    picker_zones=["oeste", "este"], trace=False)
+    jobs, paths = JobCache(orders, grid, placement).for_config(cfg)
+    sim = Simulator(grid, placement, orders, cfg, jobs=jobs, path_cache=paths)
+    assert sim.run().orders_completed == len(orders)
+    assert all(j.zone is None for j in jobs)
+    assert {j.zone for j in sim.jobs} == {"oeste", "este"}
+
+def test_fork_into_zones_tags_pending_arrivals_too():
+    from src.sim.checkpoint import take_checkpoint, fork
+    grid = two_zone_grid()
+    placement = SKUPlacement.random_sample(grid, n_skus=40, seed=2)
+    orders = make_orders(seed=2, horizon=60, lam=0.8, n_skus=40, max_items=1)[2]
+    sim = Simulator(grid, placement, orders, SimConfig(policy="Secuencial_FCFS", n_pickers=2,
+                                                       speed_m_per_min=60.0, trace=False))
+    sim.run_until(20.0)
+    ck = take_checkpoint(sim)
+    zoned = fork(ck, picker_zones=["oeste", "este"])
+    pending = [item[2].payload for item in zoned.evq._h if item[2].etype == "ARRIVAL"]
+    assert pending and all(j.zone is not None for j in pending)
+    assert all(j.zone is None for j in sim.jobs)          # el original no se tocó
+    zoned.run_until(1e9)
+    assert zoned.finalize().orders_completed == len(orders)